@@ -0,0 +1,92 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Run the benchmark suite, write its results as JSON, and compare them with a previous run.
+
+Usage: python -m benchmarks [--output results.json] [--compare baseline.json] [--threshold 0.1]
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import GROUPS, compare, environment
+
+
+def format_value(value: float, unit: str) -> str:
+    """Return a human-readable value."""
+    if unit == "s":
+        for scale, suffix in ((1, "s"), (1e-3, "ms"), (1e-6, "us")):
+            if value >= scale:
+                return f"{value / scale:.2f} {suffix}"
+        return f"{value / 1e-9:.0f} ns"
+    return f"{value:.0f} {unit}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[2])
+    parser.add_argument("groups", nargs="*", metavar="group",
+                        help=f"benchmark groups to run (default: all of {', '.join(GROUPS)})")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare results with this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown tolerated when comparing (default: %(default)s, meaning 10 %%)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repetitions (default: %(default)s)")
+    parser.add_argument("--max-batch", type=int, default=10 ** 6,
+                        help="largest batch size, batches growing tenfold from 1 (default: %(default)s)")
+    parser.add_argument("--max-length", type=int, default=10 ** 6,
+                        help="longest parsed input, inputs growing tenfold from 100 characters (default: %(default)s)")
+    parser.add_argument("--memory-count", type=int, default=10000,
+                        help="secrets loaded when measuring memory (default: %(default)s)")
+    args = parser.parse_args(argv)
+    for group in args.groups:
+        if group not in GROUPS:
+            parser.error(f"unknown benchmark group : {group} (expected {', '.join(GROUPS)})")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    results = {}
+    for group in args.groups or GROUPS:
+        for result in GROUPS[group](args):
+            results[result.name] = {"value": result.value, "unit": result.unit}
+            previous = None if baseline is None else baseline["results"].get(result.name)
+            change = ""
+            if previous and previous["value"]:
+                change = f"{(result.value / previous['value'] - 1) * 100:+.1f} %"
+            print(f"{result.name:<50} {format_value(result.value, result.unit):>12} {change:>9}", flush=True)
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for name, previous, current in regressions:
+            print(f"regression: {name} went from {previous:.3g} to {current:.3g} "
+                  f"(more than {args.threshold:.0%} worse)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Throughput of pyzora.parallel against the number of worker processes.
+
+Usage: python -m benchmarks.parallel [--count N] [--max-jobs N]
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import os
+import random
+import time
+
+from pyzora import *
+from pyzora.parallel import decode_parallel, encode_parallel
+
+
+def make_secrets(count: int, seed: int = 0) -> list[RingSecret]:
+    """Return random ring secrets to use as benchmark input."""
+    generator = random.Random(seed)
+    return [RingSecret(game_id=generator.randrange(32767), rings=generator.getrandbits(64),
+                       region=generator.choice(tuple(GameRegion)))
+            for _ in range(count)]
+
+
+def measure(function, count: int) -> float:
+    """Return how many items per second function processes."""
+    start = time.perf_counter()
+    function()
+    return count / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--count", type=int, default=100000, help="number of secrets to process")
+    parser.add_argument("--max-jobs", type=int, default=os.cpu_count() or 1, help="largest number of workers")
+    args = parser.parse_args(argv)
+    secrets = make_secrets(args.count)
+    strings = [str(secret) for secret in secrets if secret.region == GameRegion.US_PAL]
+    jobs_list = sorted({1, *(2 ** power for power in range(args.max_jobs.bit_length())), args.max_jobs})
+    print(f"{'jobs':>5} {'decode/s':>12} {'encode/s':>12}")
+    for jobs in (jobs for jobs in jobs_list if jobs <= args.max_jobs):
+        decode_rate = measure(
+            lambda: sum(1 for _ in decode_parallel(strings, RingSecret, GameRegion.US_PAL, jobs=jobs)), len(strings)
+        )
+        encode_rate = measure(lambda: sum(1 for _ in encode_parallel(secrets, jobs=jobs)), len(secrets))
+        print(f"{jobs:>5} {decode_rate:>12.0f} {encode_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
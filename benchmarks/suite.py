@@ -0,0 +1,219 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Benchmark suite covering each stage of loading and encoding secrets, batch sizes, import time and memory use.
+Run it with python -m benchmarks (see benchmarks/__main__.py).
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import gc
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Iterator, NamedTuple
+
+import pyzora
+from pyzora import *
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+SECRET_TYPES = (GameSecret, RingSecret, MemorySecret)
+
+
+class BenchmarkResult(NamedTuple):
+    """The result of one benchmark. Lower values are always better."""
+
+    name: str
+    """The benchmark's name, used to compare runs."""
+
+    value: float
+    """The measured value."""
+
+    unit: str
+    """The value's unit: seconds per call ("s") or bytes ("B")."""
+
+
+def sample_secrets(secret_type: type[BaseSecret], region: GameRegion, count: int, seed: int = 0) -> list:
+    """Return random secrets of a type to use as benchmark input."""
+    generator = random.Random(seed)
+    secrets = []
+    for _ in range(count):
+        game_id = generator.randrange(32767)
+        if secret_type is GameSecret:
+            secret = GameSecret(game_id=game_id, region=region,
+                                target_game=generator.choice(tuple(TargetGame)),
+                                link_name="".join(generator.choices("ABCDEFGHIJ", k=5)),
+                                child_name="".join(generator.choices("KLMNOPQRST", k=5)),
+                                animal=generator.choice(tuple(ObtainedCompanion)),
+                                behaviour=generator.randrange(64),
+                                is_linked_game=generator.random() < 0.5,
+                                is_hero_quest=generator.random() < 0.5)
+        elif secret_type is RingSecret:
+            secret = RingSecret(game_id=game_id, rings=generator.getrandbits(64), region=region)
+        else:
+            secret = MemorySecret(game_id=game_id, region=region, target_game=generator.choice(tuple(TargetGame)),
+                                  memory=generator.choice(tuple(MemoryEnum)), is_return_secret=generator.random() < 0.5)
+        secrets.append(secret)
+    return secrets
+
+
+def time_call(function: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best time taken by one call of function, in seconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def bench_stages(repeat: int = 5) -> Iterator[BenchmarkResult]:
+    """Time each stage of loading and encoding a secret, for every secret type and region."""
+    for secret_type in SECRET_TYPES:
+        for region in GameRegion:
+            secret = sample_secrets(secret_type, region, 1)[0]
+            encoded = bytes(secret)
+            string = create_string(bytearray(encoded), region)
+            decoded = secret_type.decode_bytes(encoded, region)
+            prefix = f"stage/{secret_type.__name__}/{region.name}"
+            stages = {
+                "parse_secret": lambda: parse_secret(string, region),
+                "create_string": lambda: create_string(bytearray(encoded), region),
+                "decode_bytes": lambda: secret_type.decode_bytes(encoded, region),
+                "encode_bytes": lambda: secret_type._encode_bytes(decoded, region),
+                "decode_raw": lambda: secret_type.decode_raw(encoded, region),
+                "load": lambda: secret_type.load(encoded, region),
+                "load_string": lambda: secret_type.load(string, region),
+                "bytes": lambda: bytes(secret),
+                "str": lambda: str(secret),
+            }
+            for stage, function in stages.items():
+                yield BenchmarkResult(f"{prefix}/{stage}", time_call(function, repeat), "s")
+
+
+def bench_batches(max_batch: int = 10 ** 6) -> Iterator[BenchmarkResult]:
+    """Time loading batches of ring secret strings of growing sizes, per secret."""
+    region = GameRegion.US_PAL
+    pool = [str(secret) for secret in sample_secrets(RingSecret, region, min(max_batch, 1000))]
+    size = 1
+    while size <= max_batch:
+        strings = (pool * (size // len(pool) + 1))[:size]
+        repeat = max(1, min(5, 10 ** 5 // size))
+        # One timed call per repetition: large batches take long enough on their own
+        elapsed = min(timeit.repeat(lambda: sum(1 for _ in load_many(strings, RingSecret, region)),
+                                    repeat=repeat, number=1))
+        yield BenchmarkResult(f"batch/load_many/{size}", elapsed / size, "s")
+        if numpy is not None:
+            symbols = numpy.array([parse_secret(string, region) for string in strings], dtype=numpy.uint8)
+            elapsed = min(timeit.repeat(lambda: RingSecret.decode_batch(symbols, region), repeat=repeat, number=1))
+            yield BenchmarkResult(f"batch/decode_batch_numpy/{size}", elapsed / size, "s")
+        size *= 10
+
+
+def bench_parse(max_length: int = 10 ** 6, repeat: int = 5) -> Iterator[BenchmarkResult]:
+    """Time parse_secret on pathological inputs of growing lengths, per character.
+
+    Parsing takes a single pass, so the time per character should stay the same as inputs grow."""
+    region = GameRegion.US_PAL
+    units = {
+        # Long whitespace runs between symbols
+        "whitespace": "B" + " " * 63,
+        # Nothing but brace tags
+        "tags": "{heart}{triangle}{spade}{right}",
+    }
+    for name, unit in units.items():
+        length = 100
+        while length <= max_length:
+            # Whole units only, so that no tag is cut in two
+            string = unit * max(1, length // len(unit))
+            elapsed = min(timeit.repeat(lambda: parse_secret(string, region), repeat=repeat, number=1))
+            yield BenchmarkResult(f"parse/{name}/{length}", elapsed / len(string), "s")
+            length *= 10
+
+
+def bench_import(repeat: int = 5) -> Iterator[BenchmarkResult]:
+    """Time a cold import of pyzora in a new interpreter, minus the interpreter's own start-up time."""
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+
+    startup = min(run("pass") for _ in range(repeat))
+    for name, code in (("pyzora", "import pyzora"), ("GameSecret", "from pyzora import GameSecret"),
+                       ("all", "from pyzora import *")):
+        imported = min(run(code) for _ in range(repeat))
+        yield BenchmarkResult(f"import/{name}", max(imported - startup, 0.0), "s")
+
+
+def bench_memory(count: int = 10000) -> Iterator[BenchmarkResult]:
+    """Measure the peak memory used while loading many secrets of each type, per secret."""
+    for secret_type in SECRET_TYPES:
+        region = GameRegion.US_PAL
+        encoded = [bytes(secret) for secret in sample_secrets(secret_type, region, count)]
+        gc.collect()
+        tracemalloc.start()
+        try:
+            loaded = [secret_type.load(data, region) for data in encoded]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del loaded
+        yield BenchmarkResult(f"memory/{secret_type.__name__}", peak / count, "B")
+
+
+GROUPS = {
+    "stages": lambda args: bench_stages(args.repeat),
+    "batches": lambda args: bench_batches(args.max_batch),
+    "parse": lambda args: bench_parse(args.max_length, args.repeat),
+    "import": lambda args: bench_import(args.repeat),
+    "memory": lambda args: bench_memory(args.memory_count),
+}
+
+
+def environment() -> dict:
+    """Return information about the environment benchmarks are run in."""
+    return {
+        "pyzora": pyzora.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "numpy": None if numpy is None else numpy.__version__,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[tuple[str, float, float]]:
+    """Return the benchmarks of current which are slower or bigger than in baseline by more than threshold.
+
+    :param baseline: The results of a previous run, as written to JSON.
+    :param current: The results of this run.
+    :param threshold: The allowed relative increase (0.1 for 10 %).
+    :return: The name, baseline value and current value of each regression."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or previous["value"] <= 0:
+            continue
+        if result["value"] > previous["value"] * (1 + threshold):
+            regressions.append((name, previous["value"], result["value"]))
+    return regressions
@@ -17,13 +17,69 @@ GNU General Public License for more details.
 
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+
+Names are loaded lazily (PEP 562): importing pyzora doesn't import any submodule, and accessing a name
+such as pyzora.RingSecret only imports the submodules it needs.
 """
-from pyzora.enums import *
-from pyzora.secret import *
-from pyzora.game_secret import *
-from pyzora.memory_secret import *
-from pyzora.ring_secret import *
-from pyzora.ring_types import *
-from pyzora.child_behaviour_tools import *
 __version__ = "1.0.0"
 __author__ = "fortwoone"
+
+# Submodule -> public names it provides
+_SUBMODULE_NAMES = {
+    "enums": ("ChildBehaviour", "ChildKind", "ChildQuestion", "GameRegion", "MemoryEnum", "ObtainedCompanion",
+              "RupeesGiven", "SecretStatus", "SleepMethod", "SymbolStyle", "TargetGame"),
+    "exceptions": ("ChecksumError", "NotAGameCodeError", "NotAMemoryCodeError", "NotARingCodeError", "SecretError"),
+    "bit_layout": ("BitField", "BitLayout"),
+    "secret": ("BaseSecret", "Byte", "U_AMPERSAND", "U_ASTERISK", "U_CIRCLE", "U_CLUB", "U_COMMERCIAL_AT", "U_DIAMOND",
+               "U_DOLLAR_SIGN", "U_DOWNWARDS_ARROW", "U_GURMUKHI_THREE", "U_HEART", "U_LEFTWARDS_ARROW", "U_PERCENT",
+               "U_RIGHTWARDS_ARROW", "U_SPADE", "U_SQUARE", "U_TRIANGLE", "U_UPWARDS_ARROW", "byte_array_to_string",
+               "calculate_checksum", "create_string", "integer_string", "parse_secret", "render_many", "render_secret",
+               "reverse_string", "reverse_substring", "secret_kind", "string_to_byte_array", "transcode", "transcode_many",
+               "transform_byte_to_bitstring"),
+    "ring_types": ("ARMOUR_1", "ARMOUR_2", "ARMOUR_3", "AllRings", "BLAST_RING", "BLUE", "BLUE_HOLY", "BLUE_JOY", "BLUE_LUCK",
+                   "BOMBERS_RING", "BOMBPROOF", "CHARGE_RING", "CURSED", "DISCOVERY", "DOUBLE_EDGED", "ENERGY", "EXPERTS_RING",
+                   "FIST", "FRIENDSHIP", "GASHA", "GBA_NATURE", "GBA_TIME", "GEN1", "GOLD_JOY", "GOLD_LUCK", "GREEN",
+                   "GREEN_HOLY", "GREEN_JOY", "GREEN_LUCK", "HEART1", "HEART2", "HUNDREDTH", "LIGHT1", "LIGHT2", "LIKE_LIKE",
+                   "MAPLES_RING", "MOBLIN", "NoRings", "OCTO", "PEACE", "PEGASUS", "POWER_1", "POWER_2", "POWER_3",
+                   "PROTECTION", "QUICKSAND", "RANG1", "RANG2", "RED", "RED_HOLY", "RED_JOY", "RED_LUCK", "RING_TYPES",
+                   "ROCS_RING", "RUPEE", "RingSet", "RingType", "SIGN", "SLAYER", "SNOWSHOE", "SPIN", "STEADFAST", "SUBROSIAN",
+                   "SWIMMERS_RING", "TOSS_RING", "VICTORY", "WHIMSICAL", "WHISP", "ZORA", "parse_ring_names"),
+    "game_secret": ("GAME_SECRET_LAYOUT", "GameSecret", "RawGameSecret"),
+    "memory_secret": ("MEMORY_SECRET_LAYOUT", "MemorySecret", "MemorySecretTable", "RawMemorySecret"),
+    "ring_secret": ("RING_SECRET_LAYOUT", "RawRingSecret", "RingSecret"),
+    "child_behaviour_tools": ("ChildBehaviourBatch", "get_behaviour", "get_child_behaviour_batch",
+                              "get_child_behaviour_value"),
+    "loading": ("LoadResult", "iter_chunks", "iter_numbered", "load_any", "load_chunk", "load_many", "validate",
+                "is_valid"),
+    "cache": ("CacheStats", "SecretCache"),
+    "correction": ("Correction", "suggest_corrections"),
+    "incremental": ("IncrementalSecretParser",),
+}
+_NAME_SUBMODULES = {name: submodule for submodule, names in _SUBMODULE_NAMES.items() for name in names}
+# Submodules which can also be used as attributes without being imported first, like when they were imported eagerly
+_SUBMODULES = frozenset(_SUBMODULE_NAMES)
+
+__all__ = list(_NAME_SUBMODULES)
+
+
+def _import_submodule(submodule: str):
+    """:meta private:"""
+    # The builtin __import__ is cheaper to import than importlib, and its imports show up in python -X importtime
+    return __import__(f"{__name__}.{submodule}", fromlist=("__name__",))
+
+
+def __getattr__(name: str):
+    submodule = _NAME_SUBMODULES.get(name)
+    if submodule is not None:
+        value = getattr(_import_submodule(submodule), name)
+    elif name in _SUBMODULES:
+        value = _import_submodule(name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Later accesses don't go through this function
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _NAME_SUBMODULES.keys())
@@ -0,0 +1,232 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Batch decoding of parsed secrets. Uses NumPy if it's installed (pip install pyzora[numpy]),
+and falls back to pure Python otherwise.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+from enum import EnumMeta
+from typing import Iterable
+from pyzora.secret import *
+from pyzora.secret import _transcode_window
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+_BATCH_RECORDS = {}
+_NUMPY_REVERSED_BITS = {}
+
+
+def _batch_record(layout: BitLayout) -> type:
+    """Return the named tuple type used for a layout's batch results.
+
+    :meta private:"""
+    record = _BATCH_RECORDS.get(layout)
+    if record is None:
+        record = _BATCH_RECORDS[layout] = namedtuple("BatchRecord", layout.record._fields + ("status",))
+    return record
+
+
+def _enum_fields(layout: BitLayout) -> tuple[tuple[str, EnumMeta], ...]:
+    """Return the fields of a layout converted to an enum type when loading a secret.
+
+    :meta private:"""
+    return tuple((field.name, field.kind) for field in layout.fields if isinstance(field.kind, EnumMeta))
+
+
+def _decode_row(secret_type, row, region: GameRegion, record: type):
+    """Decode one parsed secret of a batch.
+
+    :meta private:"""
+    layout = secret_type._LAYOUT
+    if len(row) != layout.length:
+        return record._make((0,) * len(layout.fields) + (SecretStatus.INVALID_LENGTH,))
+    status = SecretStatus.VALID
+    if max(row) > 63:
+        status = SecretStatus.INVALID_SYMBOL
+        row = bytes(value & 63 for value in row)
+    decoded = secret_type.decode_bytes(row, region)
+    fields = layout.unpack(decoded, convert=False)
+    if status == SecretStatus.VALID:
+        status = _check_decoded(secret_type, decoded, fields)
+    return record._make(fields + (status,))
+
+
+def _check_decoded(secret_type, decoded: bytearray, fields) -> SecretStatus:
+    """Return the status of a decoded secret with valid symbols.
+
+    :meta private:"""
+    status = secret_type._decoded_status(decoded)
+    if status != SecretStatus.VALID:
+        return status
+    for name, kind in _enum_fields(secret_type._LAYOUT):
+        try:
+            kind(getattr(fields, name))
+        except ValueError:
+            return SecretStatus.INVALID_FIELD
+    return SecretStatus.VALID
+
+
+def decode_batch_python(secret_type, rows: Iterable[bytes | bytearray], region: GameRegion) -> list:
+    """Decode parsed secrets one at a time, without NumPy.
+
+    :param secret_type: The secret class to decode the secrets as.
+    :type secret_type: type[BaseSecret]
+    :param rows: The parsed secrets (as returned by :func:`pyzora.secret.parse_secret`).
+    :type rows: Iterable[bytes | bytearray]
+    :param region: The region to use.
+    :type region: GameRegion
+    :return: One named tuple per secret, with the raw integer value of each field of the secret
+        type's layout and a status field.
+    :rtype: list"""
+    record = _batch_record(secret_type._LAYOUT)
+    return [_decode_row(secret_type, row, region, record) for row in rows]
+
+
+def _numpy_reversed_bits(width: int):
+    """Return the NumPy lookup table reversing the order of width bits.
+
+    :meta private:"""
+    table = _NUMPY_REVERSED_BITS.get(width)
+    if table is None:
+        values = numpy.arange(1 << width, dtype=numpy.uint32)
+        table = numpy.zeros(1 << width, dtype=numpy.uint32)
+        for bit in range(width):
+            table |= ((values >> bit) & 1) << (width - 1 - bit)
+        _NUMPY_REVERSED_BITS[width] = table
+    return table
+
+
+def _numpy_field_type(field: BitField):
+    """Return the smallest NumPy type able to store a field.
+
+    :meta private:"""
+    width = sum(width for _, width in field.segments)
+    for dtype in (numpy.uint8, numpy.uint16, numpy.uint32):
+        if width <= numpy.iinfo(dtype).bits:
+            return dtype
+    return numpy.uint64
+
+
+def _numpy_segment(decoded, offset: int, width: int, reverse: bool):
+    """Read one field segment from all rows of a decoded array.
+
+    :meta private:"""
+    first = offset // 6
+    last = (offset + width - 1) // 6
+    # Gather the bytes holding the segment, most significant bits first like in the bitstrings
+    covering = numpy.zeros(decoded.shape[0], dtype=numpy.uint32)
+    for pos in range(first, last + 1):
+        covering = (covering << 6) | decoded[:, pos]
+    covering_width = (last - first + 1) * 6
+    value = (covering >> (covering_width - (offset - first * 6) - width)) & ((1 << width) - 1)
+    if reverse:
+        value = _numpy_reversed_bits(width)[value]
+    return value.astype(numpy.uint64)
+
+
+def decode_batch_numpy(secret_type, symbols, region: GameRegion):
+    """Decode an array of parsed secrets with NumPy.
+
+    :param secret_type: The secret class to decode the secrets as.
+    :type secret_type: type[BaseSecret]
+    :param symbols: An N×L array of symbol values, L being the secret type's length.
+    :type symbols: numpy.ndarray
+    :param region: The region to use.
+    :type region: GameRegion
+    :raise SecretError: if the array doesn't have the expected shape.
+    :return: A structured array with one column per field of the secret type's layout
+        and a status column.
+    :rtype: numpy.ndarray"""
+    layout = secret_type._LAYOUT
+    symbols = numpy.asarray(symbols, dtype=numpy.uint8)
+    if symbols.ndim != 2 or symbols.shape[1] != layout.length:
+        raise SecretError(f"expected an array of shape (N, {layout.length}), got {symbols.shape}")
+    count, length = symbols.shape
+    status = numpy.zeros(count, dtype=numpy.uint8)
+
+    def flag(rows, value: SecretStatus):
+        status[(status == SecretStatus.VALID) & rows] = value
+
+    flag((symbols > 63).any(axis=1), SecretStatus.INVALID_SYMBOL)
+    symbols = symbols & 63
+    cipher = numpy.frombuffer(secret_type._CIPHERS[region], dtype=numpy.uint8)
+    cipher_key = symbols[:, 0] >> 3
+    cipher_pos = cipher_key.astype(numpy.intp)[:, None] * 4 + numpy.arange(length)
+    decoded = symbols ^ cipher[cipher_pos]
+    decoded[:, 0] = (decoded[:, 0] & 7) | (cipher_key << 3)
+    checksum = decoded[:, :-1].sum(axis=1, dtype=numpy.uint32) & 0xF
+    flag(checksum != (decoded[:, -1] & 0xF), SecretStatus.CHECKSUM_MISMATCH)
+
+    result = numpy.zeros(count, dtype=[(field.name, _numpy_field_type(field)) for field in layout.fields]
+                         + [("status", numpy.uint8)])
+    decoded = decoded.astype(numpy.uint32)
+    for field in layout.fields:
+        value = numpy.zeros(count, dtype=numpy.uint64)
+        shift = 0
+        for offset, width in field.segments:
+            value |= _numpy_segment(decoded, offset, width, field.reverse) << numpy.uint64(shift)
+            shift += width
+        result[field.name] = value
+    flag(result["secret_kind"] != secret_type._SECRET_KIND, SecretStatus.WRONG_KIND)
+    for name, kind in _enum_fields(layout):
+        flag(~numpy.isin(result[name], [member.value for member in kind]), SecretStatus.INVALID_FIELD)
+    result["status"] = status
+    return result
+
+
+def transcode_batch_numpy(symbols, from_region: GameRegion, to_region: GameRegion):
+    """Convert an array of parsed secrets from a region to another with NumPy.
+
+    :param symbols: An N×L array of symbol values.
+    :type symbols: numpy.ndarray
+    :param from_region: The region the secrets are written for.
+    :type from_region: GameRegion
+    :param to_region: The region to convert the secrets to.
+    :type to_region: GameRegion
+    :raise SecretError: if the array isn't two-dimensional, if it contains invalid symbols,
+        or if its secrets are too long for the cipher.
+    :return: The converted N×L uint8 array.
+    :rtype: numpy.ndarray"""
+    symbols = numpy.asarray(symbols, dtype=numpy.uint8)
+    if symbols.ndim != 2:
+        raise SecretError(f"expected an array of shape (N, L), got {symbols.shape}")
+    if (symbols > 63).any():
+        raise SecretError("secret contains invalid values")
+    length = symbols.shape[1]
+    if not length:
+        return symbols.copy()
+    # One mask per cipher key, picked for each row by the high bits of its first symbol
+    masks = numpy.zeros((8, length), dtype=numpy.uint8)
+    too_long = []
+    for cipher_key in range(8):
+        try:
+            window = _transcode_window(from_region, to_region, cipher_key, length)
+        except SecretError:
+            too_long.append(cipher_key)
+            continue
+        masks[cipher_key] = numpy.frombuffer(window.to_bytes(length, "big"), dtype=numpy.uint8)
+    cipher_key = symbols[:, 0] >> 3
+    if too_long and numpy.isin(cipher_key, too_long).any():
+        raise SecretError("secret contains invalid values")
+    return symbols ^ masks[cipher_key]
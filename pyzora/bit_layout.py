@@ -0,0 +1,203 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Bit layouts used to store fields in decoded secrets.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import namedtuple
+from typing import Callable, NamedTuple
+
+
+def _reverse_bits(value: int, width: int) -> int:
+    """Return value with its lowest width bits in reverse order.
+
+    :meta private:"""
+    result = 0
+    for _ in range(width):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+# Decoded secrets store 6 bits per byte, most significant bit first.
+_REVERSED_SYMBOL_BITS = tuple(_reverse_bits(value, 6) for value in range(64))
+# Lookup tables for fields stored most significant bit first.
+_REVERSED_BITS = tuple(tuple(_reverse_bits(value, width) for value in range(1 << width)) for width in range(9))
+
+
+class BitField(NamedTuple):
+    """A field stored in a decoded secret.
+
+    Bit positions are counted from the start of the secret, six bits per byte, with the
+    most significant bit of each byte first (like in the game's own bitstrings).
+    A field can be split into several segments, in which case the first segment holds
+    the field's lowest bits."""
+
+    name: str
+    """The field's name."""
+
+    segments: tuple[tuple[int, int], ...]
+    """The (offset, width) pairs for each part of the field."""
+
+    kind: Callable[[int], object] = int
+    """The type values are converted to when unpacking (an enum type, bool or int)."""
+
+    reverse: bool = True
+    """Most fields are stored least significant bit first. Set this to False for fields stored
+    most significant bit first (at most 8 bits wide)."""
+
+    @classmethod
+    def at(cls, name: str, offset: int, width: int, kind: Callable[[int], object] = int,
+           reverse: bool = True) -> "BitField":
+        """Return a field stored in a single segment.
+
+        :param name: The field's name.
+        :type name: str
+        :param offset: The field's first bit position.
+        :type offset: int
+        :param width: The field's width in bits.
+        :type width: int
+        :param kind: The type values are converted to when unpacking.
+        :param reverse: Whether the field is stored least significant bit first.
+        :type reverse: bool
+        :return: The new field.
+        :rtype: BitField"""
+        return cls(name, ((offset, width),), kind, reverse)
+
+
+class BitLayout:
+    """Compiled layout of all the fields stored in a decoded secret.
+
+    Decoded bytes are packed into a single integer where bit n is the n-th bit of the secret,
+    so that each field segment can be read and written with a shift and a mask."""
+    __slots__ = ("__length", "__fields", "__record", "__plan", "__names")
+
+    def __init__(self, length: int, fields: tuple[BitField, ...]):
+        """Compile a layout.
+
+        :param length: The length of decoded secrets using this layout, in bytes.
+        :type length: int
+        :param fields: The fields stored in the secret.
+        :type fields: tuple[BitField, ...]
+        :raise ValueError: if fields overlap, exceed the secret's length or can't be reversed."""
+        used_bits = 0
+        plan = []
+        for field in fields:
+            steps = []
+            shift = 0
+            for offset, width in field.segments:
+                mask = ((1 << width) - 1) << offset
+                if offset + width > length * 6:
+                    raise ValueError(f"field {field.name} exceeds the secret's length")
+                if used_bits & mask:
+                    raise ValueError(f"field {field.name} overlaps with another field")
+                if not field.reverse and width > 8:
+                    raise ValueError(f"field {field.name} is too wide to be stored most significant bit first")
+                used_bits |= mask
+                steps.append((offset, (1 << width) - 1, shift, None if field.reverse else _REVERSED_BITS[width]))
+                shift += width
+            kind = None if field.kind is int else field.kind
+            plan.append((field.name, (1 << shift) - 1, tuple(steps), kind))
+        self.__length = length
+        self.__fields = tuple(fields)
+        self.__record = namedtuple("SecretFields", (field.name for field in fields))
+        self.__plan = tuple(plan)
+        self.__names = frozenset(self.__record._fields)
+
+    length = property(lambda self: self.__length,
+                      doc="""The length of decoded secrets using this layout, in bytes.
+
+                      :type: int""")
+
+    fields = property(lambda self: self.__fields,
+                      doc="""The fields stored in the secret.
+
+                      :type: tuple[BitField, ...]""")
+
+    record = property(lambda self: self.__record,
+                      doc="""The named tuple type returned by :meth:`unpack`.
+
+                      :type: type""")
+
+    def to_integer(self, data: bytes | bytearray) -> int:
+        """Pack decoded bytes into a single integer.
+
+        :param data: The decoded bytes.
+        :type data: bytes or bytearray
+        :return: The packed integer, bit n being the n-th bit of the secret.
+        :rtype: int"""
+        reversed_bits = _REVERSED_SYMBOL_BITS
+        packed = 0
+        shift = 0
+        for value in data:
+            packed |= reversed_bits[value & 63] << shift
+            shift += 6
+        return packed
+
+    def from_integer(self, packed: int) -> bytearray:
+        """Unpack an integer into decoded bytes.
+
+        :param packed: The packed integer.
+        :type packed: int
+        :return: The decoded bytes.
+        :rtype: bytearray"""
+        reversed_bits = _REVERSED_SYMBOL_BITS
+        return bytearray(reversed_bits[(packed >> shift) & 63] for shift in range(0, self.__length * 6, 6))
+
+    def unpack(self, data: bytes | bytearray, convert: bool = True):
+        """Read all fields from decoded bytes.
+
+        :param data: The decoded bytes.
+        :type data: bytes or bytearray
+        :param convert: Whether to convert values to their fields' types. If not set, all values are integers.
+        :type convert: bool
+        :raise ValueError: if a value is not valid for its field's type.
+        :return: The field values.
+        :rtype: SecretFields"""
+        packed = self.to_integer(data)
+        values = []
+        for _, _, steps, kind in self.__plan:
+            value = 0
+            for offset, mask, shift, table in steps:
+                part = (packed >> offset) & mask
+                if table is not None:
+                    part = table[part]
+                value |= part << shift
+            values.append(value if kind is None or not convert else kind(value))
+        return self.__record._make(values)
+
+    def pack(self, **values) -> bytearray:
+        """Write fields into decoded bytes. Missing fields are set to zero, and values are
+        truncated to their fields' width.
+
+        :param values: The values for each field, by name.
+        :raise TypeError: if a value is given for an unknown field.
+        :return: The decoded bytes.
+        :rtype: bytearray"""
+        if not self.__names.issuperset(values):
+            raise TypeError(f"unknown fields : {', '.join(sorted(set(values) - self.__names))}")
+        packed = 0
+        for name, field_mask, steps, _ in self.__plan:
+            value = int(values.get(name, 0)) & field_mask
+            for offset, mask, shift, table in steps:
+                part = (value >> shift) & mask
+                if table is not None:
+                    part = table[part]
+                packed |= part << offset
+        return self.from_integer(packed)
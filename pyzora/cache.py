@@ -0,0 +1,161 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Bounded cache for loaded secrets, to avoid parsing and decoding the same secrets over and over.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from pyzora.secret import *
+
+
+class CacheStats(NamedTuple):
+    """Statistics of a secret cache."""
+
+    hits: int
+    """The number of secrets found in the cache."""
+
+    misses: int
+    """The number of secrets which had to be loaded."""
+
+    evictions: int
+    """The number of secrets removed to make room for new ones."""
+
+    expirations: int
+    """The number of secrets removed because they were cached for too long."""
+
+    size: int
+    """The number of secrets currently in the cache."""
+
+    max_size: int
+    """The maximum number of secrets in the cache."""
+
+
+def _parse(secret: str | bytes | bytearray, region: GameRegion) -> bytes:
+    """Return the symbols of a secret, used as its key in the cache. Different spellings of a secret string
+    share an entry, since only the symbols they're parsed into matter.
+
+    Keys can't be made from the strings themselves: the characters skipped by the parser also separate
+    aliases, so that "n e" and "ne" are parsed into different symbols.
+
+    :meta private:"""
+    if isinstance(secret, str):
+        secret = parse_secret(secret, region)
+    return bytes(secret)
+
+
+class SecretCache:
+    """A thread-safe, least recently used cache of loaded secrets.
+
+    Only successfully loaded secrets are cached. Since secrets can be modified through their
+    properties, the cache returns a copy of the cached secret on every call.
+
+    The cache can be used explicitly with :meth:`load`, or by all calls to the load method of
+    secret classes with :meth:`pyzora.secret.BaseSecret.use_cache`."""
+    __slots__ = ("__max_size", "__ttl", "__entries", "__lock", "__hits", "__misses", "__evictions",
+                 "__expirations")
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None):
+        """Create an empty cache.
+
+        :param max_size: The maximum number of secrets in the cache. When it is exceeded,
+            the least recently used secret is removed.
+        :type max_size: int
+        :param ttl: How long secrets stay in the cache, in seconds. If None, secrets only leave the
+            cache when it is full.
+        :type ttl: float or None
+        :raise ValueError: if max_size or ttl is not positive."""
+        if max_size < 1:
+            raise ValueError(f"expected a positive cache size (got {max_size})")
+        if ttl is not None and ttl <= 0:
+            raise ValueError(f"expected a positive time to live (got {ttl})")
+        self.__max_size = max_size
+        self.__ttl = ttl
+        # Key -> (secret, expiry time), least recently used first
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = self.__misses = self.__evictions = self.__expirations = 0
+
+    max_size = property(lambda self: self.__max_size,
+                        doc="""The maximum number of secrets in the cache.
+
+                        :type: int""")
+
+    ttl = property(lambda self: self.__ttl,
+                   doc="""How long secrets stay in the cache, in seconds (None if they don't expire).
+
+                   :type: float or None""")
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def load(self, secret_type: type[BaseSecret], secret: str | bytes | bytearray,
+             region: GameRegion) -> BaseSecret:
+        """Load a secret, or return a copy of it if it was already loaded.
+
+        :param secret_type: The secret class to load the secret with.
+        :type secret_type: type[BaseSecret]
+        :param secret: The secret string or parsed byte array to load.
+        :type secret: str or bytes or bytearray
+        :param region: The region to use when loading the secret.
+        :type region: GameRegion
+        :raise SecretError: if the secret can't be loaded (see the load method of the secret class).
+        :return: A new copy of the loaded secret.
+        :rtype: BaseSecret"""
+        region = GameRegion(region)
+        symbols = _parse(secret, region)
+        key = (secret_type, symbols, region)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > time.monotonic():
+                    self.__hits += 1
+                    self.__entries.move_to_end(key)
+                    return copy.copy(entry[0])
+                del self.__entries[key]
+                self.__expirations += 1
+            self.__misses += 1
+        # Load without holding the lock, so that other threads aren't blocked meanwhile
+        loaded = secret_type._load_parsed(symbols, region)
+        expiry = None if self.__ttl is None else time.monotonic() + self.__ttl
+        with self.__lock:
+            self.__entries[key] = (loaded, expiry)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+        return copy.copy(loaded)
+
+    def stats(self) -> CacheStats:
+        """Return the cache's statistics.
+
+        :return: The current statistics.
+        :rtype: CacheStats"""
+        with self.__lock:
+            return CacheStats(self.__hits, self.__misses, self.__evictions, self.__expirations,
+                              len(self.__entries), self.__max_size)
+
+    def clear(self):
+        """Remove all secrets from the cache, and reset its statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = self.__misses = self.__evictions = self.__expirations = 0
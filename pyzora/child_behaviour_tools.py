@@ -21,11 +21,14 @@ You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
 from pyzora.enums import *
-from typing import Literal
-from itertools import starmap
+from typing import Iterable, Literal, NamedTuple
+from itertools import chain, product
+from operator import add
 
 
 _NORM_METHODS = (str.upper, lambda x: x)
+# Byte -> its low 4 bits, to sum the nibbles of a name with bytes.translate
+_LOW_NIBBLES = bytes(value & 0xF for value in range(256))
 
 
 def _normalise_name(region: GameRegion, name: str) -> str:
@@ -46,14 +49,19 @@ def _get_value_for_child_name(region: GameRegion, name: str):
     if len(name) > 5:
         raise ValueError(f"invalid child name : must be at most 5 characters long (got a {len(name)}-character string instead)")
     b_name = bytes(_normalise_name(region, name), "utf-8")
-    value = sum(map((0xF).__and__, b_name)) - 3
-    while value > 255:
-        value -= 3
+    value = sum(b_name.translate(_LOW_NIBBLES)) - 3
+    if value > 255:
+        # Same as subtracting 3 until the value is at most 255
+        value -= (value - 253) // 3 * 3
     return value + 4
 
 
 _ChildBehaviourArgs = tuple[RupeesGiven, SleepMethod, ChildQuestion, ChildKind] | tuple[RupeesGiven, SleepMethod]
 _CHILDBEVHAVIOURTYPES=(RupeesGiven, SleepMethod, ChildQuestion, ChildKind)
+# Every combination of answers -> the sum of their values, keyed by the identity of the enum members:
+# hashing members is slow, and only members of the right types in the right order are found
+_ANSWER_TOTALS_BY_ID = {tuple(map(id, answers)): sum(answers)
+                        for answers in chain(product(*_CHILDBEVHAVIOURTYPES[:2]), product(*_CHILDBEVHAVIOURTYPES))}
 
 
 def get_child_behaviour_value(
@@ -75,9 +83,106 @@ def get_child_behaviour_value(
         return _get_value_for_child_name(region, name)
     if len(args) not in {2, 4}:
         raise TypeError(f"unexpected arguments (starting at the {('third', 'fifth')[len(args) > 4]} value) : {args}")
-    if not all(starmap(isinstance, zip(args, _CHILDBEVHAVIOURTYPES))):
+    total = _ANSWER_TOTALS_BY_ID.get(tuple(map(id, args)))
+    if total is None:
         raise TypeError(f"wrong argument order or unexpected arguments : {tuple(map(lambda obj: type(obj).__qualname__, args))}")
-    return _get_value_for_child_name(region, name) + sum(args)
+    return _get_value_for_child_name(region, name) + total
+
+# Answer enum -> values of its members, to check batch columns
+_ANSWER_VALUES = {answer_type: frozenset(map(int, answer_type)) for answer_type in _CHILDBEVHAVIOURTYPES}
+
+
+class ChildBehaviourBatch(NamedTuple):
+    """The results of :func:`get_child_behaviour_batch`."""
+
+    values: list
+    """The raw behaviour values (a list of integers, or an int16 array)."""
+
+    behaviours: list
+    """The corresponding behaviours (a list of ChildBehaviour members, or a uint8 array of their values)."""
+
+
+def get_child_behaviour_batch(region: GameRegion, names: Iterable[str], *answers: Iterable) -> ChildBehaviourBatch:
+    """Get the behaviour values and behaviours of many children at once.
+
+    Each distinct name is only evaluated once, and answers are checked and added a column at a time.
+    If a column is a NumPy array, values are added with vectorised operations and arrays are returned.
+
+    :param region: The region to use (see :func:`get_child_behaviour_value`).
+    :type region: GameRegion
+    :param names: The children's names.
+    :type names: Iterable[str]
+    :param answers: No columns, or 2 or 4 columns of answers, in the same order as the answers given
+        to :func:`get_child_behaviour_value`. Answers can be members of the expected enum or their integer values
+        (integer arrays for NumPy columns).
+    :type answers: Iterable[RupeesGiven], Iterable[SleepMethod], Iterable[ChildQuestion], Iterable[ChildKind]
+    :raise TypeError: if the number of answer columns is wrong.
+    :raise ValueError: if a name is too long, if an answer isn't valid, if the columns don't have the same length,
+        or if a behaviour value is above 255.
+    :return: The behaviour values and the behaviours.
+    :rtype: ChildBehaviourBatch"""
+    if len(answers) not in {0, 2, 4}:
+        raise TypeError(f"expected 0, 2 or 4 answer columns, got {len(answers)}")
+    if any(type(column).__module__ == "numpy" for column in chain((names,), answers)):
+        return _get_child_behaviour_batch_numpy(region, names, answers)
+    names = list(names)
+    name_values = {name: _get_value_for_child_name(region, name) for name in set(names)}
+    # Work a column at a time, so that each step runs in C
+    values = list(map(name_values.__getitem__, names))
+    for column, answer_type in zip(answers, _CHILDBEVHAVIOURTYPES):
+        column = list(column)
+        if len(column) != len(values):
+            raise ValueError(f"answer columns must have {len(values)} items, got {len(column)}")
+        _check_answers(column, answer_type)
+        values = list(map(add, values, column))
+    if values and max(values) > 255:
+        raise ValueError(f"integer value is out of bounds : {max(values)}")
+    return ChildBehaviourBatch(values, list(map(_BEHAVIOURS.__getitem__, values)))
+
+
+def _check_answers(column: list, answer_type: type):
+    """Check that a column only holds members of an answer enum, or integers which are values of its members.
+
+    :meta private:"""
+    # Exact types, so that floats, booleans and members of other enums are rejected
+    types = set(map(type, column))
+    if not types <= {answer_type, int}:
+        raise ValueError(f"invalid answers for {answer_type.__qualname__}")
+    if int in types and not set(map(int, column)) <= _ANSWER_VALUES[answer_type]:
+        raise ValueError(f"invalid answers for {answer_type.__qualname__}")
+
+
+def _get_child_behaviour_batch_numpy(region: GameRegion, names, answers: tuple) -> ChildBehaviourBatch:
+    """:meta private:"""
+    import numpy  # Only imported for NumPy columns, since NumPy is an optional dependency
+    if isinstance(names, numpy.ndarray):
+        unique_names, inverse = numpy.unique(names.astype(str), return_inverse=True)
+        name_values = numpy.array([_get_value_for_child_name(region, str(name)) for name in unique_names],
+                                  dtype=numpy.int16)
+        values = name_values[inverse.ravel()]
+    else:
+        # Hashing strings is cheaper than sorting them
+        names = list(names)
+        name_values = {name: _get_value_for_child_name(region, name) for name in set(names)}
+        values = numpy.fromiter(map(name_values.__getitem__, names), dtype=numpy.int16, count=len(names))
+    for column, answer_type in zip(answers, _CHILDBEVHAVIOURTYPES):
+        if isinstance(column, numpy.ndarray):
+            # Casting other arrays to integers would silently truncate them
+            if column.dtype.kind not in "iu":
+                raise ValueError(f"invalid answers for {answer_type.__qualname__} : {column.dtype} array")
+        else:
+            column = list(column)
+            _check_answers(column, answer_type)
+        column = numpy.asarray(column, dtype=numpy.int16)
+        if column.shape != values.shape:
+            raise ValueError(f"answer columns must have {values.shape[0]} items, got {column.shape}")
+        if not numpy.isin(column, list(_ANSWER_VALUES[answer_type])).all():
+            raise ValueError(f"invalid answers for {answer_type.__qualname__}")
+        values = values + column
+    if values.size and values.max() > 255:
+        raise ValueError(f"integer value is out of bounds : {values.max()}")
+    behaviours = numpy.array(_BEHAVIOURS, dtype=numpy.uint8)[values]
+    return ChildBehaviourBatch(values, behaviours)
 
 
 _Byte = Literal[*range(256)]  # writing all values from 0 to 256 would be slow and ugly
@@ -100,3 +205,7 @@ def get_behaviour(value: _Byte) -> ChildBehaviour:
     if value < 11:
         return ChildBehaviour.SHY
     return ChildBehaviour.BOUNCY
+
+
+# Behaviour value -> behaviour, for batches
+_BEHAVIOURS = tuple(map(get_behaviour, range(256)))
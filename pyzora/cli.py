@@ -0,0 +1,377 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Command-line tool to decode, encode, validate and convert secrets in bulk.
+Reads secrets from the standard input, and writes one record per secret to the standard output.
+
+Usage: python -m pyzora {decode,encode,validate,convert-region} [options]
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import csv
+import json
+import sys
+from typing import Callable, Iterable, Iterator, TextIO
+from pyzora.loading import *
+from pyzora.loading import _DETECTED_REGIONS, _SECRET_TYPES
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+from pyzora.records import parse_kind, parse_region, kind_name, error_string
+
+
+# Fields written for each secret type, in order
+_SECRET_FIELDS = {
+    GameSecret: ("game_id", "target_game", "link_name", "child_name", "animal", "behaviour",
+                 "is_linked_game", "is_hero_quest", "was_given_free_ring"),
+    RingSecret: ("game_id", "rings"),
+    MemorySecret: ("game_id", "target_game", "memory", "is_return_secret"),
+}
+_ENUM_FIELDS = {"target_game": TargetGame, "animal": ObtainedCompanion, "memory": MemoryEnum}
+_BOOL_FIELDS = frozenset(("is_linked_game", "is_hero_quest", "was_given_free_ring", "is_return_secret"))
+_TRUE_STRINGS = frozenset(("1", "true", "yes", "y"))
+_FALSE_STRINGS = frozenset(("", "0", "false", "no", "n"))
+
+
+class InputError(Exception):
+    """The input couldn't be read (malformed JSON or CSV, missing field...)."""
+
+
+def _argument_type(parse: Callable[[str], object]) -> Callable[[str], object]:
+    """Wrap a parsing function so that argparse shows its error messages.
+
+    :meta private:"""
+    def parse_argument(value: str):
+        try:
+            return parse(value)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(str(exc)) from None
+    return parse_argument
+
+
+def _convert_field(name: str, value):
+    """Convert a field value read from JSON or CSV to the type expected by secret classes.
+
+    :meta private:"""
+    if name in _ENUM_FIELDS:
+        enum_type = _ENUM_FIELDS[name]
+        if isinstance(value, str) and not value.strip().isdigit():
+            return enum_type[value.strip().upper()]
+        return enum_type(int(value))
+    if name in _BOOL_FIELDS:
+        if isinstance(value, str):
+            if value.strip().lower() in _TRUE_STRINGS:
+                return True
+            if value.strip().lower() in _FALSE_STRINGS:
+                return False
+            raise ValueError(f"expected a boolean value for {name}, got {value}")
+        return bool(value)
+    if name in ("link_name", "child_name"):
+        return str(value)
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+
+def secret_to_record(secret: BaseSecret) -> dict:
+    """Return the fields of a secret as a dictionary of JSON-compatible values.
+
+    :param secret: The secret to convert.
+    :type secret: BaseSecret
+    :return: The secret's kind, region and fields. Enum values are given by name.
+    :rtype: dict"""
+    record = {"kind": kind_name(type(secret)), "region": secret.region.name}
+    for name in _SECRET_FIELDS[type(secret)]:
+        value = getattr(secret, name)
+        if name in _ENUM_FIELDS:
+            value = value.name
+        elif name in _BOOL_FIELDS:
+            value = bool(value)
+        elif name in ("link_name", "child_name"):
+            value = value.rstrip()
+        record[name] = value
+    return record
+
+
+def record_to_secret(record: dict, kind: type[BaseSecret] | None, region: GameRegion | None) -> BaseSecret:
+    """Build a secret from a dictionary of fields, as written by :func:`secret_to_record`.
+
+    :param record: The secret's fields. Missing fields keep their default values.
+    :type record: dict
+    :param kind: The secret class to use if the record has no kind field.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use if the record has no region field.
+    :type region: GameRegion or None
+    :raise ValueError: if the kind or region is unknown, or if a field has an invalid value.
+    :return: The new secret.
+    :rtype: BaseSecret"""
+    if record.get("kind"):
+        kind = parse_kind(record["kind"])
+    if kind is None:
+        raise ValueError("the secret's kind must be given, either in the record or with --kind")
+    if record.get("region"):
+        region = parse_region(record["region"])
+    if region is None:
+        raise ValueError("the secret's region must be given, either in the record or with --region")
+    fields = {name: _convert_field(name, record[name]) for name in _SECRET_FIELDS[kind]
+              if record.get(name) not in (None, "")}
+    return kind(region=region, **fields)
+
+
+def _read_records(stream: TextIO, input_format: str) -> Iterator[dict | str]:
+    """Lazily read records from a stream. Text input gives one string per line.
+
+    :meta private:"""
+    if input_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip("\r\n")
+        if input_format == "text":
+            yield line
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise InputError(f"line {line_number}: invalid JSON ({exc})") from None
+        if not isinstance(record, dict):
+            raise InputError(f"line {line_number}: expected a JSON object")
+        yield record
+
+
+def _read_secrets(records: Iterable[dict | str], field: str) -> Iterator[str]:
+    """Extract secret strings from records.
+
+    :meta private:"""
+    for record in records:
+        if isinstance(record, str):
+            yield record
+            continue
+        if field not in record:
+            raise InputError(f"record has no {field} field : {record}")
+        # Missing secrets (from records which failed to encode, for example) are skipped like blank lines
+        yield record[field] or ""
+
+
+class _Writer:
+    """Writes records as JSON lines or CSV rows.
+
+    :meta private:"""
+
+    def __init__(self, stream: TextIO, output_format: str, columns: tuple[str, ...]):
+        self.__stream = stream
+        self.__csv = None
+        if output_format == "csv":
+            self.__csv = csv.DictWriter(stream, columns, restval="", extrasaction="ignore", lineterminator="\n")
+            self.__csv.writeheader()
+
+    def write(self, record: dict):
+        if self.__csv is not None:
+            self.__csv.writerow({key: "" if value is None else value for key, value in record.items()})
+        else:
+            self.__stream.write(json.dumps(record, ensure_ascii=False))
+            self.__stream.write("\n")
+
+
+def _field_columns(kind: type[BaseSecret] | None) -> tuple[str, ...]:
+    """Return the field columns for a secret kind, or for all kinds if it's unknown.
+
+    :meta private:"""
+    columns = {}
+    for secret_type in (kind,) if kind is not None else _SECRET_FIELDS:
+        columns.update(dict.fromkeys(_SECRET_FIELDS[secret_type]))
+    return tuple(columns)
+
+
+def _load_results(args, secrets: Iterable[str]) -> Iterator[LoadResult]:
+    """Load secrets in the current process or in workers, depending on the --jobs option.
+
+    :meta private:"""
+    if args.jobs == 1:
+        return load_many(secrets, args.kind, args.region, args.chunk_size or 1024)
+    from pyzora.parallel import decode_parallel
+    return decode_parallel(secrets, args.kind, args.region, jobs=args.jobs, chunk_size=args.chunk_size)
+
+
+def _run_decode(args, records: Iterable[dict | str], output: TextIO):
+    writer = _Writer(output, args.output_format, ("index", "secret", "kind", "region")
+                     + _field_columns(args.kind) + ("error",))
+    for result in _load_results(args, _read_secrets(records, args.field)):
+        record = {"index": result.index, "secret": result.source}
+        if result.secret is not None:
+            record.update(secret_to_record(result.secret))
+        record["error"] = error_string(result.error)
+        writer.write(record)
+
+
+def _run_validate(args, records: Iterable[dict | str], output: TextIO):
+    writer = _Writer(output, args.output_format, ("index", "secret", "valid", "kind", "region", "error"))
+    for result in _load_results(args, _read_secrets(records, args.field)):
+        record = {"index": result.index, "secret": result.source, "valid": result.error is None}
+        if result.secret is not None:
+            record["kind"] = kind_name(type(result.secret))
+            record["region"] = result.secret.region.name
+        record["error"] = error_string(result.error)
+        writer.write(record)
+
+
+def _convert_secret(source: str, kind: type[BaseSecret] | None, region: GameRegion | None,
+                    to_region: GameRegion) -> tuple[type[BaseSecret], str]:
+    """Check a secret string and convert it to another region, without loading it.
+
+    :meta private:"""
+    for from_region in _DETECTED_REGIONS if region is None else (region,):
+        try:
+            symbols = parse_secret(source, from_region)
+        except SecretError:
+            continue
+        if validate(symbols, kind, from_region) == SecretStatus.VALID:
+            return kind or _SECRET_TYPES[len(symbols)], render_secret(transcode(symbols, from_region, to_region),
+                                                                      to_region)
+    # Only invalid secrets are loaded, to raise the usual error
+    (load_any if kind is None else kind.load)(source, region)
+    raise SecretError("secret could not be converted")
+
+
+def _run_convert_region(args, records: Iterable[dict | str], output: TextIO):
+    # Converting a secret is a single XOR, much cheaper than sending it to a worker process, so --jobs is ignored
+    writer = _Writer(output, args.output_format, ("index", "source", "secret", "kind", "region", "error"))
+    for index, source in iter_numbered(_read_secrets(records, args.field)):
+        record = {"index": index, "source": source, "secret": None}
+        try:
+            secret_type, record["secret"] = _convert_secret(source, args.kind, args.region, args.to)
+        except (SecretError, ValueError) as exc:
+            record["error"] = error_string(exc)
+        else:
+            record["kind"] = kind_name(secret_type)
+            record["region"] = args.to.name
+            record["error"] = None
+        writer.write(record)
+
+
+def _build_secrets(args, records: Iterable[dict | str]) -> Iterator[BaseSecret | Exception]:
+    """Build secrets from records, replacing the ones which can't be built with the raised exception.
+
+    :meta private:"""
+    for record in records:
+        if isinstance(record, str):
+            raise InputError("encode needs JSON lines or CSV input")
+        try:
+            yield record_to_secret(record, args.kind, args.region)
+        except (SecretError, ValueError, KeyError, TypeError) as exc:
+            yield exc
+
+
+def _run_encode(args, records: Iterable[dict | str], output: TextIO):
+    from pyzora.parallel import encode_parallel
+    writer = _Writer(output, args.output_format, ("index", "secret", "kind", "region", "error"))
+    secrets = _build_secrets(args, records)
+    # Secrets which couldn't be built are passed through, so that their errors are written in order
+    for result in encode_parallel(secrets, jobs=args.jobs, chunk_size=args.chunk_size):
+        record = {"index": result.index, "secret": result.string}
+        error = result.error
+        if isinstance(result.source, Exception):
+            record["secret"] = None
+            error = result.source
+        else:
+            record["kind"] = kind_name(type(result.source))
+            record["region"] = result.source.region.name
+        if record["secret"] is not None:
+            record["secret"] = record["secret"].strip()
+        record["error"] = error_string(error)
+        writer.write(record)
+
+
+_COMMANDS = {
+    "decode": (_run_decode, "decode secrets into their fields"),
+    "encode": (_run_encode, "encode fields (JSON lines or CSV records) into secrets"),
+    "validate": (_run_validate, "check whether secrets are valid"),
+    "convert-region": (_run_convert_region, "convert secrets to another region"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line argument parser.
+
+    :return: The argument parser.
+    :rtype: argparse.ArgumentParser"""
+    parser = argparse.ArgumentParser(
+        prog="python -m pyzora",
+        description="Decode, encode, validate and convert Oracle secrets. Reads from the standard input and writes "
+                    "one record per secret to the standard output.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in _COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text, description=help_text)
+        subparser.add_argument("--kind", type=_argument_type(parse_kind), default=None, metavar="{auto,game,ring,memory}",
+                               help="secret type (default: auto, deduced from each secret)")
+        subparser.add_argument("--region", type=_argument_type(parse_region), default=None, metavar="{auto,jp,us}",
+                               help="secret region (default: auto, deduced from each secret)")
+        if name == "convert-region":
+            subparser.add_argument("--to", type=_argument_type(parse_region), required=True, metavar="{jp,us}",
+                                   help="region to convert secrets to")
+        subparser.add_argument("--input-format", choices=("text", "jsonl", "csv"),
+                               default="jsonl" if name == "encode" else "text",
+                               help="input format (default: %(default)s, one secret per line for text)")
+        subparser.add_argument("--output-format", choices=("jsonl", "csv"), default="jsonl",
+                               help="output format (default: %(default)s)")
+        subparser.add_argument("--field", default="secret",
+                               help="field holding secrets in JSON lines or CSV input (default: %(default)s)")
+        subparser.add_argument("--jobs", type=int, default=1,
+                               help="number of worker processes (default: %(default)s)")
+        subparser.add_argument("--chunk-size", type=int, default=None,
+                               help="number of secrets handled at a time (default: adjusted automatically)")
+    return parser
+
+
+def main(argv: list[str] | None = None, stdin: TextIO | None = None, stdout: TextIO | None = None) -> int:
+    """Run the command-line tool.
+
+    :param argv: The command-line arguments, without the program name. Defaults to sys.argv.
+    :type argv: list[str] or None
+    :param stdin: The stream to read from. Defaults to the standard input.
+    :type stdin: TextIO or None
+    :param stdout: The stream to write to. Defaults to the standard output.
+    :type stdout: TextIO or None
+    :return: The exit status.
+    :rtype: int"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be positive")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    if args.kind is not None and args.region is None and args.command != "encode":
+        parser.error("--region must be given along with --kind")
+    if args.command == "convert-region" and args.to is None:
+        parser.error("--to must be a region")
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    command = _COMMANDS[args.command][0]
+    try:
+        command(args, _read_records(stdin, args.input_format), stdout)
+        stdout.flush()
+    except InputError as exc:
+        print(f"{parser.prog}: error: {exc}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # The reading end of the pipe was closed (by head, for example): stop quietly
+        sys.stderr.close()
+        return 1
+    return 0
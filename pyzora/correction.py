@@ -0,0 +1,305 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Typo correction and wildcard completion for mistyped secrets. See :func:`suggest_corrections`.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from math import comb
+from itertools import combinations, product
+from typing import Iterator, NamedTuple
+from pyzora.secret import *
+from pyzora.secret import _TOKENIZERS, _VALID_CHARS_SELECT
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+
+
+_SECRET_TYPES = (GameSecret, RingSecret, MemorySecret)
+
+# Costs of the edits, lower meaning more likely
+_SAME_SHAPE_COST = 1  # Case or dakuten/handakuten differences
+_LOOK_ALIKE_COST = 2
+_SUBSTITUTION_COST = 4
+_UNREADABLE_COST = 4  # A character which isn't a symbol, replaced with any symbol
+_LENGTH_EDIT_COST = 4  # A missing or extra symbol
+
+# Symbols which are easily mistaken for one another, on top of the same shape pairs found automatically
+_LOOK_ALIKES = (
+    (("れ", "ね"), ("れ", "わ"), ("ね", "わ"), ("は", "ほ"), ("い", "り"), ("さ", "き"), ("さ", "ち"), ("う", "ら"),
+     ("し", "つ"), ("こ", "に"), ("あ", "お"), ("く", "へ"), ("そ", "て"), ("ま", "も")),
+    (("B", "8"), ("S", "5"), ("S", "$"), ("5", "$"), ("G", "6"), ("b", "6"), ("g", "9"), ("q", "9"), ("g", "q"),
+     ("T", "7"), ("&", "8"), ("#", "H"), ("-", "~"), ("-", "="), ("+", "*"), ("(", ")"), ("M", "N"), ("h", "n"),
+     ("m", "n"), ("●", "■"), ("▲", "↑"), ("♠", "♣"), ("♥", "♦"), ("↑", "↓"), ("←", "→")),
+)
+
+# Each unknown symbol but one makes the search 64 times larger, so searches are capped to this many patterns
+_MAX_SEARCH_SIZE = 1 << 17
+_UNKNOWN = -1
+_confusion_costs = {}  # region -> 64×64 substitution costs
+
+
+class Correction(NamedTuple):
+    """A candidate secret, as returned by :func:`suggest_corrections`."""
+
+    secret: str
+    """The candidate secret string, in groups of 5 symbols."""
+
+    symbols: bytes
+    """The candidate's symbol values, ready to be loaded."""
+
+    kind: type[BaseSecret]
+    """The secret class the candidate passes the checks of."""
+
+    region: GameRegion
+    """The region the candidate is written for."""
+
+    cost: int
+    """How unlikely the changes are, the sum of the cost of each change (wildcards are free)."""
+
+    changes: tuple[tuple[int, str, str], ...]
+    """The changes made to the typed secret, as (position, typed text, symbol) tuples in order of position.
+    Positions refer to the candidate. The typed text is empty for missing symbols, and the symbol is empty
+    for extra symbols, a removed symbol being reported at the position of the one that followed it."""
+
+    def to_object(self) -> BaseSecret:
+        """Load the candidate.
+
+        :raise SecretError: if one of the candidate's fields has an unknown value.
+        :return: The corresponding secret.
+        :rtype: BaseSecret"""
+        return self.kind.load(self.symbols, self.region)
+
+
+def _same_shape(first: str, second: str) -> bool:
+    """Return whether two symbols only differ by case or by dakuten/handakuten.
+
+    :meta private:"""
+    # Only imported once a table is built, since unicodedata is slow to import
+    import unicodedata
+    return (first.swapcase() == second
+            or unicodedata.normalize("NFD", first)[0] == unicodedata.normalize("NFD", second)[0])
+
+
+def _confusion_table(region: GameRegion) -> list[list[int]]:
+    """Return the cost of replacing each symbol with each other one, for a region.
+
+    :meta private:"""
+    table = _confusion_costs.get(region)
+    if table is None:
+        chars = _VALID_CHARS_SELECT[region]
+        table = [[0 if typed == chosen else _SAME_SHAPE_COST if _same_shape(typed, chosen) else _SUBSTITUTION_COST
+                  for chosen in chars] for typed in chars]
+        for first, second in _LOOK_ALIKES[region]:
+            first, second = chars.index(first), chars.index(second)
+            table[first][second] = table[second][first] = _LOOK_ALIKE_COST
+        table = _confusion_costs[region] = table
+    return table
+
+
+def _read_pattern(secret: str, region: GameRegion, wildcards: str) -> tuple[list[int], list[str | None]]:
+    """Parse a secret string with unknown symbols.
+
+    :return: The symbol values, _UNKNOWN standing for wildcards and unreadable characters,
+        and the typed text of unknown symbols (None for the others).
+    :meta private:"""
+    tokenizer = _TOKENIZERS[region]
+    symbols = []
+    typed = []
+
+    def read(segment: str):
+        while True:
+            data, invalid_pos = tokenizer.scan(segment)
+            symbols.extend(data)
+            typed.extend([None] * len(data))
+            if invalid_pos < 0:
+                return
+            symbols.append(_UNKNOWN)
+            typed.append(segment[invalid_pos])
+            segment = segment[invalid_pos + 1:]
+
+    start = 0
+    for pos, char in enumerate(secret):
+        if char in wildcards:
+            read(secret[start:pos])
+            symbols.append(_UNKNOWN)
+            typed.append(char)
+            start = pos + 1
+    read(secret[start:])
+    return symbols, typed
+
+
+def _length_variants(symbols: list[int], typed: list[str | None], length: int,
+                     chars: tuple[str, ...]) -> Iterator[tuple[list[int], list[str | None], tuple, int]]:
+    """Insert unknown symbols into, or remove symbols from a pattern to give it the required length.
+
+    :return: The patterns, the typed text of their unknown symbols, their changes and the number of edits made.
+    :meta private:"""
+    difference = length - len(symbols)
+    if not difference:
+        yield symbols, typed, (), 0
+    elif difference > 0:
+        for inserted in combinations(range(length), difference):
+            variant_symbols = symbols.copy()
+            variant_typed = typed.copy()
+            for pos in inserted:
+                variant_symbols.insert(pos, _UNKNOWN)
+                variant_typed.insert(pos, "")
+            yield variant_symbols, variant_typed, (), difference
+    else:
+        for removed in combinations(range(len(symbols)), -difference):
+            removed_set = frozenset(removed)
+            changes = tuple((pos - index, chars[symbols[pos]] if typed[pos] is None else typed[pos], "")
+                            for index, pos in enumerate(removed))
+            yield ([value for pos, value in enumerate(symbols) if pos not in removed_set],
+                   [text for pos, text in enumerate(typed) if pos not in removed_set], changes, -difference)
+
+
+def _complete(pattern: list[int], unknown: tuple[int, ...], cipher: bytes, secret_kind: int) -> Iterator[bytes]:
+    """Yield every way of filling the unknown positions of a pattern which passes the checksum and type bits checks.
+
+    The decoded symbols are the typed ones XORed with a window of the cipher, and the checksum only depends on the
+    low 4 bits of their sum. Once the first symbol (hence the cipher key) is set, the last unknown symbol is
+    deduced from the others: only 4 of its 64 values, differing in their 2 high bits, match the checksum.
+
+    :meta private:"""
+    length = len(pattern)
+    last = length - 1
+    if unknown and unknown[0] == 0:
+        firsts = range(64)
+        unknown = unknown[1:]
+    else:
+        firsts = (pattern[0],)
+    symbols = pattern.copy()
+    solved = unknown[-1] if unknown else None
+    free = unknown[:-1]
+    fixed = [pos for pos in range(1, last) if pos != solved and pos not in free]
+    for first in firsts:
+        cipher_key = first >> 3
+        window = cipher[cipher_key * 4:cipher_key * 4 + length]
+        if len(window) < length:
+            continue
+        head = (first ^ window[0]) & 7
+        if head >> 1 != secret_kind:
+            continue
+        symbols[0] = first
+        base = (head | cipher_key << 3) + sum([symbols[pos] ^ window[pos] for pos in fixed])
+        if solved is None:
+            if not (base - (symbols[last] ^ window[last])) & 0xF:
+                yield bytes(symbols)
+            continue
+        for values in product(range(64), repeat=len(free)):
+            total = base
+            for pos, value in zip(free, values):
+                symbols[pos] = value
+                total += value ^ window[pos]
+            if solved == last:
+                low_bits = (total ^ window[last]) & 0xF
+            else:
+                low_bits = (((symbols[last] ^ window[last]) - total) ^ window[solved]) & 0xF
+            for high_bits in (0, 16, 32, 48):
+                symbols[solved] = low_bits | high_bits
+                yield bytes(symbols)
+
+
+def _search_size(length: int, unknown_count: int, max_edits: int) -> int:
+    """Return roughly how many partial patterns a search goes through.
+
+    :meta private:"""
+    return sum(comb(length, edits) * 64 ** max(unknown_count + edits - 1, 0) for edits in range(max_edits + 1))
+
+
+def suggest_corrections(secret: str, kind: type[BaseSecret] | None, region: GameRegion, max_edits: int = 1,
+                        wildcards: str = "?", limit: int | None = 10) -> list[Correction]:
+    """Suggest secrets close to a mistyped one which pass the checksum and type bits checks.
+
+    Symbols can be replaced, and missing or extra symbols are handled when the secret doesn't have the required length.
+    Each of these counts as an edit, and so does each character which isn't a symbol of the region.
+    Wildcard characters stand for symbols the player couldn't read, and can be replaced with any symbol for free.
+    Replacing a symbol with one that looks like it (such as B and 8, or a kana with or without dakuten) is cheaper
+    than replacing it with any other symbol, so the most likely candidates come first.
+
+    Candidates are found without loading anything, by solving the checksum for one of the unknown symbols, so a
+    search with one edit takes about a millisecond. Each extra edit or wildcard makes the search about 64 times longer,
+    so two edits take a fraction of a second.
+
+    :param secret: The mistyped secret string.
+    :type secret: str
+    :param kind: The expected secret class, or None to try every type whose length is within reach.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use.
+    :type region: GameRegion
+    :param max_edits: The maximum number of edits.
+    :type max_edits: int
+    :param wildcards: The characters standing for unknown symbols. They are always treated as wildcards,
+        even if they are symbols of the region (like ? in the US/PAL alphabet), but filling them with that symbol
+        doesn't count as a change, so the secret as typed comes first among equally costly candidates.
+    :type wildcards: str
+    :param limit: The maximum number of candidates returned, or None to return them all.
+    :type limit: int or None
+    :raise ValueError: if max_edits is negative, or if there are too many unknown symbols and edits to search
+        (such as 2 wildcards and 2 edits).
+    :return: The candidates, least costly first. A secret which is already valid is returned with no changes.
+        Candidates may still fail to load if one of their fields has an unknown value.
+    :rtype: list[Correction]"""
+    if max_edits < 0:
+        raise ValueError("max_edits must be positive or zero")
+    region = GameRegion(region)
+    symbols, typed = _read_pattern(secret, region, wildcards)
+    unknown_count = len(typed) - typed.count(None)
+    length = max(secret_type.__required_length__ for secret_type in (_SECRET_TYPES if kind is None else (kind,)))
+    if _search_size(length, unknown_count, max_edits) > _MAX_SEARCH_SIZE:
+        raise ValueError(f"too many unknown symbols to search ({unknown_count} unknown symbols "
+                         f"and {max_edits} edits)")
+    chars = _VALID_CHARS_SELECT[region]
+    costs = _confusion_table(region)
+    cipher = BaseSecret._CIPHERS[region]
+    best = {}  # (kind, symbols) -> (sort key, correction)
+    for secret_type in (_SECRET_TYPES if kind is None else (kind,)):
+        length = secret_type.__required_length__
+        for pattern, pattern_typed, base_changes, length_edits in _length_variants(symbols, typed, length, chars):
+            unreadable = tuple(pos for pos, text in enumerate(pattern_typed) if text and text not in wildcards)
+            budget = max_edits - length_edits - len(unreadable)
+            if budget < 0:
+                continue
+            base_cost = _LENGTH_EDIT_COST * length_edits + _UNREADABLE_COST * len(unreadable)
+            unknown = tuple(pos for pos, value in enumerate(pattern) if value == _UNKNOWN)
+            known = [pos for pos, value in enumerate(pattern) if value != _UNKNOWN]
+            for edit_count in range(budget + 1):
+                for edited in combinations(known, edit_count):
+                    for candidate in _complete(pattern, tuple(sorted(unknown + edited)), cipher,
+                                               secret_type._SECRET_KIND):
+                        # Keeping the typed symbol is a search with fewer edits
+                        if any(candidate[pos] == pattern[pos] for pos in edited):
+                            continue
+                        cost = base_cost + sum([costs[pattern[pos]][candidate[pos]] for pos in edited])
+                        # A wildcard which is also a symbol is left unchanged by filling it with itself
+                        changes = base_changes + tuple((pos, pattern_typed[pos], chars[candidate[pos]])
+                                                       for pos in unknown
+                                                       if pattern_typed[pos] != chars[candidate[pos]])
+                        changes += tuple((pos, chars[pattern[pos]], chars[candidate[pos]]) for pos in edited)
+                        sort_key = (cost, len(changes), candidate)
+                        previous = best.get((secret_type, candidate))
+                        if previous is None or sort_key < previous[0]:
+                            best[secret_type, candidate] = sort_key, (candidate, secret_type, cost, changes)
+    ranked = sorted(best.values(), key=lambda item: item[0])
+    if limit is not None:
+        ranked = ranked[:limit]
+    return [Correction(render_secret(candidate, region), candidate, secret_type, region, cost,
+                       tuple(sorted(changes)))
+            for _, (candidate, secret_type, cost, changes) in ranked]
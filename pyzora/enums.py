@@ -192,3 +192,36 @@ class ChildQuestion(IntEnum):
     The bits set are the same regardless of the question asked."""
     NO_OR_EGG = 0
     YES_OR_CHICKEN = 4
+
+
+class SecretStatus(IntEnum):
+    """The result of checking a secret without raising an exception.
+    Values are ordered like the checks done when loading a secret: the first failing check
+    gives the status."""
+    VALID = 0
+    """The secret is valid."""
+
+    INVALID_LENGTH = 1
+    """The secret doesn't contain the number of symbols expected for its type."""
+
+    INVALID_SYMBOL = 2
+    """The secret contains a symbol that doesn't exist in its region."""
+
+    CHECKSUM_MISMATCH = 3
+    """The secret's checksum doesn't match its contents."""
+
+    WRONG_KIND = 4
+    """The secret's type bits are meant for another secret type."""
+
+    INVALID_FIELD = 5
+    """One of the secret's fields has a value that can't be used (like an unknown companion)."""
+
+
+class SymbolStyle(IntEnum):
+    """How symbols are written when rendering secret strings."""
+    SYMBOLS = 0
+    """Symbols are written as they appear in the games (kana in Japanese secrets)."""
+
+    ASCII = 1
+    """Symbols which aren't ASCII characters are written as their names between braces, like {heart} in US/PAL
+    secrets or {ka} in Japanese secrets. Secrets rendered this way can still be parsed."""
@@ -20,24 +20,85 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
-import copy as mod_copy
+from typing import NamedTuple
 from pyzora.secret import *
 
 
+_NAME_SEGMENTS = (
+    # Link's name, then the child's name, one character per segment
+    ((22, 8), (38, 8), (60, 8), (77, 8), (89, 8)),
+    ((30, 8), (46, 8), (68, 8), (97, 8), (106, 8)),
+)
+
+GAME_SECRET_LAYOUT = BitLayout(20, (
+    BitField.at("cipher_key", 0, 3),
+    BitField.at("secret_kind", 3, 2, reverse=False),
+    BitField.at("game_id", 5, 15),
+    BitField.at("is_hero_quest", 20, 1, bool),
+    BitField.at("target_game", 21, 1, TargetGame),
+    BitField("link_name", _NAME_SEGMENTS[0]),
+    BitField("child_name", _NAME_SEGMENTS[1]),
+    BitField.at("behaviour", 54, 6),
+    BitField.at("was_given_free_ring", 76, 1, bool),
+    BitField.at("animal", 85, 4, ObtainedCompanion),
+    BitField.at("is_linked_game", 105, 1, bool),
+))
+
+
+def _name_from_integer(value: int) -> str:
+    """Return a 5-character name from the integer stored in a game secret.
+
+    :meta private:"""
+    return value.to_bytes(5, "little").decode("utf-8")
+
+
+def _name_to_integer(name: str) -> int:
+    """Return the integer to store in a game secret for a 5-character name.
+
+    :meta private:"""
+    # Truncate to 5 bytes without splitting a character
+    data = bytes(name, "utf-8")[:5].decode("utf-8", "ignore").encode("utf-8")
+    return int.from_bytes(data, "little")
+
+
+class RawGameSecret(NamedTuple):
+    """The fields of a game secret, as returned by :meth:`GameSecret.decode_raw`."""
+
+    game_id: int
+    region: GameRegion
+    target_game: int
+    link_name: str
+    child_name: str
+    animal: int
+    behaviour: int
+    is_linked_game: bool
+    is_hero_quest: bool
+    was_given_free_ring: bool
+
+    def to_object(self) -> "GameSecret":
+        """Build a game secret from these fields.
+
+        :raise ValueError: if a field has an invalid value.
+        :return: The corresponding game secret.
+        :rtype: GameSecret"""
+        return GameSecret(**self._asdict())
+
+
 class GameSecret(BaseSecret):
     """A secret used to start a linked game.
 
     CAUTION : Non-Hero linked secrets are generated by one game and target the opposite one, but Hero's Secrets (non-linked)
     are generated by *the same game they are intended for*."""
-
-    __link_name = "\0" * 5
-    __child_name = mod_copy.deepcopy(__link_name)
-    __behaviour = bytearray((0,))
-    __animal = mod_copy.deepcopy(__behaviour)
-    __target_game = mod_copy.deepcopy(__behaviour)
-    __is_hero_quest = False
-    __is_linked_game = False
-    __was_given_free_ring = False
+    # Names are stored as the integers written in secrets, and only converted to strings when read
+    __slots__ = ("__link_name", "__child_name", "__behaviour", "__animal", "__target_game", "__is_hero_quest",
+                 "__is_linked_game", "__was_given_free_ring")
+    __required_length__ = 20
+    _LAYOUT = GAME_SECRET_LAYOUT
+    _SECRET_KIND = 0
+    _KIND_NAME = "game"
+    _KIND_ERROR = NotAGameCodeError
+    _REPR_FIELDS = ("game_id", "region", "target_game", "link_name", "child_name", "animal", "behaviour",
+                    "is_linked_game", "is_hero_quest", "was_given_free_ring")
 
     __args = (
         "game_id",
@@ -56,6 +117,12 @@ class GameSecret(BaseSecret):
     )
 
     def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.__link_name = self.__child_name = 0
+        self.__behaviour = 0
+        self.__animal = ObtainedCompanion.NONE
+        self.__target_game = TargetGame.AGES
+        self.__is_hero_quest = self.__is_linked_game = self.__was_given_free_ring = False
         for arg in self.__args:
             kwargs.setdefault(arg, None)
         for pos, arg in enumerate(self.__args):
@@ -63,12 +130,13 @@ class GameSecret(BaseSecret):
             if val is None:
                 try:
                     setattr(self, arg, args[pos])
-                except LookupError:
+                except (LookupError, AttributeError):
                     pass
             else:
                 try:
                     setattr(self, arg, val)
-                except LookupError:
+                except (LookupError, AttributeError):
+                    # secret_array, checksum and secret_string are only accepted for compatibility
                     pass
 
     def __set_target_game(self, value: TargetGame | int):
@@ -103,9 +171,9 @@ class GameSecret(BaseSecret):
     def __set_link_name(self, value: str):
         if len(value.strip()) > 5:
             raise ValueError(f"incorrect name for Link : {value}")
-        self.__link_name = value.strip().ljust(5, "\0").replace(" ", "\0")
+        self.__link_name = _name_to_integer(value.strip().replace(" ", "\0"))
 
-    link_name = property(lambda self: self.__link_name.replace("\0", " "), __set_link_name,
+    link_name = property(lambda self: _name_from_integer(self.__link_name).replace("\0", " "), __set_link_name,
                          doc="""Link's name. Takes at most 5 characters to fit in the secret.
                          
                          If you set this with a value containing spaces, they will be converted
@@ -114,9 +182,9 @@ class GameSecret(BaseSecret):
                          :type: str""")
 
     def __set_child_name(self, value: str):
-        self.__child_name = value.strip().ljust(5, "\0")
+        self.__child_name = _name_to_integer(value.strip())
 
-    child_name = property(lambda self: self.__child_name.replace("\0", " "), __set_child_name,
+    child_name = property(lambda self: _name_from_integer(self.__child_name).replace("\0", " "), __set_child_name,
                           doc="""Game secrets also store Bipin and Blossom's child's
                           name.
                           
@@ -141,13 +209,12 @@ class GameSecret(BaseSecret):
                       
                       :type: ObtainedCompanion""")
 
-    def __get_behaviour(self):
-        return int(self.__behaviour[0])
-
     def __set_behaviour(self, value):
-        self.__behaviour[0] = value
+        if not 0 <= value <= 255:
+            raise ValueError(f"invalid behaviour value : {value}")
+        self.__behaviour = int(value)
 
-    behaviour = property(__get_behaviour, __set_behaviour,
+    behaviour = property(lambda self: self.__behaviour, __set_behaviour,
                          doc="""Bipin and Blossom's child's behaviour is carried over
                          through secrets. 
                          
@@ -179,91 +246,49 @@ class GameSecret(BaseSecret):
         :return: A secret based on the data contained in secret.
         :rtype: GameSecret
         """
-        if isinstance(secret, str):
-            # Secret string. Parse it before doing anything else.
-            # Allows the user to give the region only once
-            return cls.load(parse_secret(secret, region), region)
-        if len(secret) != 20:
-            raise SecretError("secret must contain exactly 20 bytes")
-        decoded_bytes = cls.decode_bytes(secret, region)
-        decoded_secret = byte_array_to_string(decoded_bytes)
-        cloned_bytes = decoded_bytes.copy()
-        cloned_bytes[19] = 0
-        checksum = calculate_checksum(cloned_bytes)
-        if decoded_bytes[19] & 0xF != checksum & 0xF:
-            raise ChecksumError(
-                f"checksum ({checksum}) does not match expected value({decoded_bytes[19]})"
-            )
-        del cloned_bytes
-        game_id = int("".join(reversed(decoded_secret[5:20])), 2)
-        if decoded_secret[3:5] != "00":
-            raise NotAGameCodeError("given secret is not a game code")
-        is_hero_quest, target_game = (func(itm) for func, itm in zip(("1".__eq__, int),
-                                                                     decoded_secret[20:22]))
-        is_linked_game = bool(int(decoded_secret[105]))
-        link_name_array = bytearray((
-            Byte(reverse_substring(decoded_secret, 22, 8)),
-            Byte(reverse_substring(decoded_secret, 38, 8)),
-            Byte(reverse_substring(decoded_secret, 60, 8)),
-            Byte(reverse_substring(decoded_secret, 77, 8)),
-            Byte(reverse_substring(decoded_secret, 89, 8))
-        ))
-        link_name = link_name_array.decode("utf-8")
-        child_name_array = bytearray((
-            Byte(reverse_substring(decoded_secret, 30, 8)),
-            Byte(reverse_substring(decoded_secret, 46, 8)),
-            Byte(reverse_substring(decoded_secret, 68, 8)),
-            Byte(reverse_substring(decoded_secret, 97, 8)),
-            Byte(reverse_substring(decoded_secret, 106, 8)),
-        ))
-        child_name = child_name_array.decode("utf-8")
-        animal = ObtainedCompanion(Byte(reverse_substring(decoded_secret, 85, 4)))
-        behaviour = Byte(reverse_substring(decoded_secret, 54, 6))
-        was_given_free_ring = bool(int(decoded_secret[76]))
-        return GameSecret(game_id=game_id, region=region,
-                          link_name=link_name, target_game=target_game,
-                          child_name=child_name, animal=animal,
-                          was_given_free_ring=was_given_free_ring,
-                          is_linked_game=is_linked_game,
-                          is_hero_quest=is_hero_quest,
-                          behaviour=behaviour)
+        if cls._CACHE is not None:
+            return cls._CACHE.load(cls, secret, region)
+        return cls._load(secret, region)
+
+    @classmethod
+    def _from_fields(cls, fields, region: GameRegion) -> "GameSecret":
+        return GameSecret(game_id=fields.game_id, region=region,
+                          link_name=_name_from_integer(fields.link_name),
+                          target_game=fields.target_game,
+                          child_name=_name_from_integer(fields.child_name),
+                          animal=fields.animal,
+                          was_given_free_ring=fields.was_given_free_ring,
+                          is_linked_game=fields.is_linked_game,
+                          is_hero_quest=fields.is_hero_quest,
+                          behaviour=fields.behaviour)
+
+    @classmethod
+    def _raw_from_fields(cls, fields, region: GameRegion) -> RawGameSecret:
+        return RawGameSecret(fields.game_id, region, fields.target_game,
+                             _name_from_integer(fields.link_name).replace("\0", " "),
+                             _name_from_integer(fields.child_name).replace("\0", " "),
+                             fields.animal, fields.behaviour, bool(fields.is_linked_game),
+                             bool(fields.is_hero_quest), bool(fields.was_given_free_ring))
 
     def __bytes__(self):
-        link_byte_array = bytearray(self.link_name, "utf-8")
-        child_byte_array = bytearray(self.child_name, "utf-8")
-        cipher_key = (((self.game_id >> 8) + (self.game_id & 255)) & 7) * 2
-        unencoded_secret = "".join(
-            (
-                reverse_string(integer_string(cipher_key).rjust(3, "0")),
-                "00",  # This is to tell the game that we're writing a linking secret.
-                reverse_string(integer_string(self.game_id).rjust(15, "0")),
-                str(int(self.is_hero_quest)), str(int(self.target_game)),
-                reverse_string(integer_string(link_byte_array[0]).rjust(8, "0")),
-                reverse_string(integer_string(child_byte_array[0]).rjust(8, "0")),
-                reverse_string(integer_string(link_byte_array[1]).rjust(8, "0")),
-                reverse_string(integer_string(child_byte_array[1]).rjust(8, "0")),
-                reverse_string(integer_string(self.behaviour).rjust(6, "0")),
-                reverse_string(integer_string(link_byte_array[2]).rjust(8, "0")),
-                reverse_string(integer_string(child_byte_array[2]).rjust(8, "0")),
-                str(int(self.was_given_free_ring)),
-                reverse_string(integer_string(link_byte_array[3]).rjust(8, "0")),
-                reverse_string(integer_string(self.animal).rjust(4, "0")),
-                reverse_string(integer_string(link_byte_array[4]).rjust(8, "0")),
-                reverse_string(integer_string(child_byte_array[3]).rjust(8, "0")),
-                str(int(self.is_linked_game)),
-                reverse_string(integer_string(child_byte_array[4]).rjust(8, "0"))
-            )
+        return self._pack(
+            cipher_key=(((self.game_id >> 8) + (self.game_id & 255)) & 7) * 2,
+            game_id=self.game_id,
+            is_hero_quest=self.is_hero_quest,
+            target_game=self.target_game,
+            link_name=self.__link_name,
+            child_name=self.__child_name,
+            behaviour=self.behaviour,
+            was_given_free_ring=self.was_given_free_ring,
+            animal=self.animal,
+            is_linked_game=self.is_linked_game,
         )
-        unencoded_bytes = string_to_byte_array(unencoded_secret)
-        unencoded_bytes[19] = calculate_checksum(unencoded_bytes)
-        secret = self._encode_bytes(unencoded_bytes, self.region)
-        return bytes(secret)
 
     def __hash__(self):
         return hash(
             (
                 self.game_id,
-                self.__region,
+                self.region,
                 self.animal,
                 self.behaviour,
                 self.child_name,
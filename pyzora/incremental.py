@@ -0,0 +1,323 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Incremental parsing of secrets while they are being typed. See IncrementalSecretParser for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from pyzora.secret import *
+from pyzora.secret import _TOKENIZERS
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+
+
+# Type bits -> secret class
+_SECRET_TYPES = {secret_type._SECRET_KIND: secret_type for secret_type in (GameSecret, RingSecret, MemorySecret)}
+
+
+class IncrementalSecretParser:
+    """Parses a secret one keystroke at a time, for live validation while the player types it.
+
+    Characters are added with :meth:`append` and removed with :meth:`delete`, both in constant time
+    whatever the length of the input: the parser keeps the symbols read so far and the running sum of
+    their decoded values, and saves its state before each character so deleting one just restores it.
+    The symbols read are always the ones :func:`pyzora.secret.parse_secret` would give for the whole input,
+    aliases such as romaji or {heart} included. Characters which may start an alias are only read once
+    the alias is complete, or known not to be one.
+
+    The type of the secret is known from its first symbol, and its validity as soon as it's complete."""
+    __slots__ = ("__region", "__expected_kind", "__tokenizer", "__cipher", "__text", "__symbols", "__sums",
+                 "__invalid", "__pending_start", "__pending_node", "__history")
+
+    def __init__(self, region: GameRegion, kind: type[BaseSecret] | None = None, text: str = ""):
+        """
+        :param region: The region to use.
+        :type region: GameRegion
+        :param kind: The expected secret class, or None to accept the type given by the first symbol.
+        :type kind: type[BaseSecret] or None
+        :param text: The text already typed."""
+        self.__region = GameRegion(region)
+        self.__expected_kind = kind
+        self.__tokenizer = _TOKENIZERS[self.__region]
+        self.__cipher = BaseSecret._CIPHERS[self.__region]
+        self.__text = []
+        self.__symbols = bytearray()
+        # Running sums of the decoded symbols, item i being the sum of the first i + 1 ones
+        self.__sums = []
+        self.__invalid = []
+        # Start and trie node of the characters which may still be an alias
+        self.__pending_start = 0
+        self.__pending_node = None
+        # State before each typed character
+        self.__history = []
+        self.append(text)
+
+    region = property(lambda self: self.__region,
+                      doc="""The region used.
+
+                      :type: GameRegion""")
+
+    expected_kind = property(lambda self: self.__expected_kind,
+                             doc="""The expected secret class, or None if any type is accepted.
+
+                             :type: type[BaseSecret] or None""")
+
+    text = property(lambda self: "".join(self.__text),
+                    doc="""The text typed so far.
+
+                    :type: str""")
+
+    def append(self, chars: str):
+        """Add typed characters at the end of the input.
+
+        :param chars: The typed characters.
+        :type chars: str"""
+        text = self.__text
+        history = self.__history
+        for char in chars:
+            history.append((len(self.__symbols), len(self.__invalid), self.__pending_start, self.__pending_node))
+            text.append(char)
+            self.__feed(char, len(text) - 1)
+
+    def delete(self, count: int = 1):
+        """Remove characters from the end of the input, like backspace.
+
+        :param count: The number of characters to remove. Removing more characters than typed clears the input.
+        :type count: int"""
+        count = min(count, len(self.__text))
+        if count <= 0:
+            return
+        del self.__text[-count:]
+        symbol_count, invalid_count, self.__pending_start, self.__pending_node = self.__history[-count]
+        del self.__history[-count:]
+        del self.__symbols[symbol_count:]
+        del self.__sums[symbol_count:]
+        del self.__invalid[invalid_count:]
+
+    def clear(self):
+        """Remove all the characters typed."""
+        self.delete(len(self.__text))
+
+    def update(self, text: str):
+        """Replace the input with the whole text typed, for front ends which send it after each keystroke.
+
+        Only the characters after the part shared with the current input are deleted and appended.
+
+        :param text: The text typed.
+        :type text: str"""
+        current = self.__text
+        common = 0
+        for common, (old, new) in enumerate(zip(current, text), 1):
+            if old != new:
+                common -= 1
+                break
+        self.delete(len(current) - common)
+        self.append(text[common:])
+
+    def __feed(self, char: str, pos: int):
+        node = self.__pending_node
+        if node is not None:
+            child = node.get(char)
+            if child is not None:
+                self.__pending_node = child
+                return
+            # The alias can't go on, so read the pending characters before this one
+            self.__resolve_pending(pos)
+            self.__feed(char, pos)
+            return
+        node = self.__tokenizer.alias_trie.get(char)
+        if node is not None:
+            self.__pending_start = pos
+            self.__pending_node = node
+            return
+        self.__read_char(char, pos)
+
+    def __resolve_pending(self, end: int):
+        # Same rule as the tokenizer: take the longest alias, else read the first character on its own
+        text = self.__text
+        start = self.__pending_start
+        self.__pending_node = None
+        node = self.__tokenizer.alias_trie
+        match = None
+        match_end = start + 1
+        for pos in range(start, end):
+            node = node[text[pos]]
+            value = node.get(None)
+            if value is not None:
+                match = value
+                match_end = pos + 1
+        if match is None:
+            self.__read_char(text[start], start)
+        else:
+            self.__add_symbol(match)
+        # Pending characters are at most as many as the characters of the longest alias
+        for pos in range(match_end, end):
+            self.__feed(text[pos], pos)
+
+    def __read_char(self, char: str, pos: int):
+        value = self.__tokenizer.read_char(char)
+        if value is None:
+            return
+        if value < 0:
+            self.__invalid.append(pos)
+        else:
+            self.__add_symbol(value)
+
+    def __add_symbol(self, value: int):
+        symbols = self.__symbols
+        symbols.append(value)
+        sums = self.__sums
+        sums.append((sums[-1] if sums else 0) + self.__decoded(symbols, len(symbols) - 1))
+
+    def __decoded(self, symbols, index: int) -> int:
+        # The cipher window only depends on the first symbol, so decoded values don't depend on the length
+        cipher = self.__cipher
+        cipher_key = symbols[0] >> 3
+        pos = cipher_key * 4 + index
+        if not index:
+            return ((symbols[0] ^ cipher[pos]) & 7) | (cipher_key << 3)
+        # Symbols past the cipher are only found in secrets which are too long anyway
+        return symbols[index] ^ cipher[pos] if pos < len(cipher) else 0
+
+    def __pending(self) -> tuple[bytearray, list[int]]:
+        # Read the pending characters as if the input ended there
+        if self.__pending_node is None:
+            return bytearray(), []
+        symbols = bytearray()
+        invalid = []
+        offset = self.__pending_start
+        tail = "".join(self.__text[offset:])
+        while True:
+            data, invalid_pos = self.__tokenizer.scan(tail)
+            symbols += data
+            if invalid_pos < 0:
+                return symbols, invalid
+            invalid.append(offset + invalid_pos)
+            offset += invalid_pos + 1
+            tail = tail[invalid_pos + 1:]
+
+    @property
+    def symbols(self) -> bytes:
+        """The symbol values read so far.
+
+        :type: bytes"""
+        pending, _ = self.__pending()
+        return bytes(self.__symbols + pending)
+
+    @property
+    def invalid_positions(self) -> tuple[int, ...]:
+        """The positions of the characters which aren't symbols of the region, in the typed text.
+
+        :type: tuple[int, ...]"""
+        _, invalid = self.__pending()
+        return tuple(self.__invalid + invalid)
+
+    def __first_symbol(self) -> int | None:
+        if self.__symbols:
+            return self.__symbols[0]
+        pending, _ = self.__pending()
+        return pending[0] if pending else None
+
+    @property
+    def kind(self) -> type[BaseSecret] | None:
+        """The secret class given by the type bits of the first symbol, or None if no symbol was typed
+        or if the type bits don't match any secret type.
+
+        :type: type[BaseSecret] or None"""
+        first = self.__first_symbol()
+        if first is None:
+            return None
+        return _SECRET_TYPES.get(((first ^ self.__cipher[(first >> 3) * 4]) >> 1) & 3)
+
+    @property
+    def required_length(self) -> int | None:
+        """The number of symbols of the expected secret class, or of the detected one if any type is accepted.
+        None if it isn't known yet.
+
+        :type: int or None"""
+        kind = self.__expected_kind or self.kind
+        return None if kind is None else kind.__required_length__
+
+    @property
+    def remaining(self) -> int | None:
+        """How many symbols are left to type (negative if too many were typed), or None if the length isn't known yet.
+
+        :type: int or None"""
+        length = self.required_length
+        if length is None:
+            return None
+        pending, _ = self.__pending()
+        return length - len(self.__symbols) - len(pending)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether exactly as many symbols as required were typed.
+
+        :type: bool"""
+        return self.remaining == 0
+
+    @property
+    def status(self) -> SecretStatus:
+        """The result of the checks of :meth:`BaseSecret.validate <pyzora.secret.BaseSecret.validate>`
+        on the input. While the secret is incomplete, this is SecretStatus.INVALID_LENGTH
+        (unless an invalid symbol was typed).
+
+        :type: SecretStatus"""
+        pending, invalid = self.__pending()
+        if self.__invalid or invalid:
+            return SecretStatus.INVALID_SYMBOL
+        symbols = self.__symbols + pending if pending else self.__symbols
+        kind = self.__expected_kind or self.kind
+        if kind is None:
+            return SecretStatus.WRONG_KIND if symbols else SecretStatus.INVALID_LENGTH
+        length = kind.__required_length__
+        if len(symbols) != length:
+            return SecretStatus.INVALID_LENGTH
+        # Only the pending symbols aren't summed yet
+        summed = min(len(self.__sums), length - 1)
+        total = self.__sums[summed - 1] if summed else 0
+        for index in range(summed, length - 1):
+            total += self.__decoded(symbols, index)
+        if (total - self.__decoded(symbols, length - 1)) & 0xF:
+            return SecretStatus.CHECKSUM_MISMATCH
+        if (self.__decoded(symbols, 0) >> 1) & 3 != kind._SECRET_KIND:
+            return SecretStatus.WRONG_KIND
+        return SecretStatus.VALID
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the input is a complete secret which passes the checks of :attr:`status`.
+
+        :type: bool"""
+        return self.status == SecretStatus.VALID
+
+    def to_object(self) -> BaseSecret:
+        """Load the secret typed.
+
+        :raise SecretError: if the input isn't a valid secret, or if its type isn't known.
+        :return: The loaded secret.
+        :rtype: BaseSecret"""
+        kind = self.__expected_kind or self.kind
+        if kind is None:
+            raise SecretError("cannot tell the type of the secret typed")
+        invalid = self.invalid_positions
+        if invalid:
+            raise SecretError(f"Secret contains invalid value : {self.__text[invalid[0]]}. "
+                              "Perhaps you used the wrong region?")
+        return kind.load(self.symbols, self.__region)
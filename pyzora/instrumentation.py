@@ -0,0 +1,223 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Optional instrumentation of the loading and encoding stages, for telemetry.
+
+When enabled, the functions behind each stage are replaced with timed versions which count calls,
+cumulative time in nanoseconds and failures. When disabled, the original functions are put back,
+so instrumentation costs nothing at all.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from collections import Counter
+from time import perf_counter_ns
+from typing import Callable, NamedTuple
+import pyzora.secret
+from pyzora.secret import *
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+
+
+STAGES = ("load", "parse", "decode", "unpack", "construct", "encode")
+"""The instrumented stages:
+
+- load: a whole call to the load method of a secret class (including the stages below, but not the cache);
+- parse: converting a secret string to symbol values (:func:`pyzora.secret.parse_secret`);
+- decode: deciphering symbol values (:meth:`pyzora.secret.BaseSecret.decode_bytes`);
+- unpack: checking a decoded secret and reading its fields;
+- construct: building the secret object from its fields;
+- encode: writing fields, checksum and cipher when converting a secret to bytes."""
+
+
+class StageEvent(NamedTuple):
+    """An instrumented stage call, as given to hooks."""
+
+    stage: str
+    """The stage's name (see STAGES)."""
+
+    region: GameRegion | None
+    """The region used, or None if the stage doesn't depend on it."""
+
+    elapsed_ns: int
+    """How long the call took, in nanoseconds."""
+
+    error: Exception | None
+    """The exception raised by the call, or None if it succeeded."""
+
+
+# Stage -> [calls, cumulative nanoseconds, failures]
+_stage_counters = {stage: [0, 0, 0] for stage in STAGES}
+_failures_by_type = Counter()
+_failures_by_region = Counter()
+_hooks: list[Callable[[StageEvent], object]] = []
+# (owner, attribute name) -> original attribute, while enabled
+_originals = {}
+
+
+def _region_name(region) -> str:
+    """:meta private:"""
+    try:
+        return GameRegion(region).name
+    except ValueError:
+        return str(region)
+
+
+def _timed(stage: str, function: Callable, region_pos: int | None) -> Callable:
+    """Return a version of function which updates the counters of a stage.
+
+    :meta private:"""
+    counters = _stage_counters[stage]
+    top_level = stage == "load"
+
+    def region_of(args: tuple, kwargs: dict):
+        # The region may be given by keyword too
+        if region_pos is None:
+            return None
+        return args[region_pos] if len(args) > region_pos else kwargs.get("region")
+
+    def timed(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as exc:
+            elapsed = perf_counter_ns() - start
+            counters[0] += 1
+            counters[1] += elapsed
+            counters[2] += 1
+            region = region_of(args, kwargs)
+            if top_level:
+                # Nested stages fail along with the load, so only count the failure once
+                _failures_by_type[type(exc).__name__] += 1
+                _failures_by_region[_region_name(region)] += 1
+            if _hooks:
+                _call_hooks(StageEvent(stage, region, elapsed, exc))
+            raise
+        elapsed = perf_counter_ns() - start
+        counters[0] += 1
+        counters[1] += elapsed
+        if _hooks:
+            _call_hooks(StageEvent(stage, region_of(args, kwargs), elapsed, None))
+        return result
+
+    timed.__wrapped__ = function
+    return timed
+
+
+def _call_hooks(event: StageEvent):
+    """:meta private:"""
+    for hook in tuple(_hooks):
+        hook(event)
+
+
+def _instrumented_attributes() -> list[tuple[object, str, str, int | None]]:
+    """Return the attributes replaced when instrumentation is enabled, with their stage and
+    the position of their region argument.
+
+    :meta private:"""
+    attributes = [
+        (BaseSecret, "_load", "load", 2),
+        # Only the reference used by BaseSecret._load is replaced
+        (pyzora.secret, "parse_secret", "parse", 1),
+        (BaseSecret, "decode_bytes", "decode", 2),
+        (BaseSecret, "_unpack_decoded", "unpack", None),
+        (BaseSecret, "_pack", "encode", None),
+    ]
+    for secret_type in (GameSecret, RingSecret, MemorySecret):
+        attributes.append((secret_type, "_from_fields", "construct", 2))
+    return attributes
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is enabled.
+
+    :rtype: bool"""
+    return bool(_originals)
+
+
+def enable():
+    """Start instrumenting the loading and encoding stages. Does nothing if already enabled."""
+    if _originals:
+        return
+    for owner, name, stage, region_pos in _instrumented_attributes():
+        original = vars(owner)[name]
+        _originals[owner, name] = original
+        if isinstance(original, classmethod):
+            replacement = classmethod(_timed(stage, original.__func__, region_pos))
+        else:
+            replacement = _timed(stage, original, region_pos)
+        setattr(owner, name, replacement)
+
+
+def disable():
+    """Stop instrumenting, and put the original functions back. Counters are kept until :func:`reset` is called."""
+    while _originals:
+        (owner, name), original = _originals.popitem()
+        setattr(owner, name, original)
+
+
+def reset():
+    """Set all counters back to zero."""
+    for counters in _stage_counters.values():
+        counters[:] = (0, 0, 0)
+    _failures_by_type.clear()
+    _failures_by_region.clear()
+
+
+def snapshot() -> dict:
+    """Return a copy of the counters, ready to be exported as JSON.
+
+    Counters are updated without locks to keep instrumentation cheap, so a few updates may be lost
+    when many threads load secrets at the same time.
+
+    :return: A dictionary with these keys:
+
+        - enabled: whether instrumentation is enabled;
+        - stages: for each stage, its number of calls, cumulative time in nanoseconds (total_ns) and failures;
+        - failures_by_type: the number of failed loads per exception class name;
+        - failures_by_region: the number of failed loads per region name.
+    :rtype: dict"""
+    return {
+        "enabled": is_enabled(),
+        "stages": {
+            stage: {"calls": calls, "total_ns": total_ns, "failures": failures}
+            for stage, (calls, total_ns, failures) in _stage_counters.items()
+        },
+        "failures_by_type": dict(_failures_by_type),
+        "failures_by_region": dict(_failures_by_region),
+    }
+
+
+def add_hook(hook: Callable[[StageEvent], object]):
+    """Call a function after each instrumented stage call, with a :class:`StageEvent`.
+
+    Hooks are called in the thread which loads the secret, so they should return quickly.
+    Exceptions raised by hooks are propagated to the caller.
+
+    :param hook: The function to call.
+    :type hook: Callable[[StageEvent], object]"""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[StageEvent], object]):
+    """Stop calling a hook added with :func:`add_hook`.
+
+    :param hook: The function to stop calling.
+    :type hook: Callable[[StageEvent], object]
+    :raise ValueError: if the hook wasn't added."""
+    _hooks.remove(hook)
@@ -0,0 +1,246 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Helpers to load secrets of any type, or many secrets at once.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+from pyzora.secret import *
+from pyzora.secret import _TOKENIZERS
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+
+
+# Each secret type has its own length, so the number of symbols is enough to guess it.
+_SECRET_TYPES = {secret_type.__required_length__: secret_type for secret_type in (GameSecret, RingSecret, MemorySecret)}
+# Regions tried when none is given, in order of preference
+_DETECTED_REGIONS = (GameRegion.US_PAL, GameRegion.JP)
+
+
+class LoadResult(NamedTuple):
+    """The result of loading one secret out of many."""
+
+    index: int
+    """The secret's position in the input (line number starting at 0 for files)."""
+
+    source: str | bytes | bytearray
+    """The secret as it was given."""
+
+    secret: BaseSecret | None
+    """The loaded secret, or None if it couldn't be loaded."""
+
+    error: Exception | None
+    """The exception raised while loading the secret, or None if it was loaded."""
+
+
+def _read_lines(path: str | os.PathLike) -> Iterator[str]:
+    """Lazily read the lines of a text file, without their line endings.
+
+    :meta private:"""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            yield line.rstrip("\r\n")
+
+
+def load_chunk(kind: type[BaseSecret] | None, region: GameRegion | None,
+               chunk: Iterable[tuple[int, str | bytes | bytearray]]) -> list[LoadResult]:
+    """Load a chunk of numbered secrets.
+
+    :param kind: The secret class to load the secrets with. If None, each secret's type is deduced with :func:`load_any`.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use when loading the secrets. Can only be None if kind is None, in which case
+        each secret's region is deduced as well.
+    :type region: GameRegion or None
+    :param chunk: Pairs of positions and secrets to load.
+    :type chunk: Iterable[tuple[int, str | bytes | bytearray]]
+    :return: One result per secret, in the same order.
+    :rtype: list[LoadResult]"""
+    load = load_any if kind is None else kind.load
+    results = []
+    for index, source in chunk:
+        try:
+            results.append(LoadResult(index, source, load(source, region), None))
+        except (SecretError, ValueError) as exc:
+            results.append(LoadResult(index, source, None, exc))
+    return results
+
+
+def iter_numbered(source: Iterable[str | bytes | bytearray] | str | os.PathLike
+                  ) -> Iterator[tuple[int, str | bytes | bytearray]]:
+    """Lazily number secrets by their position in the input. Blank lines are skipped, but still counted.
+    Line endings are removed from secret strings, so open text files can be given directly.
+
+    :param source: The secrets, or the path to a text file containing one secret per line.
+    :type source: Iterable[str | bytes | bytearray] or str or os.PathLike
+    :return: An iterator over pairs of positions and secrets.
+    :rtype: Iterator[tuple[int, str | bytes | bytearray]]"""
+    if isinstance(source, (str, os.PathLike)):
+        source = _read_lines(source)
+    else:
+        source = (item.rstrip("\r\n") if isinstance(item, str) else item for item in source)
+    return (
+        (index, item) for index, item in enumerate(source)
+        if not isinstance(item, str) or item.strip()
+    )
+
+
+def iter_chunks(source: Iterable[str | bytes | bytearray] | str | os.PathLike,
+                chunk_size: int) -> Iterator[list[tuple[int, str | bytes | bytearray]]]:
+    """Split secrets into chunks of numbered secrets. Blank lines are skipped, but still counted.
+
+    :param source: The secrets, or the path to a text file containing one secret per line.
+    :type source: Iterable[str | bytes | bytearray] or str or os.PathLike
+    :param chunk_size: The maximum number of secrets in a chunk.
+    :type chunk_size: int
+    :raise ValueError: if the chunk size is not positive.
+    :return: An iterator over the chunks.
+    :rtype: Iterator[list[tuple[int, str | bytes | bytearray]]]"""
+    if chunk_size < 1:
+        raise ValueError(f"chunk size must be positive (got {chunk_size})")
+    numbered = iter_numbered(source)
+    while chunk := list(islice(numbered, chunk_size)):
+        yield chunk
+
+
+def load_many(source: Iterable[str | bytes | bytearray] | str | os.PathLike,
+              kind: type[BaseSecret] | None,
+              region: GameRegion | None,
+              chunk_size: int = 1024) -> Iterator[LoadResult]:
+    """Lazily load many secrets of the same type.
+
+    Secrets are read and loaded chunk by chunk, so that at most chunk_size secrets are held in
+    memory at a time, no matter how large the input is. Secrets which can't be loaded don't stop
+    the iteration: their results hold the raised exception instead.
+
+    :param source: The secrets (strings or parsed byte arrays), or the path to a text file
+        containing one secret per line.
+    :type source: Iterable[str | bytes | bytearray] or str or os.PathLike
+    :param kind: The secret class to load the secrets with. If None, each secret's type is deduced with :func:`load_any`.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use when loading the secrets. Can only be None if kind is None, in which case
+        each secret's region is deduced as well.
+    :type region: GameRegion or None
+    :param chunk_size: The maximum number of secrets read ahead.
+    :type chunk_size: int
+    :raise ValueError: if the chunk size is not positive.
+    :return: An iterator over the results, in input order.
+    :rtype: Iterator[LoadResult]"""
+    for chunk in iter_chunks(source, chunk_size):
+        yield from load_chunk(kind, region, chunk)
+
+
+def load_any(secret: str | bytes | bytearray, region: GameRegion | None = None) -> BaseSecret:
+    """Load a secret without knowing its type, and optionally its region.
+
+    The secret type is deduced from the number of symbols, and its type bits are checked once decoded.
+    If no region is given, it is deduced from the symbols used in the secret (Japanese secrets use kana,
+    while US/PAL secrets use latin letters and symbols). In the rare case where a secret only contains
+    symbols found in both regions, the region where the secret is valid is used.
+
+    :param secret: The secret string or parsed byte array to load.
+    :type secret: str or bytes or bytearray
+    :param region: The region to use when loading the secret. Deduced from the secret if not set.
+    :type region: GameRegion or None
+    :raise SecretError: if the secret is not valid in any region, or doesn't have the length of any secret type.
+        If its region isn't given and it contains invalid symbols in every region, the message gives the first
+        invalid symbol for each region, starting with the region where it comes last.
+    :raise ChecksumError: if the secret's checksum doesn't match the expected one.
+    :raise NotAGameCodeError: if the secret has the length of a game secret, but not its type bits (other types
+        raise their own errors).
+    :return: The loaded secret, as an instance of the corresponding class.
+    :rtype: BaseSecret"""
+    regions = _DETECTED_REGIONS if region is None else (GameRegion(region),)
+    if isinstance(secret, str):
+        candidates = []
+        # (position of the first invalid character, region), for each region the secret can't be parsed in
+        failures = []
+        for candidate_region in regions:
+            data, invalid_pos = _TOKENIZERS[candidate_region].scan(secret)
+            if invalid_pos < 0:
+                candidates.append((candidate_region, data))
+            else:
+                failures.append((invalid_pos, candidate_region))
+        if not candidates:
+            if len(regions) == 1:
+                # Parse again to get the usual error message
+                parse_secret(secret, regions[0])
+            # The region read furthest comes first, since it's the most likely one to have a typo
+            failures.sort(key=lambda failure: -failure[0])
+            raise SecretError("Secret contains invalid values in every region : " + ", ".join(
+                f"{secret[invalid_pos]} at position {invalid_pos} for {candidate_region.name}"
+                for invalid_pos, candidate_region in failures))
+    else:
+        if secret and max(secret) > 63:
+            raise SecretError("secret contains invalid values")
+        candidates = [(candidate_region, secret) for candidate_region in regions]
+    chosen = None
+    for candidate_region, data in candidates:
+        secret_type = _SECRET_TYPES.get(len(data))
+        if secret_type is None:
+            continue
+        decoded_bytes = secret_type.decode_bytes(data, candidate_region)
+        if chosen is None:
+            # If the secret is valid in no region, the preferred one will raise the corresponding error
+            chosen = secret_type, candidate_region, decoded_bytes
+        if secret_type._decoded_status(decoded_bytes) == SecretStatus.VALID:
+            chosen = secret_type, candidate_region, decoded_bytes
+            break
+    if chosen is None:
+        lengths = sorted(_SECRET_TYPES)
+        raise SecretError(f"secret must contain {', '.join(map(str, lengths[:-1]))} or {lengths[-1]} symbols")
+    secret_type, region, decoded_bytes = chosen
+    return secret_type._from_fields(secret_type._unpack_decoded(decoded_bytes), region)
+
+
+def validate(secret: str | bytes | bytearray, kind: type[BaseSecret] | None, region: GameRegion) -> SecretStatus:
+    """Check a secret without loading it, and tell why it's invalid. See :meth:`BaseSecret.validate`.
+
+    :param secret: The secret string or parsed byte array to check.
+    :type secret: str or bytes or bytearray
+    :param kind: The expected secret class, or None to accept any type (deduced from the number of symbols).
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use.
+    :type region: GameRegion
+    :return: SecretStatus.VALID, or the status of the first failing check.
+    :rtype: SecretStatus"""
+    if kind is None:
+        if isinstance(secret, str):
+            secret, invalid_pos = _TOKENIZERS[region].scan(secret)
+            if invalid_pos >= 0:
+                return SecretStatus.INVALID_SYMBOL
+        kind = _SECRET_TYPES.get(len(secret))
+        if kind is None:
+            return SecretStatus.INVALID_LENGTH
+    return kind.validate(secret, region)
+
+
+def is_valid(secret: str | bytes | bytearray, kind: type[BaseSecret] | None, region: GameRegion) -> bool:
+    """Return whether a secret passes the checks of :func:`validate`.
+
+    :param secret: The secret string or parsed byte array to check.
+    :type secret: str or bytes or bytearray
+    :param kind: The expected secret class, or None to accept any type.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use.
+    :type region: GameRegion
+    :rtype: bool"""
+    return validate(secret, kind, region) == SecretStatus.VALID
@@ -20,17 +20,50 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import NamedTuple
 from pyzora.secret import *
 
 
+MEMORY_SECRET_LAYOUT = BitLayout(5, (
+    BitField.at("cipher_key", 0, 3),
+    BitField.at("secret_kind", 3, 2, reverse=False),
+    BitField.at("game_id", 5, 15),
+    BitField.at("memory", 20, 4, MemoryEnum),
+    # Target game and return flag, stored alongside the checksum
+    BitField.at("mask", 24, 2, reverse=False),
+))
+
+
+class RawMemorySecret(NamedTuple):
+    """The fields of a memory secret, as returned by :meth:`MemorySecret.decode_raw`."""
+
+    game_id: int
+    region: GameRegion
+    target_game: int
+    memory: int
+    is_return_secret: bool
+
+    def to_object(self) -> "MemorySecret":
+        """Build a memory secret from these fields.
+
+        :raise ValueError: if the memory is invalid.
+        :return: The corresponding memory secret.
+        :rtype: MemorySecret"""
+        return MemorySecret(**self._asdict())
+
+
 class MemorySecret(BaseSecret):
     """A memory secret to transfer between two NPCS in Holodrum and Labrynna."""
 
+    __slots__ = ("__target_game", "__memory", "__is_return")
     __args = ("game_id", "region", "target_game", "memory", "is_return_secret")
-    __game_id = 0
-    __target_game = TargetGame.AGES
-    __memory = MemoryEnum.CLOCKSHOP_OR_KINGZORA
-    __is_return = False
+    __required_length__ = 5
+    _LAYOUT = MEMORY_SECRET_LAYOUT
+    _SECRET_KIND = 3
+    _KIND_NAME = "memory"
+    _KIND_ERROR = NotAMemoryCodeError
+    _REPR_FIELDS = ("game_id", "region", "target_game", "memory", "is_return_secret")
+    _TABLE = None
 
     def __set_memory(self, value: int):
         if value < 0:
@@ -64,6 +97,10 @@ class MemorySecret(BaseSecret):
                                 :type: bool""")
 
     def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.__target_game = TargetGame.AGES
+        self.__memory = MemoryEnum.CLOCKSHOP_OR_KINGZORA
+        self.__is_return = False
         for pos, arg in enumerate(self.__args):
             kwargs.setdefault(arg, None)
             if kwargs.get(arg) is None:
@@ -90,45 +127,163 @@ class MemorySecret(BaseSecret):
         :raise ChecksumError: if the given data's checksum doesn't match the expected one.
         :return: A secret based on the data contained in secret.
         :rtype: MemorySecret"""
-        if isinstance(secret, str):
-            # Secret string. Parse it before doing anything else.
-            # Allows the user to give the region only once
-            return cls.load(parse_secret(secret, region), region)
-        if len(secret) != 5:
-            raise SecretError("secret must contain exactly 5 bytes")
-        decoded_bytes = cls.decode_bytes(secret, region)
-        decoded_secret = byte_array_to_string(decoded_bytes)
-        cloned_bytes = decoded_bytes.copy()
-        cloned_bytes[4] = 0
-        checksum = calculate_checksum(cloned_bytes)
-        if (decoded_bytes[4] & 0xF) != (checksum & 0xF):
-            raise ChecksumError(f"the two values ({decoded_bytes[4]} and {checksum}) do not match")
-        if decoded_secret[3:5] != "11":
-            raise NotAMemoryCodeError("given secret is not a memory code")
-        game_id = int(reverse_substring(decoded_secret, 5, 15), 2)
-        memory = MemoryEnum(int(reverse_substring(decoded_secret, 20, 4), 2))
-        target_game = TargetGame(decoded_secret[24] != decoded_secret[25])
-        is_return_secret = bool(int(decoded_secret[24]))
-        return MemorySecret(game_id=game_id, region=region, memory=memory,
+        if cls._CACHE is not None:
+            return cls._CACHE.load(cls, secret, region)
+        return cls._load(secret, region)
+
+    @classmethod
+    def _load_parsed(cls, secret: bytearray | bytes, region: GameRegion) -> "MemorySecret":
+        table = cls._TABLE
+        if table is not None:
+            fields = table.lookup(secret, region)
+            if fields is not None:
+                game_id, memory, target_game, is_return_secret = fields
+                return MemorySecret(game_id=game_id, region=region, memory=memory,
+                                    target_game=target_game, is_return_secret=is_return_secret)
+        msecret = cls._from_fields(cls._unpack(secret, region), region)
+        if table is not None:
+            table.precompute((msecret.game_id,), (region,))
+        return msecret
+
+    @classmethod
+    def _from_fields(cls, fields, region: GameRegion) -> "MemorySecret":
+        # The first mask bit is set for return secrets, and the second one differs from it for Seasons
+        is_return_secret = bool(fields.mask & 2)
+        target_game = TargetGame(is_return_secret != bool(fields.mask & 1))
+        return MemorySecret(game_id=fields.game_id, region=region, memory=fields.memory,
                             target_game=target_game, is_return_secret=is_return_secret)
 
+    @classmethod
+    def _raw_from_fields(cls, fields, region: GameRegion) -> RawMemorySecret:
+        is_return_secret = bool(fields.mask & 2)
+        return RawMemorySecret(fields.game_id, region, int(is_return_secret != bool(fields.mask & 1)),
+                               fields.memory, is_return_secret)
+
+    @classmethod
+    def use_table(cls, table: "MemorySecretTable | None"):
+        """Use a precomputed table to load and encode memory secrets.
+
+        Once a game ID's secrets are in the table, loading one of them is a dictionary lookup
+        and encoding one is an index read. Secrets missing from the table are loaded and encoded
+        as usual, and their game ID's secrets are added to it.
+
+        :param table: The table to use, or None to stop using one.
+        :type table: MemorySecretTable or None"""
+        cls._TABLE = table
+
     def __bytes__(self):
+        if self._TABLE is not None:
+            return self._TABLE.encode(self.game_id, self.__memory, self.__target_game, self.__is_return, self.region)
+        return self._encode()
+
+    def _encode(self) -> bytes:
+        """Encode the secret without using a table.
+
+        :meta private:"""
         if self.target_game:
             cipher = 2 - self.__is_return
+            mask = 1 + self.__is_return
         else:
-            cipher = 3*self.__is_return
+            cipher = mask = 3*self.__is_return
         cipher |= (self.memory & 1) << 2
         cipher = ((self.game_id >> 8) + (self.game_id & 255) + cipher) & 7
-        cipher = int(reverse_string(integer_string(cipher).rjust(3, "0")), 2)
-        unencoded_secret = "".join((
-                integer_string(cipher).rjust(3, "0"), "11",
-                reverse_string(integer_string(cipher).rjust(15, "0")),
-                reverse_string(integer_string(self.memory).rjust(4, "0"))
-        ))
-        if self.target_game:
-            mask = 1 + self.__is_return
-        else:
-            mask = 3*self.__is_return
-        unencoded_bytes = string_to_byte_array(unencoded_secret)
-        unencoded_bytes[4] = calculate_checksum(unencoded_bytes) | (mask << 4)
-        return bytes(self._encode_bytes(unencoded_bytes, self.region))
+        return self._pack(cipher_key=cipher, game_id=self.game_id, memory=self.memory, mask=mask)
+
+
+# Fields of each secret in a table block, the block index being memory * 4 + target_game * 2 + is_return_secret
+_TABLE_ENTRIES = tuple(
+    (memory, target_game, is_return)
+    for memory in MemoryEnum for target_game in TargetGame for is_return in (False, True)
+)
+
+
+class MemorySecretTable:
+    """Precomputed memory secrets, built lazily one game ID at a time.
+
+    There are only 40 memory secrets per game ID and region, so they are all encoded the first
+    time one of them is needed. Only the secrets generated by :meth:`MemorySecret.__bytes__` are
+    stored: other spellings of the same secret (with another cipher key) are loaded as usual.
+
+    See :meth:`MemorySecret.use_table`."""
+    __slots__ = ("__max_game_ids", "__blocks", "__fields")
+
+    def __init__(self, max_game_ids: int | None = 4096):
+        """Create an empty table.
+
+        :param max_game_ids: The maximum number of game IDs kept in the table, all regions together (a game ID
+            counts once per region it was used with). When it is exceeded, the game ID added first is removed.
+            If None, the table can hold every game ID.
+        :type max_game_ids: int or None
+        :raise ValueError: if max_game_ids is not positive."""
+        if max_game_ids is not None and max_game_ids < 1:
+            raise ValueError(f"expected a positive number of game IDs (got {max_game_ids})")
+        self.__max_game_ids = max_game_ids
+        # (region, game ID) -> encoded secrets, in _TABLE_ENTRIES order
+        self.__blocks = {}
+        # (region, encoded secret) -> (game ID, memory, target game, is return secret)
+        self.__fields = {}
+
+    def __len__(self):
+        return len(self.__blocks)
+
+    def __block(self, game_id: int, region: GameRegion) -> tuple[bytes, ...]:
+        block = self.__blocks.get((region, game_id))
+        if block is None:
+            if self.__max_game_ids is not None and len(self.__blocks) >= self.__max_game_ids:
+                old_region, _ = old_key = next(iter(self.__blocks))
+                for data in self.__blocks.pop(old_key):
+                    del self.__fields[old_region, data]
+            block = tuple(
+                MemorySecret(game_id, region, target_game, memory, is_return)._encode()
+                for memory, target_game, is_return in _TABLE_ENTRIES
+            )
+            self.__blocks[region, game_id] = block
+            for data, (memory, target_game, is_return) in zip(block, _TABLE_ENTRIES):
+                self.__fields[region, data] = (game_id, memory, target_game, is_return)
+        return block
+
+    def precompute(self, game_ids, regions=tuple(GameRegion)):
+        """Add the secrets of several game IDs to the table.
+
+        :param game_ids: The game IDs to add.
+        :type game_ids: Iterable[int]
+        :param regions: The regions to add the secrets for. Defaults to all regions.
+        :type regions: Iterable[GameRegion]"""
+        regions = tuple(map(GameRegion, regions))
+        for game_id in game_ids:
+            for region in regions:
+                self.__block(game_id, region)
+
+    def encode(self, game_id: int, memory: MemoryEnum, target_game: TargetGame, is_return_secret: bool,
+               region: GameRegion) -> bytes:
+        """Return an encoded memory secret, adding its game ID's secrets to the table if needed.
+
+        :param game_id: The secret's game ID.
+        :type game_id: int
+        :param memory: The secret's memory.
+        :type memory: MemoryEnum
+        :param target_game: The secret's target game.
+        :type target_game: TargetGame
+        :param is_return_secret: Whether the secret is a return secret.
+        :type is_return_secret: bool
+        :param region: The secret's region.
+        :type region: GameRegion
+        :return: The encoded secret, as returned by bytes(MemorySecret(...)).
+        :rtype: bytes"""
+        return self.__block(game_id, region)[memory * 4 + target_game * 2 + is_return_secret]
+
+    def lookup(self, secret: bytes | bytearray, region: GameRegion) -> tuple | None:
+        """Return the fields of a parsed secret if it's in the table.
+
+        :param secret: The parsed secret.
+        :type secret: bytes or bytearray
+        :param region: The secret's region.
+        :type region: GameRegion
+        :return: The game ID, memory, target game and return flag of the secret, or None if it's not in the table.
+        :rtype: tuple[int, MemoryEnum, TargetGame, bool] or None"""
+        return self.__fields.get((region, bytes(secret)))
+
+    def clear(self):
+        """Remove all secrets from the table."""
+        self.__blocks.clear()
+        self.__fields.clear()
@@ -0,0 +1,208 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Parallel decoding and encoding of large amounts of secrets, using worker processes.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, NamedTuple
+from pyzora.loading import *
+
+
+# Chunks are resized so that each one takes about this long to process in a worker.
+_TARGET_CHUNK_SECONDS = 0.05
+_MIN_CHUNK_SIZE = 16
+_MAX_CHUNK_SIZE = 65536
+# Chunks submitted ahead per worker, to keep workers busy while results are consumed
+_CHUNKS_PER_WORKER = 2
+
+
+class EncodeResult(NamedTuple):
+    """The result of encoding one secret out of many."""
+
+    index: int
+    """The secret's position in the input."""
+
+    source: BaseSecret
+    """The secret to encode."""
+
+    string: str | None
+    """The encoded secret string, or None if the secret couldn't be encoded."""
+
+    error: Exception | None
+    """The exception raised while encoding the secret, or None if it was encoded."""
+
+
+def _init_worker():
+    """Build the symbol and cipher tables once when a worker process starts.
+
+    :meta private:"""
+    for region in GameRegion:
+        parse_secret("", region)
+        create_string(bytearray(), region)
+
+
+def _timed_call(function: Callable, *args):
+    """Call a function, and return how long it took along with its result.
+
+    :meta private:"""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def encode_chunk(chunk: Iterable[tuple[int, BaseSecret]]) -> list[EncodeResult]:
+    """Encode a chunk of numbered secrets into strings.
+
+    :param chunk: Pairs of positions and secrets to encode.
+    :type chunk: Iterable[tuple[int, BaseSecret]]
+    :return: One result per secret, in the same order.
+    :rtype: list[EncodeResult]"""
+    results = []
+    for index, secret in chunk:
+        try:
+            results.append(EncodeResult(index, secret, str(secret), None))
+        except (SecretError, ValueError) as exc:
+            results.append(EncodeResult(index, secret, None, exc))
+    return results
+
+
+class _ChunkSizer:
+    """Keeps chunks large enough to amortise inter-process communication,
+    but small enough to spread work evenly between workers.
+
+    :meta private:"""
+    __slots__ = ("size", "__adaptive")
+
+    def __init__(self, chunk_size: int | None):
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk size must be positive (got {chunk_size})")
+        self.size = _MIN_CHUNK_SIZE if chunk_size is None else chunk_size
+        self.__adaptive = chunk_size is None
+
+    def update(self, count: int, elapsed: float):
+        """Resize chunks based on how long the last one took."""
+        if not self.__adaptive:
+            return
+        if elapsed <= 0:
+            ideal = self.size * 2
+        else:
+            ideal = int(count * _TARGET_CHUNK_SECONDS / elapsed)
+        # Don't change size too abruptly, since timings are noisy
+        ideal = max(self.size // 2, min(ideal, self.size * 2))
+        self.size = max(_MIN_CHUNK_SIZE, min(ideal, _MAX_CHUNK_SIZE))
+
+    def chunks(self, numbered: Iterator) -> Iterator[list]:
+        """Split numbered items into chunks of the current size."""
+        while chunk := list(islice(numbered, self.size)):
+            yield chunk
+
+
+def _map_chunks(function: Callable, args: tuple, numbered: Iterator, jobs: int | None,
+                chunk_size: int | None) -> Iterator:
+    """Call function on chunks of numbered items in worker processes, and return an iterator over its results
+    in input order. Arguments are checked right away, rather than when iteration starts.
+
+    :meta private:"""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"number of jobs must be positive (got {jobs})")
+    return _iter_results(function, args, numbered, jobs, _ChunkSizer(chunk_size))
+
+
+def _iter_results(function: Callable, args: tuple, numbered: Iterator, jobs: int, sizer: _ChunkSizer) -> Iterator:
+    """:meta private:"""
+    chunks = sizer.chunks(numbered)
+    if jobs == 1:
+        # Not worth starting another process
+        for chunk in chunks:
+            elapsed, results = _timed_call(function, *args, chunk)
+            sizer.update(len(chunk), elapsed)
+            yield from results
+        return
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker)
+    try:
+        pending = deque()
+        for chunk in islice(chunks, jobs * _CHUNKS_PER_WORKER):
+            pending.append((len(chunk), executor.submit(_timed_call, function, *args, chunk)))
+        while pending:
+            count, future = pending.popleft()
+            elapsed, results = future.result()
+            sizer.update(count, elapsed)
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append((len(chunk), executor.submit(_timed_call, function, *args, chunk)))
+            yield from results
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def decode_parallel(source: Iterable[str | bytes | bytearray] | str | os.PathLike,
+                    kind: type[BaseSecret] | None,
+                    region: GameRegion | None,
+                    jobs: int | None = None,
+                    chunk_size: int | None = None) -> Iterator[LoadResult]:
+    """Load many secrets of the same type using several worker processes.
+
+    Works like :func:`pyzora.loading.load_many`, with results in input order. Only a few chunks
+    per worker are read ahead, so memory use stays bounded for large inputs.
+
+    :param source: The secrets (strings or parsed byte arrays), or the path to a text file
+        containing one secret per line.
+    :type source: Iterable[str | bytes | bytearray] or str or os.PathLike
+    :param kind: The secret class to load the secrets with. If None, each secret's type is deduced with
+        :func:`pyzora.loading.load_any`.
+    :type kind: type[BaseSecret] or None
+    :param region: The region to use when loading the secrets. Can only be None if kind is None, in which case
+        each secret's region is deduced as well.
+    :type region: GameRegion or None
+    :param jobs: The number of worker processes. Defaults to the number of CPUs.
+        If set to 1, secrets are loaded in the current process.
+    :type jobs: int or None
+    :param chunk_size: The number of secrets sent to a worker at a time. If not set, it is adjusted
+        based on how long chunks take to load.
+    :type chunk_size: int or None
+    :raise ValueError: if the number of jobs or the chunk size is not positive.
+    :return: An iterator over the results, in input order.
+    :rtype: Iterator[LoadResult]"""
+    return _map_chunks(load_chunk, (kind, region), iter_numbered(source), jobs, chunk_size)
+
+
+def encode_parallel(secrets: Iterable[BaseSecret],
+                    jobs: int | None = None,
+                    chunk_size: int | None = None) -> Iterator[EncodeResult]:
+    """Encode many secrets into strings using several worker processes.
+
+    :param secrets: The secrets to encode.
+    :type secrets: Iterable[BaseSecret]
+    :param jobs: The number of worker processes. Defaults to the number of CPUs.
+        If set to 1, secrets are encoded in the current process.
+    :type jobs: int or None
+    :param chunk_size: The number of secrets sent to a worker at a time. If not set, it is adjusted
+        based on how long chunks take to encode.
+    :type chunk_size: int or None
+    :raise ValueError: if the number of jobs or the chunk size is not positive.
+    :return: An iterator over the results, in input order.
+    :rtype: Iterator[EncodeResult]"""
+    return _map_chunks(encode_chunk, (), enumerate(secrets), jobs, chunk_size)
@@ -0,0 +1,93 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Names of secret kinds and regions as written in records, shared by the command-line tool and the HTTP service.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from pyzora.enums import GameRegion
+from pyzora.secret import BaseSecret
+from pyzora.game_secret import GameSecret
+from pyzora.ring_secret import RingSecret
+from pyzora.memory_secret import MemorySecret
+
+
+_KINDS = {"game": GameSecret, "ring": RingSecret, "memory": MemorySecret}
+_KIND_NAMES = {secret_type: name for name, secret_type in _KINDS.items()}
+_REGIONS = {"jp": GameRegion.JP, "us": GameRegion.US_PAL, "pal": GameRegion.US_PAL, "us_pal": GameRegion.US_PAL}
+
+
+def parse_region(value: str) -> GameRegion | None:
+    """Return the region for a command-line or record value.
+
+    :param value: The region's name (jp, us, pal or us_pal, in any case), or auto.
+    :type value: str
+    :raise ValueError: if the region is unknown, or if value isn't a string (when read from JSON, for example).
+    :return: The region, or None for auto, meaning it should be detected.
+    :rtype: GameRegion or None"""
+    if not isinstance(value, str):
+        raise ValueError(f"expected a region name, got {value!r}")
+    value = value.strip().lower()
+    if value == "auto":
+        return None
+    try:
+        return _REGIONS[value]
+    except KeyError:
+        raise ValueError(f"unknown region : {value} (expected auto, {', '.join(_REGIONS)})") from None
+
+
+def parse_kind(value: str) -> type[BaseSecret] | None:
+    """Return the secret class for a command-line or record value.
+
+    :param value: The kind's name (game, ring or memory, in any case), or auto.
+    :type value: str
+    :raise ValueError: if the kind is unknown, or if value isn't a string (when read from JSON, for example).
+    :return: The secret class, or None for auto, meaning it should be detected.
+    :rtype: type[BaseSecret] or None"""
+    if not isinstance(value, str):
+        raise ValueError(f"expected a kind name, got {value!r}")
+    value = value.strip().lower()
+    if value == "auto":
+        return None
+    try:
+        return _KINDS[value]
+    except KeyError:
+        raise ValueError(f"unknown kind : {value} (expected auto, {', '.join(_KINDS)})") from None
+
+
+def kind_name(secret_type: type[BaseSecret]) -> str:
+    """Return the name written in records for a secret class, as read by :func:`parse_kind`.
+
+    :param secret_type: The secret class.
+    :type secret_type: type[BaseSecret]
+    :raise KeyError: if the class isn't a secret type.
+    :return: The kind's name.
+    :rtype: str"""
+    return _KIND_NAMES[secret_type]
+
+
+def error_string(error: Exception | None) -> str | None:
+    """Return a short description of an exception for output records.
+
+    :param error: The exception, or None.
+    :type error: Exception or None
+    :return: The exception's type and message, or None if there was no exception.
+    :rtype: str or None"""
+    if error is None:
+        return None
+    return f"{type(error).__name__}: {error}"
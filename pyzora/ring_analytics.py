@@ -0,0 +1,194 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Vectorised statistics over large collections of ring masks, such as the rings column returned by
+:meth:`RingSecret.decode_batch <pyzora.secret.BaseSecret.decode_batch>`.
+Requires NumPy (pip install pyzora[numpy]).
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Iterable, NamedTuple
+from pyzora.ring_secret import RingSecret
+from pyzora.ring_types import *
+
+try:
+    import numpy
+except ImportError:  # NumPy is an optional dependency
+    numpy = None
+
+
+# Masks are expanded to one byte per ring this many at a time, to bound memory use
+_CHUNK_SIZE = 1 << 16
+
+
+class RingReport(NamedTuple):
+    """Statistics over a collection of ring masks, as returned by :func:`ring_report`."""
+
+    count: int
+    """The number of masks."""
+
+    frequencies: dict
+    """How many masks contain each ring, as a dictionary from ring type to count, in the order of RING_TYPES."""
+
+    size_histogram: "numpy.ndarray"
+    """The number of masks holding 0 to 64 rings, as an array of 65 counts."""
+
+    co_occurrence: "numpy.ndarray"
+    """How many masks contain each pair of rings, as a 64×64 array in the order of RING_TYPES.
+    The diagonal holds the frequency of each ring."""
+
+    complete: int
+    """The number of masks holding every ring (AllRings)."""
+
+    mean_completion: float
+    """The average proportion of the 64 rings held, between 0 and 1 (0 if there are no masks)."""
+
+
+def _require_numpy():
+    """:meta private:"""
+    if numpy is None:
+        raise ImportError("ring analytics require NumPy (pip install pyzora[numpy])")
+
+
+def ring_masks(rings) -> "numpy.ndarray":
+    """Convert ring collections to an array of 64-bit masks.
+
+    :param rings: An array of masks, or an iterable of ring secrets, ring sets or integers.
+    :type rings: numpy.ndarray or Iterable[RingSecret | RingSet | int]
+    :raise ImportError: if NumPy isn't installed.
+    :raise ValueError: if a mask doesn't fit in 64 bits.
+    :return: A one-dimensional uint64 array.
+    :rtype: numpy.ndarray"""
+    _require_numpy()
+    if isinstance(rings, numpy.ndarray):
+        return rings.astype(numpy.uint64, copy=False).ravel()
+    try:
+        count = len(rings)
+    except TypeError:
+        count = -1
+    # Reading the mask directly is much cheaper than going through ring lists
+    values = (ring.rings if type(ring) is RingSecret else int(ring) for ring in rings)
+    try:
+        return numpy.fromiter(values, dtype=numpy.uint64, count=count)
+    except OverflowError:
+        raise ValueError("ring masks must fit in 64 bits") from None
+
+
+def _ring_bits(masks: "numpy.ndarray") -> "numpy.ndarray":
+    """Expand masks to an N×64 array holding 0 or 1 for each ring, column i standing for RING_TYPES[i].
+
+    :meta private:"""
+    as_bytes = masks.astype("<u8", copy=False).view(numpy.uint8).reshape(-1, 8)
+    return numpy.unpackbits(as_bytes, axis=1, bitorder="little")
+
+
+def _chunks(masks: "numpy.ndarray") -> Iterable["numpy.ndarray"]:
+    """:meta private:"""
+    for start in range(0, masks.shape[0], _CHUNK_SIZE):
+        yield masks[start:start + _CHUNK_SIZE]
+
+
+def _popcount(masks: "numpy.ndarray") -> "numpy.ndarray":
+    """Return the number of rings in each mask.
+
+    :meta private:"""
+    if hasattr(numpy, "bitwise_count"):  # NumPy 2.0 or later
+        return numpy.bitwise_count(masks)
+    return numpy.concatenate([_ring_bits(chunk).sum(axis=1, dtype=numpy.uint8) for chunk in _chunks(masks)]
+                             or [numpy.zeros(0, dtype=numpy.uint8)])
+
+
+def _named(counts: "numpy.ndarray") -> dict:
+    """:meta private:"""
+    return dict(zip(RING_TYPES, counts.tolist()))
+
+
+def ring_frequencies(rings) -> dict:
+    """Count how many collections contain each ring.
+
+    :param rings: The collections to count (see :func:`ring_masks`).
+    :type rings: numpy.ndarray or Iterable[RingSecret | RingSet | int]
+    :raise ImportError: if NumPy isn't installed.
+    :return: The number of collections containing each ring type, in the order of RING_TYPES.
+    :rtype: dict[RingType, int]"""
+    masks = ring_masks(rings)
+    counts = numpy.zeros(64, dtype=numpy.int64)
+    for chunk in _chunks(masks):
+        counts += _ring_bits(chunk).sum(axis=0, dtype=numpy.int64)
+    return _named(counts)
+
+
+def size_histogram(rings) -> "numpy.ndarray":
+    """Count collections by number of rings held.
+
+    :param rings: The collections to count (see :func:`ring_masks`).
+    :type rings: numpy.ndarray or Iterable[RingSecret | RingSet | int]
+    :raise ImportError: if NumPy isn't installed.
+    :return: An array of 65 counts, item i being the number of collections holding exactly i rings.
+    :rtype: numpy.ndarray"""
+    return numpy.bincount(_popcount(ring_masks(rings)), minlength=65)
+
+
+def co_occurrence(rings, among=None) -> tuple["numpy.ndarray", tuple[RingType, ...]]:
+    """Count how many collections contain each pair of rings.
+
+    :param rings: The collections to count (see :func:`ring_masks`).
+    :type rings: numpy.ndarray or Iterable[RingSecret | RingSet | int]
+    :param among: The rings to compare, to restrict the matrix to a few rare rings for example.
+        All rings are compared by default.
+    :type among: Iterable[RingType] or RingSet or None
+    :raise ImportError: if NumPy isn't installed.
+    :return: A K×K array of counts, K being the number of rings compared, and the rings its rows
+        and columns stand for, in the order of RING_TYPES. The diagonal holds the frequency of each ring.
+    :rtype: tuple[numpy.ndarray, tuple[RingType, ...]]"""
+    masks = ring_masks(rings)
+    ring_types = RING_TYPES if among is None else tuple(RingSet(among))
+    columns = numpy.array([ring.position for ring in ring_types], dtype=numpy.intp)
+    return _co_occurrence(masks, columns), ring_types
+
+
+def _co_occurrence(masks: "numpy.ndarray", columns: "numpy.ndarray") -> "numpy.ndarray":
+    """:meta private:"""
+    matrix = numpy.zeros((columns.shape[0], columns.shape[0]), dtype=numpy.int64)
+    for chunk in _chunks(masks):
+        # Float products use BLAS, and stay exact since a chunk's counts are far below 2 ** 24
+        bits = _ring_bits(chunk)[:, columns].astype(numpy.float32)
+        matrix += (bits.T @ bits).astype(numpy.int64)
+    return matrix
+
+
+def ring_report(rings) -> RingReport:
+    """Compute all statistics over ring collections in one pass.
+
+    :param rings: The collections to study (see :func:`ring_masks`).
+    :type rings: numpy.ndarray or Iterable[RingSecret | RingSet | int]
+    :raise ImportError: if NumPy isn't installed.
+    :rtype: RingReport"""
+    masks = ring_masks(rings)
+    count = masks.shape[0]
+    matrix = _co_occurrence(masks, numpy.arange(64, dtype=numpy.intp))
+    sizes = _popcount(masks)
+    histogram = numpy.bincount(sizes, minlength=65)
+    return RingReport(
+        count=count,
+        frequencies=_named(matrix.diagonal()),
+        size_histogram=histogram,
+        co_occurrence=matrix,
+        complete=int(histogram[64]),
+        mean_completion=float(sizes.mean()) / 64 if count else 0.0,
+    )
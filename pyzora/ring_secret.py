@@ -20,10 +20,35 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import NamedTuple
 from pyzora.secret import *
 from pyzora.ring_types import *
 
 
+RING_SECRET_LAYOUT = BitLayout(15, (
+    BitField.at("cipher_key", 0, 3),
+    BitField.at("secret_kind", 3, 2, reverse=False),
+    BitField.at("game_id", 5, 15),
+    # Rings are stored 8 at a time, lowest bits first
+    BitField("rings", ((52, 8), (20, 8), (68, 8), (44, 8), (60, 8), (28, 8), (76, 8), (36, 8))),
+))
+
+
+class RawRingSecret(NamedTuple):
+    """The fields of a ring secret, as returned by :meth:`RingSecret.decode_raw`."""
+
+    game_id: int
+    region: GameRegion
+    rings: int
+
+    def to_object(self) -> "RingSecret":
+        """Build a ring secret from these fields.
+
+        :return: The corresponding ring secret.
+        :rtype: RingSecret"""
+        return RingSecret(game_id=self.game_id, rings=self.rings, region=self.region)
+
+
 class RingSecret(BaseSecret):
     """A ring secret. Ring secrets can be used to transfer a player's ring
     collection from one game to another.
@@ -35,30 +60,55 @@ class RingSecret(BaseSecret):
 
     if FRIENDSHIP in secret:
         do_whatever_you_want()"""
+    __slots__ = ("__rings",)
     __args = ("game_id", "rings", "ring_str", "region")
-    __rings = 0
-    __ring_str = ""
+    __required_length__ = 15
+    _LAYOUT = RING_SECRET_LAYOUT
+    _SECRET_KIND = 1
+    _KIND_NAME = "ring"
+    _KIND_ERROR = NotARingCodeError
+    _REPR_FIELDS = ("game_id", "region", "rings")
 
     def __set_rings(self, value: int):
+        # Converting the parameter into an integer in case we've been given a RingType or RingSet instance
+        value = int(value)
         if value > int(AllRings):
             raise ValueError("cannot set a value higher than AllRings")
         if value < 0:
             raise ValueError("value must be an unsigned integer")
-        # Converting the parameter into an integer in case we've been given a RingType instance
-        self.__rings = int(value)
-        self.__ring_str = bin(int(value))[2:].rjust(64, "0")
+        self.__rings = value
 
     rings = property(lambda self: self.__rings, __set_rings,
                      doc="""Get the rings stored in the secret as an integer.
                      
                      :type: int, AllRings or NoRings""")
 
+    def __set_ring_set(self, value: RingSet):
+        self.rings = int(RingSet(value))
+
+    ring_set = property(lambda self: RingSet._from_mask(self.__rings), __set_ring_set,
+                        doc="""The rings stored in the secret as a :class:`pyzora.ring_types.RingSet`.
+                        Both conversions take constant time. Setting this also accepts an iterable of ring types.
+                        
+                        :type: RingSet""")
+
+    def __set_ring_str(self, value: str):
+        self.rings = int(value, 2)
+
+    ring_str = property(lambda self: format(self.__rings, "064b"), __set_ring_str,
+                        doc="""The rings stored in the secret as a string of 64 binary digits,
+                        the last one standing for the first ring.
+                        
+                        :type: str""")
+
     @property
     def ring_count(self):
         """Count how many rings the player has."""
-        return self.__ring_str.count("1")
+        return self.__rings.bit_count()
 
     def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.__rings = 0
         for pos, arg in enumerate(self.__args):
             kwargs.setdefault(arg, None)
             if kwargs.get(arg) is None:
@@ -73,6 +123,9 @@ class RingSecret(BaseSecret):
                     pass
 
     def __contains__(self, item):
+        if type(item) is RingType:
+            mask = item.integer
+            return self.__rings & mask == mask
         if item is NoRings:
             return not self.rings
         if item is AllRings:
@@ -92,79 +145,28 @@ class RingSecret(BaseSecret):
         :raise ChecksumError: if the given data's checksum doesn't match the expected one.
         :return: A secret based on the data contained in secret.
         :rtype: RingSecret"""
-        if isinstance(secret, str):
-            # Secret string. Parse it before doing anything else.
-            # Allows the user to give the region only once
-            return cls.load(parse_secret(secret, region), region)
-        if len(secret) != 15:
-            raise SecretError("secret is expected to have exactly 15 bytes")
-        decoded_bytes = cls.decode_bytes(secret, region)
-        decoded_secret = byte_array_to_string(decoded_bytes)
-        cloned_bytes = decoded_bytes.copy()
-        cloned_bytes[14] = 0
-        checksum = calculate_checksum(cloned_bytes)
-        if (decoded_bytes[14] & 0xF) != (checksum & 0xF):
-            raise ChecksumError(f"checksum {checksum} does not match expected value : {decoded_bytes[14]}")
-        if decoded_secret[3] != "0" or decoded_secret[4] != "1":
-            raise NotARingCodeError("given secret is not a ring code")
-        game_id = int(reverse_substring(decoded_secret, 5, 15))
-        ring_str = "".join((reverse_substring(decoded_secret, 36, 8),
-                            reverse_substring(decoded_secret, 76, 8),
-                            reverse_substring(decoded_secret, 28, 8),
-                            reverse_substring(decoded_secret, 60, 8),
-                            reverse_substring(decoded_secret, 44, 8),
-                            reverse_substring(decoded_secret, 68, 8),
-                            reverse_substring(decoded_secret, 20, 8),
-                            reverse_substring(decoded_secret, 52, 8)))
-        rings = int(ring_str, base=2)
-        return RingSecret(game_id=game_id, rings=rings, ring_str=ring_str,
-                          region=region)
+        if cls._CACHE is not None:
+            return cls._CACHE.load(cls, secret, region)
+        return cls._load(secret, region)
+
+    @classmethod
+    def _from_fields(cls, fields, region: GameRegion) -> "RingSecret":
+        return RingSecret(game_id=fields.game_id, rings=fields.rings, region=region)
+
+    @classmethod
+    def _raw_from_fields(cls, fields, region: GameRegion) -> RawRingSecret:
+        return RawRingSecret(fields.game_id, region, fields.rings)
 
     def __bytes__(self):
-        ring_row1 = self.rings
-        ring_row2 = ring_row1 >> 8
-        ring_row3 = ring_row1 >> 16
-        ring_row4 = ring_row1 >> 24
-        ring_row5 = ring_row1 >> 32
-        ring_row6 = ring_row1 >> 40
-        ring_row7 = ring_row1 >> 48
-        ring_row8 = ring_row1 >> 56
-        cipher_key = ((self.game_id >> 8) + (self.game_id & 255)) & 7
-        unencoded_secret = (
-                reverse_string(integer_string(cipher_key).rjust(3, "0")) + "01"
-        )
-        secret_strings = map(reverse_string, (
-            integer_string(self.game_id).rjust(15, "0"),
-            integer_string(ring_row2).rjust(8, "0"),
-            integer_string(ring_row6).rjust(8, "0"),
-            integer_string(ring_row8).rjust(8, "0"),
-            integer_string(ring_row4).rjust(8, "0"),
-            integer_string(ring_row1).rjust(8, "0"),
-            integer_string(ring_row5).rjust(8, "0"),
-            integer_string(ring_row3).rjust(8, "0"),
-            integer_string(ring_row7).rjust(8, "0"),
-        ))
-        unencoded_secret += "".join(secret_strings)
-        unencoded_bytes = string_to_byte_array(unencoded_secret)
-        del (
-            ring_row1,
-            ring_row2,
-            ring_row3,
-            ring_row4,
-            ring_row5,
-            ring_row6,
-            ring_row7,
-            ring_row8,
-            secret_strings,
-            unencoded_secret,
+        return self._pack(
+            cipher_key=((self.game_id >> 8) + (self.game_id & 255)) & 7,
+            game_id=self.game_id,
+            rings=self.rings,
         )
-        unencoded_bytes[14] = calculate_checksum(unencoded_bytes)
-        secret = self._encode_bytes(unencoded_bytes, self.region)
-        return bytes(secret)
 
     def to_list(self):
         """Return self as a list of ring types."""
-        return list(filter(lambda tp: tp in self, RING_TYPES))
+        return list(RingSet._from_mask(self.__rings))
 
     def __hash__(self):
-        return hash((self.__game_id, self.__rings))
+        return hash((self.game_id, self.__rings))
@@ -21,7 +21,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
-from more_itertools import first
 
 
 class __NoRingsType:
@@ -57,25 +56,50 @@ NoRings = __NoRingsType()
 class RingType:
     """Represents one of the rings scattered in Labrynna and Holodrum.
 
+    RingType instances are immutable and hashable, so they can be used in sets or as dictionary keys.
+    A ring type is equal to (and hashes like) its integer value.
+
     RingType instances DO NOT store the modifiers used by the rings when
     equipped nor their randomisation tiers. You can check this info """
+    __slots__ = ("__integer", "__name", "__description")
+
     def __init__(self, integer, name, description):
-        self.integer, self.name, self.description = integer, name, description
+        self.__integer, self.__name, self.__description = integer, name, description
+
+    integer = property(lambda self: self.__integer,
+                       doc="""The ring's bit in ring secrets.
+
+                       :type: int""")
+
+    name = property(lambda self: self.__name,
+                    doc="""The ring's name, as shown in the games.
+
+                    :type: str""")
+
+    description = property(lambda self: self.__description,
+                           doc="""The ring's description, as shown in the games.
+
+                           :type: str""")
+
+    position = property(lambda self: self.__integer.bit_length() - 1,
+                        doc="""The position of the ring's bit, which is also its index in RING_TYPES.
+
+                        :type: int""")
 
     def __repr__(self):
-        return self.name
+        return self.__name
 
     def __int__(self):
-        return self.integer
+        return self.__integer
 
     def __and__(self, other):
-        return int(self) & other
+        return self.__integer & other
 
     def __rand__(self, other):
         return self.__and__(other)
 
     def __or__(self, other):
-        return int(self) | other
+        return self.__integer | other
 
     def __ror__(self, other):
         return self.__or__(other)
@@ -83,7 +107,13 @@ class RingType:
     def __eq__(self, other):
         if type(self) is type(other):
             return self is other
-        return int(self) == int(other)
+        try:
+            return self.__integer == int(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __hash__(self):
+        return hash(self.__integer)
 
     @classmethod
     def from_integer(cls, integer: int):
@@ -93,7 +123,35 @@ class RingType:
             raise ValueError("given value exceeds AllRings' value")
         elif integer < 0:
             raise ValueError("given value is negative")
-        return first(filter(lambda tp: integer == tp.integer, RING_TYPES), NoRings)
+        return _RINGS_BY_INTEGER.get(integer, NoRings)
+
+    @classmethod
+    def from_position(cls, position: int) -> "RingType":
+        """Return the ring type stored at a bit position.
+
+        :param position: The bit position, from 0 (Friendship Ring) to 63 (Protection Ring).
+        :type position: int
+        :raise ValueError: if the position isn't between 0 and 63.
+        :rtype: RingType"""
+        if not 0 <= position < 64:
+            raise ValueError(f"invalid ring position : {position}")
+        return RING_TYPES[position]
+
+    @classmethod
+    def from_name(cls, name: str) -> "RingType":
+        """Return the ring type with a given name.
+
+        Names are compared ignoring case, spaces and punctuation, and the word "ring" can be left out,
+        so "power ring l1", "Power L-1" and "POWER_1" all give POWER_1. "Armor" is accepted for "Armour".
+
+        :param name: The ring's name, or the name of its constant in this module.
+        :type name: str
+        :raise ValueError: if no ring has this name.
+        :rtype: RingType"""
+        try:
+            return _rings_by_name()[_normalise_name(name)]
+        except KeyError:
+            raise ValueError(f"unknown ring name : {name}") from None
 
 
 class __AllRingsType:
@@ -202,3 +260,219 @@ RING_TYPES = (FRIENDSHIP, POWER_1, POWER_2, POWER_3, ARMOUR_1,
               ENERGY, DOUBLE_EDGED, GBA_NATURE, SLAYER, RUPEE,
               VICTORY, SIGN, HUNDREDTH, WHISP, GASHA, PEACE, ZORA, FIST,
               WHIMSICAL, PROTECTION)
+
+
+# Characters ignored when comparing ring names
+# (string.punctuation and string.whitespace, written out to avoid importing string)
+_NAME_DELETIONS = str.maketrans("", "", "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~ \t\n\r\x0b\x0c’")
+
+
+def _normalise_name(name: str) -> str:
+    """Return a ring name in the form used as a key of the name index.
+
+    :meta private:"""
+    # The games use British spelling
+    return name.casefold().translate(_NAME_DELETIONS).replace("armor", "armour")
+
+
+_RINGS_BY_INTEGER = {ring.integer: ring for ring in RING_TYPES}
+# Normalised name -> ring type, built on first use by _rings_by_name
+_RINGS_BY_NAME = {}
+
+
+def _rings_by_name() -> dict:
+    """Return the index of ring types by normalised name, building it on first use.
+
+    :meta private:"""
+    if not _RINGS_BY_NAME:
+        for constant, ring in tuple(globals().items()):
+            if type(ring) is RingType:
+                for name in (ring.name, constant):
+                    name = _normalise_name(name)
+                    _RINGS_BY_NAME[name] = ring
+                    # Most names end with "ring", or contain it before the ring's level
+                    _RINGS_BY_NAME.setdefault(name.replace("ring", ""), ring)
+    return _RINGS_BY_NAME
+
+
+def parse_ring_names(names) -> "RingSet":
+    """Convert a list of ring names to a set of rings. See :meth:`RingType.from_name` for accepted names.
+
+    :param names: Ring names, as an iterable or as a single string separating names with commas,
+        semicolons or line breaks.
+    :type names: str or Iterable[str]
+    :raise ValueError: if one of the names doesn't match any ring.
+    :return: The named rings.
+    :rtype: RingSet"""
+    if isinstance(names, str):
+        names = names.replace(";", ",").replace("\n", ",").split(",")
+    mask = 0
+    get = _rings_by_name().get
+    for name in names:
+        key = _normalise_name(name)
+        if not key:
+            continue
+        ring = get(key)
+        if ring is None:
+            raise ValueError(f"unknown ring name : {name.strip()}")
+        mask |= ring.integer
+    return RingSet._from_mask(mask)
+
+
+def _ring_mask(value) -> int:
+    """Return the integer mask of a ring, ring set, ring constant or integer.
+
+    :meta private:"""
+    if type(value) is RingSet:
+        return value._RingSet__mask
+    if type(value) is RingType:
+        return value.integer
+    return int(value)
+
+
+class RingSet:
+    """An immutable set of ring types, stored as the same 64-bit integer as :attr:`pyzora.ring_secret.RingSecret.rings`.
+
+    Ring sets can be combined with other ring sets, ring types, NoRings, AllRings or integers
+    using ``|``, ``&``, ``-`` and ``^``, and compared with ``<=`` and ``>=`` for inclusion.
+    Iterating over a ring set only visits the rings it contains, in the order of RING_TYPES.
+
+    :param rings: The rings to store: an integer mask, a ring type, another ring set,
+        NoRings, AllRings, or an iterable of ring types.
+    :type rings: int, RingType, RingSet or Iterable[RingType]
+    :raise ValueError: if the resulting mask is negative or higher than AllRings."""
+    __slots__ = ("__mask",)
+
+    def __init__(self, rings=0):
+        if isinstance(rings, int):
+            mask = rings
+        elif type(rings) in (RingSet, RingType) or rings is NoRings or rings is AllRings:
+            mask = _ring_mask(rings)
+        else:
+            mask = 0
+            for ring in rings:
+                mask |= _ring_mask(ring)
+        if not 0 <= mask <= 18446744073709551615:
+            raise ValueError(f"invalid ring mask : {mask}")
+        self.__mask = mask
+
+    @classmethod
+    def _from_mask(cls, mask: int) -> "RingSet":
+        """Build a ring set from a mask known to be valid, without checking it.
+
+        :meta private:"""
+        ring_set = object.__new__(cls)
+        ring_set.__mask = mask
+        return ring_set
+
+    def __int__(self):
+        return self.__mask
+
+    __index__ = __int__
+
+    def __len__(self):
+        return self.__mask.bit_count()
+
+    def __bool__(self):
+        return bool(self.__mask)
+
+    def __iter__(self):
+        mask = self.__mask
+        while mask:
+            lowest = mask & -mask
+            yield RING_TYPES[lowest.bit_length() - 1]
+            mask ^= lowest
+
+    def __contains__(self, item):
+        if type(item) is RingType:
+            return bool(self.__mask & item.integer)
+        if item is NoRings:
+            return not self.__mask
+        mask = _ring_mask(item)
+        return self.__mask & mask == mask
+
+    def __or__(self, other):
+        try:
+            mask = self.__mask | _ring_mask(other)
+        except TypeError:
+            return NotImplemented
+        if not 0 <= mask <= 18446744073709551615:
+            raise ValueError(f"invalid ring mask : {mask}")
+        return RingSet._from_mask(mask)
+
+    __ror__ = __or__
+
+    def __and__(self, other):
+        try:
+            return RingSet._from_mask(self.__mask & _ring_mask(other))
+        except TypeError:
+            return NotImplemented
+
+    __rand__ = __and__
+
+    def __xor__(self, other):
+        try:
+            mask = self.__mask ^ _ring_mask(other)
+        except TypeError:
+            return NotImplemented
+        if not 0 <= mask <= 18446744073709551615:
+            raise ValueError(f"invalid ring mask : {mask}")
+        return RingSet._from_mask(mask)
+
+    __rxor__ = __xor__
+
+    def __sub__(self, other):
+        try:
+            return RingSet._from_mask(self.__mask & ~_ring_mask(other))
+        except TypeError:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        try:
+            return RingSet(_ring_mask(other) & ~self.__mask)
+        except TypeError:
+            return NotImplemented
+
+    def __eq__(self, other):
+        if type(other) is RingSet:
+            return self.__mask == other.__mask
+        if isinstance(other, int):
+            return self.__mask == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.__mask)
+
+    def __le__(self, other):
+        mask = _ring_mask(other)
+        return self.__mask & mask == self.__mask
+
+    def __ge__(self, other):
+        return _ring_mask(other) in self
+
+    def __repr__(self):
+        return f"RingSet({list(self)!r})"
+
+    def issubset(self, other) -> bool:
+        """Return whether all rings of this set are in another.
+
+        :param other: The rings to compare with.
+        :type other: RingSet, RingType or int
+        :rtype: bool"""
+        return self <= other
+
+    def issuperset(self, other) -> bool:
+        """Return whether this set contains all rings of another.
+
+        :param other: The rings to compare with.
+        :type other: RingSet, RingType or int
+        :rtype: bool"""
+        return self >= other
+
+    def isdisjoint(self, other) -> bool:
+        """Return whether this set has no rings in common with another.
+
+        :param other: The rings to compare with.
+        :type other: RingSet, RingType or int
+        :rtype: bool"""
+        return not self.__mask & _ring_mask(other)
@@ -20,15 +20,13 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
-import unicodedata
-import re
 import sys
+from enum import Enum
 from .enums import *
 from .exceptions import *
+from .bit_layout import *
 
-_udata_lookup = unicodedata.lookup
-
-U_HEART = U_GURMUKHI_THREE = _udata_lookup("GURMUKHI DIGIT THREE")
+U_HEART = U_GURMUKHI_THREE = chr(0x0A69)
 U_ASTERISK = chr(42)
 U_DOLLAR_SIGN = chr(36)
 U_DIAMOND = chr(9830)
@@ -40,56 +38,67 @@ U_PERCENT = chr(0x0025)
 U_SQUARE = chr(0x25A0)
 U_CIRCLE = chr(0x25CF)
 U_TRIANGLE = chr(0x25B2)
-U_UPWARDS_ARROW = _udata_lookup("UPWARDS ARROW")
-U_DOWNWARDS_ARROW = _udata_lookup("DOWNWARDS ARROW")
-U_RIGHTWARDS_ARROW = _udata_lookup("RIGHTWARDS ARROW")
-U_LEFTWARDS_ARROW = _udata_lookup("LEFTWARDS ARROW")
+U_UPWARDS_ARROW = chr(0x2191)
+U_DOWNWARDS_ARROW = chr(0x2193)
+U_RIGHTWARDS_ARROW = chr(0x2192)
+U_LEFTWARDS_ARROW = chr(0x2190)
 
-_SYMBOL_REGEXES = (
+_SYMBOL_ALIASES = (
     # Japan
     {
-        r"a": "あ", r"i": "い", r"u": "う", r"e": "え", r"o": "お",
-        r"ka": "か", r"ki": "き", r"ku": "く", r"ke": "け", r"ko": "こ",
-        r"sa": "さ", r"si": "し", r"su": "す", r"se": "せ", r"so": "そ",
-        r"ta": "た", r"ti": "ち", r"tu": "つ", r"te": "て", r"to": "と",
-        r"na": "な", r"ni": "に", r"ne": "ね", r"no": "の",
-        r"ha": "は", r"hi": "ひ", r"hu": "ふ", r"he": "へ", r"ho": "ほ",
-        r"ma": "ま", r"mi": "み", r"mu": "む", r"me": "め", r"mo": "も",
-        r"ya": "や", r"yu": "ゆ", r"yo": "よ",
-        r"ra": "ら", r"ri": "り", r"ru": "る", r"re": "れ",
-        r"za": "ざ",
-        r"wa": "わ", r"wo": "を",
-        r"ga": "が", r"go": "ご",
-        r"zo": "ぞ",
-        r"da": "だ", r"do": "ど",
-        r"pi": "ぴ", r"pu": "ぷ", r"pe": "ぺ",
-        r"bo": "ぼ",
-        r"n": "ん",
-        r"shi": "し",
-        r"chi": "ち",
-        r"tsu": "つ",
-        r"fu": "ふ",
-        r"\s+": ""
+        "a": "あ", "i": "い", "u": "う", "e": "え", "o": "お",
+        "ka": "か", "ki": "き", "ku": "く", "ke": "け", "ko": "こ",
+        "sa": "さ", "si": "し", "su": "す", "se": "せ", "so": "そ",
+        "ta": "た", "ti": "ち", "tu": "つ", "te": "て", "to": "と",
+        "na": "な", "ni": "に", "ne": "ね", "no": "の",
+        "ha": "は", "hi": "ひ", "hu": "ふ", "he": "へ", "ho": "ほ",
+        "ma": "ま", "mi": "み", "mu": "む", "me": "め", "mo": "も",
+        "ya": "や", "yu": "ゆ", "yo": "よ",
+        "ra": "ら", "ri": "り", "ru": "る", "re": "れ",
+        "za": "ざ",
+        "wa": "わ", "wo": "を",
+        "ga": "が", "go": "ご",
+        "zo": "ぞ",
+        "da": "だ", "do": "ど",
+        "pi": "ぴ", "pu": "ぷ", "pe": "ぺ",
+        "bo": "ぼ",
+        "n": "ん",
+        "shi": "し",
+        "chi": "ち",
+        "tsu": "つ",
+        "fu": "ふ",
     },
     # US/PAL
     {
-        r"\{?spade\}?": U_SPADE,
-        r"\{?heart\}?": U_HEART,
-        r"\{?diamond\}?": U_DIAMOND,
-        r"\{?club\}?": U_CLUB,
-        r"\{?circle\}?": U_CIRCLE,
-        r"\{?square\}?": U_SQUARE,
-        r"\{?triangle\}?": U_TRIANGLE,
-        r"\{?up\}?": U_UPWARDS_ARROW,
-        r"\{?down\}?": U_DOWNWARDS_ARROW,
-        r"\{?left\}?": U_LEFTWARDS_ARROW,
-        r"\{?right\}?": U_RIGHTWARDS_ARROW,
-        r"<": "(",
-        r">": ")",
-        r" ": "",
+        "spade": U_SPADE,
+        "heart": "♥",
+        "diamond": U_DIAMOND,
+        "club": U_CLUB,
+        "circle": U_CIRCLE,
+        "square": U_SQUARE,
+        "triangle": U_TRIANGLE,
+        "up": U_UPWARDS_ARROW,
+        "down": U_DOWNWARDS_ARROW,
+        "left": U_LEFTWARDS_ARROW,
+        "right": U_RIGHTWARDS_ARROW,
+    }
+)
+
+# Aliases which don't need braces around them, and aren't affected by case.
+_SYMBOL_SUBSTITUTES = (
+    # Japan
+    {},
+    # US/PAL
+    {
+        U_HEART: "♥",
+        "<": "(",
+        ">": ")",
     }
 )
 
+# Characters ignored when parsing a secret string.
+_SKIPPED_CHAR_CHECKS = (str.isspace, " ".__eq__)
+
 _VALID_CHARS_SELECT = (
     ('え', 'か', 'く', '0', 'け', 'つ', '1', 'し',
      'に', 'ね', 'そ', 'ぺ', '2', 'た', 'せ', 'い',
@@ -110,6 +119,132 @@ _VALID_CHARS_SELECT = (
 )
 
 
+class _SymbolTokenizer:
+    """Turns secret strings into symbol values for a given region in a single pass.
+
+    Aliases (romaji, symbol names) are matched case-insensitively, longest match first,
+    using a trie built once. Any other character is looked up directly in the region's
+    symbol table.
+
+    :meta private:"""
+    __slots__ = ("__alias_trie", "__symbols", "__is_skipped")
+
+    def __init__(self, region: GameRegion):
+        symbols = {char: value for value, char in enumerate(_VALID_CHARS_SELECT[region])}
+        for substitute, char in _SYMBOL_SUBSTITUTES[region].items():
+            symbols[substitute] = symbols[char]
+        aliases = {}
+        for alias, char in _SYMBOL_ALIASES[region].items():
+            aliases[alias] = symbols[char]
+            # Symbol names and romaji can be surrounded with braces, like {heart} or {ka}.
+            for braced in ("{" + alias, alias + "}", "{" + alias + "}"):
+                aliases[braced] = symbols[char]
+        trie = {}
+        for alias, value in aliases.items():
+            node = trie
+            for alias_char in alias:
+                child = node.get(alias_char)
+                if child is None:
+                    child = {}
+                    node[alias_char.lower()] = node[alias_char.upper()] = child
+                node = child
+            node[None] = value
+        self.__alias_trie = trie
+        self.__symbols = symbols
+        self.__is_skipped = _SKIPPED_CHAR_CHECKS[region]
+
+    alias_trie = property(lambda self: self.__alias_trie,
+                          doc="""The aliases as a trie: each node maps characters to child nodes,
+                          and None to the symbol value of the alias ending there.
+
+                          :type: dict""")
+
+    def read_char(self, char: str) -> int | None:
+        """Return the symbol value of a single character, ignoring aliases.
+
+        :param char: The character to read.
+        :type char: str
+        :return: The symbol value, None if the character is skipped, or -1 if it's invalid.
+        :rtype: int or None"""
+        value = self.__symbols.get(char)
+        if value is None and not self.__is_skipped(char):
+            return -1
+        return value
+
+    def scan(self, secret_string: str) -> tuple[bytearray, int]:
+        """Convert a secret string into a byte array of symbol values, stopping at the first invalid symbol.
+
+        :param secret_string: The secret string to convert.
+        :type secret_string: str
+        :return: The converted array, and the position of the first invalid character in the string
+            (-1 if the whole string is valid).
+        :rtype: tuple[bytearray, int]"""
+        trie = self.__alias_trie
+        symbols = self.__symbols
+        is_skipped = self.__is_skipped
+        data = bytearray()
+        append = data.append
+        length = len(secret_string)
+        pos = 0
+        while pos < length:
+            char = secret_string[pos]
+            node = trie.get(char)
+            if node is not None:
+                # Walk the trie as far as possible, remembering the longest alias found.
+                match = None
+                end = pos
+                while node is not None:
+                    end += 1
+                    if None in node:
+                        match = node[None]
+                        match_end = end
+                    if end == length:
+                        break
+                    node = node.get(secret_string[end])
+                if match is not None:
+                    append(match)
+                    pos = match_end
+                    continue
+            value = symbols.get(char)
+            if value is not None:
+                append(value)
+            elif not is_skipped(char):
+                return data, pos
+            pos += 1
+        return data, -1
+
+    def tokenize(self, secret_string: str) -> bytearray:
+        """Convert a secret string into a byte array of symbol values.
+
+        :param secret_string: The secret string to convert.
+        :type secret_string: str
+        :raise SecretError: if the secret string contains invalid symbols.
+        :return: The converted array.
+        :rtype: bytearray"""
+        data, invalid_pos = self.scan(secret_string)
+        if invalid_pos >= 0:
+            # There's a chance the user has used the wrong region
+            raise SecretError(f"Secret contains invalid value : {secret_string[invalid_pos]}. "
+                              "Perhaps you used the wrong region?")
+        return data
+
+
+class _TokenizerTable(dict):
+    """Maps regions to their tokenizer, building each one on first use.
+
+    :meta private:"""
+    __slots__ = ()
+
+    def __missing__(self, region):
+        tokenizer = self[region] = _SymbolTokenizer(GameRegion(region))
+        return tokenizer
+
+
+_TOKENIZERS = _TokenizerTable()
+# (source region, target region, cipher key, length) -> XOR mask as an integer, see transcode
+_TRANSCODE_WINDOWS = {}
+
+
 def parse_secret(secret_string: str, region: GameRegion) -> bytearray:
     """Convert a secret string into a byte array.
 
@@ -121,25 +256,125 @@ def parse_secret(secret_string: str, region: GameRegion) -> bytearray:
     :return: The converted array.
     :rtype: bytearray
     """
-    for key, value in _SYMBOL_REGEXES[region].items():
-        secret_string = re.sub(key, value, secret_string, 0, re.IGNORECASE)
-    secret_length = len(secret_string)  # storing that to avoid iterating over the string twice
-    data = bytearray(secret_length)
-    for pos, value in enumerate(secret_string):
-        try:
-            symbol = _VALID_CHARS_SELECT[region.value].index(value)
-            if symbol < 0 or symbol > 63:
-                raise SecretError(f"Secret contains invalid value : {value}")
-        except ValueError as exc:
-            # There's a chance the user has used the wrong region
-            raise SecretError(f"Secret contains invalid value : {value}. Perhaps you used the wrong region?") from exc
-        data[pos] = symbol
-    return data
+    return _TOKENIZERS[region].tokenize(secret_string)
+
+
+# Character inserted between groups of symbols before rendering symbols which take several characters.
+# It's past latin-1, so it can't come from the data.
+_GROUP_MARKER = 0x100
+# Rendered for values which aren't valid symbols, to detect them after rendering
+_INVALID_SYMBOL = "\uFFFF"
+# (region, style, separator) -> str.translate table from latin-1 characters to rendered symbols
+_RENDER_TABLES = {}
+
+
+def _symbol_strings(region: GameRegion, style: SymbolStyle) -> tuple[str, ...]:
+    """Return how each symbol value is written in a given style.
+
+    :meta private:"""
+    symbols = _VALID_CHARS_SELECT[region]
+    if style == SymbolStyle.SYMBOLS:
+        return symbols
+    # When a symbol has several aliases, the last one is preferred (shi rather than si)
+    names = {char: alias for alias, char in _SYMBOL_ALIASES[region].items()}
+    return tuple(char if char.isascii() else "{" + names[char] + "}" for char in symbols)
+
+
+def _render_table(region: GameRegion, style: SymbolStyle, separator: str) -> list:
+    """Return the str.translate table used to render secrets, building it on first use.
+
+    :meta private:"""
+    key = (region, style, separator)
+    table = _RENDER_TABLES.get(key)
+    if table is None:
+        table = list(_symbol_strings(GameRegion(region), SymbolStyle(style)))
+        table += [_INVALID_SYMBOL] * (256 - len(table))
+        table.append(separator)  # _GROUP_MARKER
+        _RENDER_TABLES[key] = table
+    return table
+
+
+def _render(data, table: list, group_size: int, separator: str, single_chars: bool) -> str:
+    """Render parsed symbols in a single str.translate pass, by translating bytes as latin-1 characters.
+
+    :meta private:"""
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    length = len(data)
+    group = 0 < group_size < length
+    secret_string = data.decode("latin-1")
+    if group and not single_chars:
+        # Groups can't be cut after rendering, so mark them beforehand
+        secret_string = chr(_GROUP_MARKER).join([secret_string[pos:pos + group_size]
+                                                 for pos in range(0, length, group_size)])
+    secret_string = secret_string.translate(table)
+    if _INVALID_SYMBOL in secret_string:
+        raise SecretError("given data contains invalid values")
+    if group and single_chars:
+        secret_string = separator.join([secret_string[pos:pos + group_size]
+                                        for pos in range(0, length, group_size)])
+    return secret_string
+
+
+def render_secret(data: bytes | bytearray, region: GameRegion, group_size: int = 5, separator: str = " ",
+                  style: SymbolStyle = SymbolStyle.SYMBOLS) -> str:
+    """Produce a secret string from parsed symbols, with formatting options.
+
+    :param data: The parsed symbols (as returned by :func:`parse_secret`, or bytes(secret)).
+    :type data: bytes or bytearray
+    :param region: The game region to use.
+    :type region: GameRegion
+    :param group_size: The number of symbols in each group. Set it to 0 to write symbols without grouping them.
+    :type group_size: int
+    :param separator: The string written between groups.
+    :type separator: str
+    :param style: How symbols are written. :attr:`SymbolStyle.ASCII` gives strings which only contain ASCII characters,
+        and can still be parsed.
+    :type style: SymbolStyle
+    :raise SecretError: if the data contains invalid values.
+    :return: The secret string.
+    :rtype: str"""
+    return _render(data, _render_table(region, style, separator), group_size, separator, style == SymbolStyle.SYMBOLS)
+
+
+def render_many(secrets, region: GameRegion | None = None, group_size: int = 5, separator: str = " ",
+                style: SymbolStyle = SymbolStyle.SYMBOLS) -> list[str]:
+    """Render many secrets at once. See :func:`render_secret` for the formatting options.
+
+    :param secrets: Secret objects, or parsed symbols (byte arrays, or rows of an N×L NumPy array).
+    :type secrets: Iterable[BaseSecret | bytes | bytearray]
+    :param region: The region used for parsed symbols. Secret objects are rendered using their own region.
+    :type region: GameRegion or None
+    :raise SecretError: if parsed symbols contain invalid values, or if they are given without a region.
+    :return: One secret string per secret, in the same order.
+    :rtype: list[str]"""
+    tables = {}
+    if region is not None:
+        tables[region] = _render_table(region, style, separator)
+    single_chars = style == SymbolStyle.SYMBOLS
+    results = []
+    append = results.append
+    for secret in secrets:
+        if isinstance(secret, BaseSecret):
+            secret_region = secret.region
+            secret = bytes(secret)
+        elif region is None:
+            raise SecretError("a region is needed to render parsed symbols")
+        else:
+            secret_region = region
+        table = tables.get(secret_region)
+        if table is None:
+            table = tables[secret_region] = _render_table(secret_region, style, separator)
+        append(_render(secret, table, group_size, separator, single_chars))
+    return results
 
 
 def create_string(data: bytearray, region: GameRegion) -> str:
     """Produces a secret string from a byte array with a given region.
 
+    Symbols are written in groups of 5, each full group being followed by a space.
+    See :func:`render_secret` for more formatting options.
+
     :param data: The array to convert.
     :type data: bytearray
     :param region: The game region to use during conversion.
@@ -147,14 +382,108 @@ def create_string(data: bytearray, region: GameRegion) -> str:
     :raise SecretError: if the byte array contains invalid values.
     :return: The data converted to a string using the given encoding.
     :rtype: str"""
-    secret_chars = []
-    for pos, value in enumerate(data):
-        if value > 63:
-            raise SecretError("given data contains invalid values")
-        secret_chars.append(_VALID_CHARS_SELECT[region][value])
-        if pos % 5 == 4:
-            secret_chars.append(" ")
-    return "".join(secret_chars)
+    secret_string = _render(data, _render_table(region, SymbolStyle.SYMBOLS, " "), 5, " ", True)
+    if data and not len(data) % 5:
+        secret_string += " "
+    return secret_string
+
+
+def _transcode_window(from_region: GameRegion, to_region: GameRegion, cipher_key: int, length: int) -> int:
+    """Return the integer to XOR a secret with to move it from a region to another, caching it for later calls.
+
+    Decoding XORs symbols with a window of the source cipher and encoding XORs them with the same window
+    of the target cipher, the cipher key (the high bits of the first symbol) being kept. Both steps
+    are a single XOR with the two windows combined, which leaves the cipher key alone.
+
+    :meta private:"""
+    window = _TRANSCODE_WINDOWS.get((from_region, to_region, cipher_key, length))
+    if window is None:
+        cipher_pos = cipher_key * 4
+        source = BaseSecret._CIPHERS[from_region][cipher_pos:cipher_pos + length]
+        target = BaseSecret._CIPHERS[to_region][cipher_pos:cipher_pos + length]
+        if len(source) < length:
+            raise SecretError("secret contains invalid values")
+        combined = bytearray(first ^ second for first, second in zip(source, target))
+        combined[0] &= 7
+        window = _TRANSCODE_WINDOWS[from_region, to_region, cipher_key, length] = int.from_bytes(combined, "big")
+    return window
+
+
+def _transcode(data: bytes | bytearray, from_region: GameRegion, to_region: GameRegion) -> bytes:
+    """:meta private:"""
+    length = len(data)
+    if not length:
+        return b""
+    if max(data) > 63:
+        raise SecretError("secret contains invalid values")
+    window = _transcode_window(from_region, to_region, data[0] >> 3, length)
+    return (int.from_bytes(data, "big") ^ window).to_bytes(length, "big")
+
+
+def transcode(secret: str | bytes | bytearray, from_region: GameRegion, to_region: GameRegion, group_size: int = 5,
+              separator: str = " ", style: SymbolStyle = SymbolStyle.SYMBOLS) -> str | bytes:
+    """Convert a secret from a region to another, without loading it.
+
+    The payload is the same in every region, only the cipher and the symbols change, so this is a single XOR
+    of the symbols with a precomputed mask. The secret isn't checked: a valid secret gives a valid secret,
+    and an invalid one gives a secret failing the same checks.
+
+    :param secret: The secret string, or its parsed symbols.
+    :type secret: str or bytes or bytearray
+    :param from_region: The region the secret is written for.
+    :type from_region: GameRegion
+    :param to_region: The region to convert the secret to.
+    :type to_region: GameRegion
+    :param group_size: The number of symbols in each group of the converted string (see :func:`render_secret`).
+    :type group_size: int
+    :param separator: The string written between groups.
+    :type separator: str
+    :param style: How symbols are written.
+    :type style: SymbolStyle
+    :raise SecretError: if the secret contains invalid symbols, or is too long for the cipher.
+    :return: The converted secret string if a string was given, else the converted symbols.
+    :rtype: str or bytes"""
+    if isinstance(secret, str):
+        data = _transcode(parse_secret(secret, from_region), from_region, to_region)
+        return render_secret(data, to_region, group_size, separator, style)
+    return _transcode(secret, from_region, to_region)
+
+
+def transcode_many(secrets, from_region: GameRegion, to_region: GameRegion, group_size: int = 5,
+                   separator: str = " ", style: SymbolStyle = SymbolStyle.SYMBOLS):
+    """Convert many secrets from a region to another at once. See :func:`transcode`.
+
+    :param secrets: Secret strings or parsed symbols, or an N×L uint8 array of parsed secrets
+        (converted with vectorised operations, which requires NumPy).
+    :type secrets: numpy.ndarray or Iterable[str | bytes | bytearray]
+    :param from_region: The region the secrets are written for.
+    :type from_region: GameRegion
+    :param to_region: The region to convert the secrets to.
+    :type to_region: GameRegion
+    :param group_size: The number of symbols in each group of the converted strings.
+    :type group_size: int
+    :param separator: The string written between groups.
+    :type separator: str
+    :param style: How symbols are written.
+    :type style: SymbolStyle
+    :raise SecretError: if a secret contains invalid symbols, or is too long for the cipher.
+    :return: An array of the same shape for an array, else one converted secret string or byte string per secret.
+    :rtype: numpy.ndarray or list[str | bytes]"""
+    if type(secrets).__module__ == "numpy":
+        from pyzora.batch import transcode_batch_numpy
+        return transcode_batch_numpy(secrets, from_region, to_region)
+    tokenizer = _TOKENIZERS[from_region]
+    table = _render_table(to_region, style, separator)
+    single_chars = style == SymbolStyle.SYMBOLS
+    results = []
+    append = results.append
+    for secret in secrets:
+        if isinstance(secret, str):
+            data = _transcode(tokenizer.tokenize(secret), from_region, to_region)
+            append(_render(data, table, group_size, separator, single_chars))
+        else:
+            append(_transcode(secret, from_region, to_region))
+    return results
 
 
 def calculate_checksum(secret: bytearray) -> int:
@@ -168,6 +497,24 @@ def calculate_checksum(secret: bytearray) -> int:
     return sum(secret) & 0xF
 
 
+def _decoded_checksum(decoded: bytes | bytearray) -> int:
+    """Calculate the checksum of a decoded secret, which covers every byte but the last one.
+    Unlike calculate_checksum(decoded[:-1]), this doesn't copy the secret.
+
+    :meta private:"""
+    return (sum(decoded) - decoded[-1]) & 0xF
+
+
+def secret_kind(decoded: bytes | bytearray) -> int:
+    """Return the type bits of a decoded secret (0 for game secrets, 1 for ring secrets and 3 for memory secrets).
+
+    :param decoded: The decoded secret.
+    :type decoded: bytes or bytearray
+    :return: The secret's type bits.
+    :rtype: int"""
+    return (decoded[0] >> 1) & 3
+
+
 def transform_byte_to_bitstring(byte: int) -> str:
     """Return a bitstring from a byte integer.
 
@@ -262,6 +609,15 @@ def reverse_string(string: str) -> str:
     return "".join(reversed(string))
 
 
+def _repr_value(value) -> str:
+    """Return how a field value is shown in secret representations.
+
+    :meta private:"""
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    return repr(value)
+
+
 class BaseSecret:
     """Base secret class for all secret objects.
 
@@ -270,6 +626,7 @@ class BaseSecret:
 
     This class defines a basic `__hash__` method, but said hash will be different depending on
     the secret class."""
+    __slots__ = ("__game_id", "__region")
     _CIPHERS = (
         # Japan
         bytes((0x31, 0x09, 0x29, 0x3b, 0x18, 0x3c, 0x17, 0x33,
@@ -288,9 +645,18 @@ class BaseSecret:
              25, 42, 6, 57, 60, 23, 51, 24)
         )
     )
-    __game_id = 0  # Can be any possible value between 0 and 32766.
-    __region = GameRegion.US_PAL
     __required_length__ = 0
+    _LAYOUT: BitLayout = None  # Where each field is stored in decoded secrets
+    _SECRET_KIND = 0  # Value of the secret_kind field for this secret class
+    _KIND_NAME = "secret"
+    _KIND_ERROR = SecretError
+    _CACHE = None  # Cache used by load, see use_cache
+    _REPR_FIELDS = ("game_id", "region")  # Fields shown by __repr__
+    _CIPHER_WINDOWS = {}  # (region, cipher key, length) -> cipher bytes as an integer, see decode_into
+
+    def __init__(self):
+        self.__game_id = 0  # Can be any possible value between 0 and 32766.
+        self.__region = GameRegion.US_PAL
 
     def __set_game_id(self, value: int):
         if value > 32766 or value < 0:
@@ -320,6 +686,11 @@ class BaseSecret:
         """Convert self to a byte array."""
         return bytes(20)
 
+    def __buffer__(self, flags: int) -> memoryview:
+        """Expose the encoded secret through the buffer protocol (Python 3.12 and later),
+        so that memoryview(secret) works like memoryview(bytes(secret))."""
+        return memoryview(bytes(self))
+
     def __hash__(self):
         return hash((self.__game_id, self.__region))
 
@@ -350,27 +721,264 @@ class BaseSecret:
         secret[0] = (secret[0] & 7) | (cipher_key << 3)
         return secret
 
-    __repr__ = __str__
+    def render(self, group_size: int = 5, separator: str = " ", style: SymbolStyle = SymbolStyle.SYMBOLS) -> str:
+        """Return a password string from self, with formatting options. See :func:`render_secret` for details.
+
+        :param group_size: The number of symbols in each group (0 to write symbols without grouping them).
+        :type group_size: int
+        :param separator: The string written between groups.
+        :type separator: str
+        :param style: How symbols are written.
+        :type style: SymbolStyle
+        :return: The secret string.
+        :rtype: str"""
+        return render_secret(bytes(self), self.__region, group_size, separator, style)
+
+    def __repr__(self):
+        # Only show fields, since encoding the secret just to show it would be wasteful
+        fields = ", ".join(f"{name}={_repr_value(getattr(self, name))}" for name in self._REPR_FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    def _unpack(cls, secret: bytes | bytearray, region: GameRegion, convert: bool = True):
+        """Decode a parsed secret and read its fields using the class layout.
+
+        :meta private:"""
+        length = cls.__required_length__
+        if len(secret) != length:
+            raise SecretError(f"secret must contain exactly {length} bytes")
+        if max(secret) > 63:
+            raise SecretError("secret contains invalid values")
+        return cls._unpack_decoded(cls.decode_bytes(secret, region), convert)
+
+    @classmethod
+    def _decoded_status(cls, decoded_bytes: bytes | bytearray) -> SecretStatus:
+        """Check the checksum and type bits of a decoded secret.
+
+        :meta private:"""
+        if decoded_bytes[-1] & 0xF != _decoded_checksum(decoded_bytes):
+            return SecretStatus.CHECKSUM_MISMATCH
+        if secret_kind(decoded_bytes) != cls._SECRET_KIND:
+            return SecretStatus.WRONG_KIND
+        return SecretStatus.VALID
+
+    @classmethod
+    def validate(cls, secret: bytes | bytearray | str, region: GameRegion) -> SecretStatus:
+        """Check a secret without loading it, and tell why it's invalid.
+
+        Only the checks done before reading fields are made: symbols, length, checksum and type bits.
+        No fields are read and no object is built, so this is much cheaper than :meth:`load`.
+        A valid secret may still fail to load if one of its fields has an unknown value.
+
+        :param secret: The secret string or parsed byte array to check.
+        :type secret: str or bytes or bytearray
+        :param region: The region to use.
+        :type region: GameRegion
+        :return: SecretStatus.VALID, or the status of the first failing check.
+        :rtype: SecretStatus"""
+        if isinstance(secret, str):
+            secret, invalid_pos = _TOKENIZERS[region].scan(secret)
+            if invalid_pos >= 0:
+                return SecretStatus.INVALID_SYMBOL
+        length = cls.__required_length__
+        if len(secret) != length:
+            return SecretStatus.INVALID_LENGTH
+        if max(secret) > 63:
+            return SecretStatus.INVALID_SYMBOL
+        cipher_key = secret[0] >> 3
+        window = cls._CIPHER_WINDOWS.get((region, cipher_key, length))
+        if window is None:
+            try:
+                window = cls.__cipher_window(region, cipher_key, length)
+            except SecretError:
+                return SecretStatus.INVALID_SYMBOL
+        # Same steps as decode_into and _decoded_status, without writing the decoded secret anywhere
+        decoded = (int.from_bytes(secret, "big") ^ window).to_bytes(length, "big")
+        first = (decoded[0] & 7) | (cipher_key << 3)
+        last = decoded[-1]
+        if (sum(decoded) - decoded[0] + first - last) & 0xF != last & 0xF:
+            return SecretStatus.CHECKSUM_MISMATCH
+        if (first >> 1) & 3 != cls._SECRET_KIND:
+            return SecretStatus.WRONG_KIND
+        return SecretStatus.VALID
+
+    @classmethod
+    def is_valid(cls, secret: bytes | bytearray | str, region: GameRegion) -> bool:
+        """Return whether a secret passes the checks of :meth:`validate`.
+
+        :param secret: The secret string or parsed byte array to check.
+        :type secret: str or bytes or bytearray
+        :param region: The region to use.
+        :type region: GameRegion
+        :rtype: bool"""
+        return cls.validate(secret, region) == SecretStatus.VALID
+
+    @classmethod
+    def _unpack_decoded(cls, decoded_bytes: bytes | bytearray, convert: bool = True):
+        """Check a decoded secret, then read its fields using the class layout.
+
+        :meta private:"""
+        status = cls._decoded_status(decoded_bytes)
+        if status == SecretStatus.CHECKSUM_MISMATCH:
+            checksum = _decoded_checksum(decoded_bytes)
+            raise ChecksumError(f"checksum ({checksum}) does not match expected value ({decoded_bytes[-1] & 0xF})")
+        if status == SecretStatus.WRONG_KIND:
+            raise cls._KIND_ERROR(f"given secret is not a {cls._KIND_NAME} code")
+        return cls._LAYOUT.unpack(decoded_bytes, convert)
+
+    @classmethod
+    def _from_fields(cls, fields, region: GameRegion) -> "BaseSecret":
+        """Build a secret from the fields read with the class layout.
+
+        :meta private:"""
+        raise NotImplementedError
+
+    @classmethod
+    def _raw_from_fields(cls, fields, region: GameRegion) -> tuple:
+        """Build a raw record from the unconverted fields read with the class layout.
+
+        :meta private:"""
+        raise NotImplementedError
+
+    @classmethod
+    def decode_raw(cls, secret: bytes | bytearray | str, region: GameRegion) -> tuple:
+        """Read the fields of a secret without building a secret object.
+
+        The secret's checksum and type bits are checked like in load, but field values are returned as
+        plain integers, booleans and strings, without being converted to enums or validated.
+        Call to_object on the result to get a full secret.
+
+        :param secret: The secret string or parsed byte array to decode.
+        :type secret: str or bytes or bytearray
+        :param region: The region to use when decoding the secret.
+        :type region: GameRegion
+        :raise SecretError: if the secret doesn't have the right length or contains invalid values.
+        :raise ChecksumError: if the secret's checksum doesn't match the expected one.
+        :return: The secret's fields, as a named tuple specific to each secret class.
+        :rtype: tuple"""
+        if isinstance(secret, str):
+            secret = parse_secret(secret, region)
+        return cls._raw_from_fields(cls._unpack(secret, region, False), region)
+
+    @classmethod
+    def _load(cls, secret: bytes | bytearray | str, region: GameRegion) -> "BaseSecret":
+        """Load a secret without using the cache.
+
+        :meta private:"""
+        if isinstance(secret, str):
+            # Secret string. Parse it before doing anything else.
+            secret = parse_secret(secret, region)
+        return cls._load_parsed(secret, region)
+
+    @classmethod
+    def _load_parsed(cls, secret: bytes | bytearray, region: GameRegion) -> "BaseSecret":
+        """Load a parsed secret without using the cache.
+
+        :meta private:"""
+        return cls._from_fields(cls._unpack(secret, region), region)
+
+    @classmethod
+    def use_cache(cls, cache: "SecretCache | None"):
+        """Cache the secrets loaded with this class and its subclasses.
+
+        Calling this on BaseSecret enables the cache for all secret types, while calling it on
+        a subclass only enables it for that type.
+
+        :param cache: The cache to use (see :class:`pyzora.cache.SecretCache`), or None to stop using one.
+        :type cache: SecretCache or None"""
+        cls._CACHE = cache
+
+    def _pack(self, **values) -> bytes:
+        """Write fields using the class layout, then add the checksum and encode the result.
+
+        :meta private:"""
+        data = self._LAYOUT.pack(secret_kind=self._SECRET_KIND, **values)
+        data[-1] |= calculate_checksum(data)
+        return bytes(self._encode_bytes(data, self.region))
 
     @classmethod
     def decode_bytes(cls, secret: bytearray | str, region: GameRegion) -> bytearray:
         """Decode a parsed secret string or byte array using a certain region.
 
-        :param secret: The secret to decode, either as a string or a byte array.
+        :param secret: The secret to decode, either as a string or any object supporting the buffer
+            protocol (bytes, bytearray, memoryview, array...), which is read without being copied.
         :type secret: bytearray or str
         :param region: The region to use.
         :type region: GameRegion
+        :raise SecretError: if the secret is too long for the cipher.
         :return: The decoded byte array.
         :rtype: bytearray"""
         if isinstance(secret, str):  # depends on the context
-            bsecret = bytes(secret, "utf-8")
-        else:
-            bsecret = bytes(secret)
+            secret = bytes(secret, "utf-8")
+        decoded_bytes = bytearray(len(secret))
+        cls.decode_into(secret, decoded_bytes, region)
+        return decoded_bytes
+
+    @classmethod
+    def decode_into(cls, secret, out, region: GameRegion) -> int:
+        """Decode a parsed secret into a preallocated buffer.
+
+        Both buffers are accessed through the buffer protocol, so slices of memory-mapped files or
+        larger arrays can be decoded without copying them. The secret isn't checked: use
+        :meth:`decode_raw` or :meth:`load` for that.
+
+        :param secret: The parsed secret (bytes, bytearray, memoryview, array of bytes, mmap...).
+        :param out: The writable buffer to write the decoded secret to. It must be at least as long as the secret.
+        :param region: The region to use.
+        :type region: GameRegion
+        :raise SecretError: if the secret is too long for the cipher.
+        :raise ValueError: if out is too short.
+        :return: The number of bytes written.
+        :rtype: int"""
+        length = len(secret)
+        if not length:
+            return 0
+        cipher_key = secret[0] >> 3
+        window = cls._CIPHER_WINDOWS.get((region, cipher_key, length))
+        if window is None:
+            window = cls.__cipher_window(region, cipher_key, length)
+        # XOR all bytes at once as big integers, rather than one at a time
+        decoded = (int.from_bytes(secret, "big") ^ window).to_bytes(length, "big")
+        view = memoryview(out)
+        if len(view) < length:
+            raise ValueError(f"output buffer is too short ({len(view)} bytes for {length})")
+        view[:length] = decoded
+        view[0] = (decoded[0] & 7) | (cipher_key << 3)
+        return length
+
+    @classmethod
+    def __cipher_window(cls, region: GameRegion, cipher_key: int, length: int) -> int:
+        """Return the cipher bytes used for a secret as a big integer, caching it for later calls.
+
+        :meta private:"""
         cipher = cls._CIPHERS[region]
-        cipher_key = bsecret[0] >> 3
         cipher_pos = cipher_key * 4
-        decoded_bytes = bytearray(len(bsecret))
-        for key, value in enumerate(bsecret):
-            decoded_bytes[key] = value ^ cipher[cipher_pos + key]
-        decoded_bytes[0] &= 7 | (cipher_key << 3)
-        return decoded_bytes
+        if cipher_pos + length > len(cipher):
+            raise SecretError("secret contains invalid values")
+        window = cls._CIPHER_WINDOWS[region, cipher_key, length] = int.from_bytes(
+            cipher[cipher_pos:cipher_pos + length], "big")
+        return window
+
+    @classmethod
+    def decode_batch(cls, symbols, region: GameRegion):
+        """Decode many parsed secrets at once, without raising exceptions.
+
+        Each secret gets a status telling whether it's valid, or which check failed
+        (see :class:`~pyzora.enums.SecretStatus`). Field values are given as raw integers.
+
+        If NumPy is installed and symbols is an array, the whole batch is decoded with vectorised
+        operations. Otherwise, secrets are decoded one at a time in pure Python, with the same results.
+
+        :param symbols: The parsed secrets, either as an N×L uint8 array (L being the length of this secret type),
+            or as an iterable of byte arrays (as returned by :func:`parse_secret`).
+        :type symbols: numpy.ndarray or Iterable[bytes | bytearray]
+        :param region: The region to use.
+        :type region: GameRegion
+        :raise SecretError: if the array doesn't have the expected shape.
+        :return: A structured array with one column per field and a status column, or a list of named tuples
+            with the same fields.
+        :rtype: numpy.ndarray or list"""
+        from pyzora.batch import numpy, decode_batch_numpy, decode_batch_python
+        if numpy is not None and isinstance(symbols, numpy.ndarray):
+            return decode_batch_numpy(cls, symbols, region)
+        return decode_batch_python(cls, symbols, region)
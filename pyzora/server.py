@@ -0,0 +1,688 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+A small asyncio HTTP service decoding and encoding secrets, built on the standard library only.
+
+Concurrent requests are gathered into micro-batches, bounded both in size and in delay, and each batch
+is handled in a single call, either on the event loop or in an executor. Each HTTP request body holds
+one JSON object or secret string per line, and the response holds one JSON object per line, in the same order.
+
+Endpoints:
+
+- POST /decode: each line is a secret string, or an object with a secret field and optional kind and region fields
+  (auto-detected by default). Answers with the records written by :func:`pyzora.cli.secret_to_record`.
+- POST /encode: each line is an object as written by :func:`pyzora.cli.secret_to_record`. Answers with the secrets.
+- GET /health: the server's counters.
+
+Run python -m pyzora.server serve to start a server, and python -m pyzora.server loadgen to benchmark one.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, NamedTuple
+from pyzora.loading import *
+from pyzora.ring_secret import RingSecret
+from pyzora.game_secret import GameSecret
+from pyzora.cli import secret_to_record, record_to_secret
+from pyzora.records import parse_kind, parse_region, kind_name, error_string
+
+
+_OPERATIONS = ("decode", "encode")
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+            413: "Content Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class ServerOverloaded(Exception):
+    """Raised when a batcher already holds as many pending items as it accepts."""
+
+
+def _decode_item(item) -> dict:
+    """:meta private:"""
+    if isinstance(item, str):
+        item = {"secret": item}
+    source = item.get("secret")
+    record = {"secret": source}
+    try:
+        if not isinstance(source, str):
+            raise ValueError("expected a secret string")
+        kind = parse_kind(item.get("kind") or "auto")
+        region = parse_region(item.get("region") or "auto")
+        if kind is not None and region is None:
+            raise ValueError("a region must be given along with a kind")
+        secret = load_any(source, region) if kind is None else kind.load(source, region)
+    except (SecretError, ValueError) as exc:
+        record["error"] = error_string(exc)
+        return record
+    record.update(secret_to_record(secret))
+    record["error"] = None
+    return record
+
+
+def _encode_item(item) -> dict:
+    """:meta private:"""
+    record = {"secret": None}
+    try:
+        if not isinstance(item, dict):
+            raise ValueError("expected a JSON object")
+        secret = record_to_secret(item, None, None)
+        record["secret"] = str(secret).strip()
+        record["kind"] = kind_name(type(secret))
+        record["region"] = secret.region.name
+    except (SecretError, ValueError, KeyError, TypeError) as exc:
+        # TypeError comes from fields of the wrong JSON type
+        record["error"] = error_string(exc)
+        return record
+    record["error"] = None
+    return record
+
+
+def process_batch(items: list[tuple[str, object]]) -> list[str]:
+    """Handle a batch of decoding and encoding requests.
+
+    This function only takes and returns plain values, so that batches can be sent to worker processes.
+
+    :param items: Pairs of operations ("decode" or "encode") and items, each item being a secret string
+        or a dictionary read from a request line.
+    :type items: list[tuple[str, object]]
+    :return: One JSON response line per item (without line break), in the same order.
+    :rtype: list[str]"""
+    results = []
+    append = results.append
+    for operation, item in items:
+        record = _decode_item(item) if operation == "decode" else _encode_item(item)
+        append(json.dumps(record, ensure_ascii=False))
+    return results
+
+
+class MicroBatcher:
+    """Gathers items submitted by concurrent tasks into batches handled in a single call.
+
+    A batch is handled as soon as it holds max_batch_size items, or max_delay seconds after its first item
+    was submitted, whichever comes first. Must be used from a running event loop.
+
+    :param process: The function handling a batch. Takes a list of items and returns a list of results in the same order.
+    :type process: Callable[[list], list]
+    :param max_batch_size: The maximum number of items in a batch.
+    :type max_batch_size: int
+    :param max_delay: The longest time, in seconds, an item waits for a batch to fill up.
+    :type max_delay: float
+    :param max_pending: The maximum number of items waiting or being handled, after which submissions are refused.
+    :type max_pending: int
+    :param executor: The executor running batches, or None to run them on the event loop.
+    :type executor: concurrent.futures.Executor or None
+    :param concurrency: The maximum number of batches handled at the same time (only useful with an executor).
+    :type concurrency: int
+    :raise ValueError: if a bound isn't positive."""
+
+    def __init__(self, process: Callable[[list], list], max_batch_size: int = 64, max_delay: float = 0.002,
+                 max_pending: int = 4096, executor: Executor | None = None, concurrency: int = 1):
+        if max_batch_size < 1 or max_pending < 1 or concurrency < 1 or max_delay < 0:
+            raise ValueError("batch size, pending items and concurrency must be positive, and delay not negative")
+        self.__process = process
+        self.__max_batch_size = max_batch_size
+        self.__max_delay = max_delay
+        self.__max_pending = max_pending
+        self.__executor = executor
+        self.__slots = asyncio.Semaphore(concurrency)
+        self.__queue = deque()
+        self.__pending = 0
+        self.__wakeup = asyncio.Event()
+        self.__full = None
+        self.__task = None
+        # Tasks handling batches, referenced until they are done so that they aren't garbage collected
+        self.__handlers = set()
+        self.__batches = self.__batched_items = 0
+
+    pending = property(lambda self: self.__pending,
+                       doc="""The number of items waiting or being handled.
+
+                       :type: int""")
+
+    def stats(self) -> dict:
+        """Return the batcher's counters.
+
+        :return: The number of pending items, of batches handled and their mean size.
+        :rtype: dict"""
+        return {
+            "pending": self.__pending,
+            "batches": self.__batches,
+            "mean_batch_size": self.__batched_items / self.__batches if self.__batches else 0.0,
+        }
+
+    def start(self):
+        """Start handling batches in a background task."""
+        if self.__task is None:
+            self.__task = asyncio.get_running_loop().create_task(self.__run())
+
+    async def close(self):
+        """Stop handling batches. Items still waiting, and batches being handled, are cancelled."""
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+        while self.__queue:
+            self.__queue.popleft()[1].cancel()
+        handlers = list(self.__handlers)
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def submit(self, item) -> asyncio.Future:
+        """Add an item to the next batch.
+
+        :param item: The item to handle.
+        :raise ServerOverloaded: if max_pending items are already pending.
+        :return: A future set to the item's result once its batch is handled.
+        If it's cancelled before that (by a timeout, for example), the item is skipped.
+        :rtype: asyncio.Future"""
+        if self.__pending >= self.__max_pending:
+            raise ServerOverloaded(f"{self.__pending} items are already pending")
+        future = asyncio.get_running_loop().create_future()
+        self.__queue.append((item, future))
+        self.__pending += 1
+        future.add_done_callback(self.__item_done)
+        self.__wakeup.set()
+        if self.__full is not None and len(self.__queue) >= self.__max_batch_size and not self.__full.done():
+            self.__full.set_result(None)
+        return future
+
+    def __item_done(self, future: asyncio.Future):
+        self.__pending -= 1
+
+    async def __run(self):
+        loop = asyncio.get_running_loop()
+        queue = self.__queue
+        while True:
+            if not queue:
+                self.__wakeup.clear()
+                await self.__wakeup.wait()
+                continue
+            if len(queue) < self.__max_batch_size and self.__max_delay:
+                self.__full = loop.create_future()
+                timer = loop.call_later(self.__max_delay, _resolve, self.__full)
+                await self.__full
+                timer.cancel()
+                self.__full = None
+            batch = []
+            while queue and len(batch) < self.__max_batch_size:
+                item, future = queue.popleft()
+                # Items whose requests timed out are skipped
+                if not future.done():
+                    batch.append((item, future))
+            if batch:
+                await self.__slots.acquire()
+                task = loop.create_task(self.__handle(batch))
+                self.__handlers.add(task)
+                task.add_done_callback(self.__handlers.discard)
+
+    async def __handle(self, batch: list[tuple[object, asyncio.Future]]):
+        try:
+            items = [item for item, _ in batch]
+            self.__batches += 1
+            self.__batched_items += len(items)
+            try:
+                if self.__executor is None:
+                    results = self.__process(items)
+                else:
+                    results = await asyncio.get_running_loop().run_in_executor(self.__executor, self.__process, items)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # Items of a cancelled batch are cancelled too
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            self.__slots.release()
+
+
+def _resolve(future: asyncio.Future):
+    """:meta private:"""
+    if not future.done():
+        future.set_result(None)
+
+
+class _HTTPError(Exception):
+    """:meta private:"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SecretServer:
+    """An HTTP server decoding and encoding secrets in micro-batches. See this module's docs for its endpoints.
+
+    :param host: The address to listen on.
+    :type host: str
+    :param port: The port to listen on, 0 to pick a free one (see :attr:`port`).
+    :type port: int
+    :param max_batch_size: The maximum number of request lines handled in a batch.
+    :type max_batch_size: int
+    :param max_delay: The longest time, in seconds, a request line waits for its batch to fill up.
+    :type max_delay: float
+    :param max_pending: The maximum number of request lines waiting or being handled. Requests received
+        past this limit are answered with 503 Service Unavailable.
+    :type max_pending: int
+    :param timeout: The time, in seconds, after which a request is answered with 504 Gateway Timeout.
+    :type timeout: float
+    :param executor: The executor running batches, or None to run them on the event loop.
+    :type executor: concurrent.futures.Executor or None
+    :param concurrency: The maximum number of batches handled at the same time.
+    :type concurrency: int
+    :param max_body_size: The maximum size of a request body, in bytes.
+    :type max_body_size: int"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, *, max_batch_size: int = 64,
+                 max_delay: float = 0.002, max_pending: int = 4096, timeout: float = 5.0,
+                 executor: Executor | None = None, concurrency: int = 1, max_body_size: int = 1 << 20):
+        self.__host, self.__port = host, port
+        self.__batcher_options = (max_batch_size, max_delay, max_pending, executor, concurrency)
+        self.__timeout = timeout
+        self.__max_body_size = max_body_size
+        self.__batcher = None
+        self.__server = None
+        self.__counters = {"requests": 0, "lines": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    port = property(lambda self: self.__port,
+                    doc="""The port the server listens on (the one actually picked once started, if 0 was given).
+
+                    :type: int""")
+
+    def stats(self) -> dict:
+        """Return the server's counters.
+
+        :return: The number of requests and lines received, of requests rejected because of backpressure,
+            timed out or failed, and the batcher's counters.
+        :rtype: dict"""
+        stats = dict(self.__counters)
+        if self.__batcher is not None:
+            stats.update(self.__batcher.stats())
+        return stats
+
+    async def start(self):
+        """Start listening."""
+        self.__batcher = MicroBatcher(process_batch, *self.__batcher_options)
+        self.__batcher.start()
+        self.__server = await asyncio.start_server(self.__handle_connection, self.__host, self.__port)
+        self.__port = self.__server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and handling requests."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        if self.__batcher is not None:
+            await self.__batcher.close()
+
+    async def serve_forever(self):
+        """Start the server if needed, and handle requests until cancelled."""
+        if self.__server is None:
+            await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def __aenter__(self) -> "SecretServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    headers = {}
+                    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    body = await self.__read_body(reader, method, headers)
+                    status, payload = 200, await self.__respond(method, path, body)
+                except _HTTPError as exc:
+                    status, payload = exc.status, json.dumps({"error": str(exc)}) + "\n"
+                    # The rest of the request may not have been read
+                    keep_alive = keep_alive and exc.status not in (400, 411, 413)
+                except ValueError:
+                    status, payload, keep_alive = 400, json.dumps({"error": "malformed request"}) + "\n", False
+                content = payload.encode("utf-8")
+                head = [f"HTTP/1.1 {status} {_REASONS[status]}", "Content-Type: application/x-ndjson; charset=utf-8",
+                        f"Content-Length: {len(content)}"]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                if not keep_alive:
+                    head.append("Connection: close")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def __read_body(self, reader: asyncio.StreamReader, method: str, headers: dict) -> bytes:
+        if "content-length" not in headers:
+            if method == "POST":
+                raise _HTTPError(411, "a Content-Length header is required")
+            return b""
+        length = int(headers["content-length"])
+        if length > self.__max_body_size:
+            raise _HTTPError(413, f"request bodies are limited to {self.__max_body_size} bytes")
+        return await reader.readexactly(length)
+
+    async def __respond(self, method: str, path: str, body: bytes) -> str:
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            if method != "GET":
+                raise _HTTPError(405, "expected GET")
+            return json.dumps(self.stats()) + "\n"
+        operation = path[1:]
+        if operation not in _OPERATIONS:
+            raise _HTTPError(404, f"unknown endpoint : {path}")
+        if method != "POST":
+            raise _HTTPError(405, "expected POST")
+        self.__counters["requests"] += 1
+        items = []
+        for line in body.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            if line.lstrip().startswith("{"):
+                try:
+                    items.append((operation, json.loads(line)))
+                except json.JSONDecodeError as exc:
+                    raise _HTTPError(400, f"invalid JSON ({exc})") from None
+            else:
+                items.append((operation, line))
+        self.__counters["lines"] += len(items)
+        futures = []
+        try:
+            for item in items:
+                futures.append(self.__batcher.submit(item))
+        except ServerOverloaded as exc:
+            for future in futures:
+                future.cancel()
+            self.__counters["rejected"] += 1
+            raise _HTTPError(503, str(exc)) from None
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*futures), self.__timeout)
+        except asyncio.TimeoutError:
+            self.__counters["timeouts"] += 1
+            raise _HTTPError(504, f"the request took more than {self.__timeout} seconds") from None
+        except Exception as exc:
+            # The batch failed as a whole (a worker process died, for example)
+            self.__counters["errors"] += 1
+            raise _HTTPError(500, f"the request couldn't be handled ({error_string(exc)})") from None
+        return "".join(result + "\n" for result in results)
+
+
+class LoadReport(NamedTuple):
+    """The result of :func:`run_load`. Latencies are in seconds."""
+
+    requests: int
+    """The number of requests sent."""
+
+    errors: int
+    """The number of requests which failed or weren't answered with 200 OK."""
+
+    elapsed: float
+    """The duration of the whole run."""
+
+    throughput: float
+    """The number of successful requests per second."""
+
+    p50: float
+    """The median latency of successful requests."""
+
+    p90: float
+    """The 90th percentile latency."""
+
+    p99: float
+    """The 99th percentile latency."""
+
+    max: float
+    """The highest latency."""
+
+
+def sample_payloads(count: int, seed: int = 0) -> list[str]:
+    """Return random secret strings to send to a server: one game secret for every three ring secrets.
+
+    :param count: The number of secrets.
+    :type count: int
+    :param seed: The random seed.
+    :type seed: int
+    :rtype: list[str]"""
+    generator = random.Random(seed)
+    payloads = []
+    for position in range(count):
+        region = generator.choice(tuple(GameRegion))
+        if position % 4:
+            secret = RingSecret(game_id=generator.randrange(32767), rings=generator.getrandbits(64), region=region)
+        else:
+            secret = GameSecret(game_id=generator.randrange(32767), region=region, link_name="Link",
+                                child_name="Pip", behaviour=generator.randrange(64))
+        payloads.append(str(secret).strip())
+    return payloads
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """:meta private:"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_load(host: str, port: int, payloads: list[str], *, requests: int = 10000, concurrency: int = 64,
+                   lines_per_request: int = 1, endpoint: str = "/decode") -> LoadReport:
+    """Send requests to a server from concurrent connections, and measure their latencies.
+
+    :param host: The server's address.
+    :type host: str
+    :param port: The server's port.
+    :type port: int
+    :param payloads: The request lines to send, cycled through.
+    :type payloads: list[str]
+    :param requests: The total number of requests to send.
+    :type requests: int
+    :param concurrency: The number of connections sending requests at the same time.
+    :type concurrency: int
+    :param lines_per_request: The number of payloads sent in each request.
+    :type lines_per_request: int
+    :param endpoint: The path requests are sent to.
+    :type endpoint: str
+    :rtype: LoadReport"""
+    bodies = []
+    for start in range(0, len(payloads), lines_per_request):
+        body = "".join(line + "\n" for line in payloads[start:start + lines_per_request]).encode("utf-8")
+        bodies.append(f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n"
+                      .encode("latin-1") + body)
+    remaining = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader = writer = None
+        for number in remaining:
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                start = time.perf_counter()
+                writer.write(bodies[number % len(bodies)])
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                closing = False
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    name = name.strip().lower()
+                    if name == "content-length":
+                        length = int(value)
+                    elif name == "connection":
+                        closing = value.strip().lower() == "close"
+                await reader.readexactly(length)
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+                if closing:
+                    writer.close()
+                    reader = writer = None
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+        if writer is not None:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return LoadReport(requests=requests, errors=errors, elapsed=elapsed,
+                      throughput=len(latencies) / elapsed if elapsed else 0.0,
+                      p50=_percentile(latencies, 0.5), p90=_percentile(latencies, 0.9),
+                      p99=_percentile(latencies, 0.99), max=latencies[-1] if latencies else 0.0)
+
+
+def _make_executor(kind: str, workers: int | None) -> Executor | None:
+    """:meta private:"""
+    if kind == "thread":
+        return ThreadPoolExecutor(workers)
+    if kind == "process":
+        return ProcessPoolExecutor(workers)
+    return None
+
+
+def _server_options(args) -> dict:
+    """:meta private:"""
+    return {"max_batch_size": args.max_batch_size, "max_delay": args.max_delay / 1000, "max_pending": args.max_pending,
+            "timeout": args.timeout, "concurrency": args.concurrency_batches}
+
+
+async def _serve(args):
+    executor = _make_executor(args.executor, args.workers)
+    try:
+        server = SecretServer(args.host, args.port, executor=executor, **_server_options(args))
+        await server.start()
+        print(f"listening on {args.host}:{server.port}", file=sys.stderr, flush=True)
+        await server.serve_forever()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+async def _loadgen(args):
+    payloads = sample_payloads(args.payloads)
+    if not args.embedded:
+        return await run_load(args.host, args.port, payloads, requests=args.requests, concurrency=args.concurrency,
+                              lines_per_request=args.lines_per_request)
+    executor = _make_executor(args.executor, args.workers)
+    try:
+        async with SecretServer(args.host, 0, executor=executor, **_server_options(args)) as server:
+            report = await run_load(args.host, server.port, payloads, requests=args.requests,
+                                    concurrency=args.concurrency, lines_per_request=args.lines_per_request)
+            print(json.dumps(server.stats()), file=sys.stderr)
+            return report
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command-line argument parser.
+
+    :return: The argument parser.
+    :rtype: argparse.ArgumentParser"""
+    parser = argparse.ArgumentParser(prog="python -m pyzora.server",
+                                     description="Serve secret decoding and encoding over HTTP, or benchmark a server.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="start a server")
+    loadgen = subparsers.add_parser("loadgen", help="send requests to a server and report latencies as JSON")
+    for subparser in (serve, loadgen):
+        subparser.add_argument("--host", default="127.0.0.1", help="address (default: %(default)s)")
+        subparser.add_argument("--port", type=int, default=8080, help="port (default: %(default)s)")
+        subparser.add_argument("--max-batch-size", type=int, default=64,
+                               help="largest micro-batch (default: %(default)s)")
+        subparser.add_argument("--max-delay", type=float, default=2.0,
+                               help="longest wait for a batch to fill up, in milliseconds (default: %(default)s)")
+        subparser.add_argument("--max-pending", type=int, default=4096,
+                               help="pending request lines after which requests get 503 (default: %(default)s)")
+        subparser.add_argument("--timeout", type=float, default=5.0,
+                               help="seconds after which requests get 504 (default: %(default)s)")
+        subparser.add_argument("--executor", choices=("none", "thread", "process"), default="none",
+                               help="where batches run (default: %(default)s, on the event loop)")
+        subparser.add_argument("--workers", type=int, default=None, help="executor workers (default: automatic)")
+        subparser.add_argument("--concurrency-batches", type=int, default=1,
+                               help="batches handled at the same time (default: %(default)s)")
+    loadgen.add_argument("--embedded", action="store_true",
+                         help="start a server in this process on a free port instead of connecting to --port")
+    loadgen.add_argument("--requests", type=int, default=10000, help="requests to send (default: %(default)s)")
+    loadgen.add_argument("--concurrency", type=int, default=64, help="concurrent connections (default: %(default)s)")
+    loadgen.add_argument("--lines-per-request", type=int, default=1,
+                         help="secrets sent in each request (default: %(default)s)")
+    loadgen.add_argument("--payloads", type=int, default=1000,
+                         help="distinct random secrets to send (default: %(default)s)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the server or the load generator from the command line.
+
+    :param argv: The command-line arguments, without the program name. Defaults to sys.argv.
+    :type argv: list[str] or None
+    :return: The exit status.
+    :rtype: int"""
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(_serve(args))
+        else:
+            report = asyncio.run(_loadgen(args))
+            print(json.dumps(report._asdict()))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
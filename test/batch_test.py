@@ -0,0 +1,93 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Batch decoding test file. See pyzora.batch for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import unittest
+
+from pyzora import *
+from pyzora.batch import numpy
+
+
+class DecodeBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.valid = {
+            GameSecret: parse_secret("H←■!@ ←2♦y& GB5●y 6♥?↑4", GameRegion.US_PAL),
+            RingSecret: parse_secret("L←■d) B~&JS $j(D8", GameRegion.US_PAL),
+            MemorySecret: parse_secret("→●2y=", GameRegion.US_PAL),
+        }
+        generator = random.Random(0)
+        self.rows = {
+            secret_type: [bytes(valid)] + [
+                bytes(generator.randrange(66) for _ in range(len(valid))) for _ in range(500)
+            ]
+            for secret_type, valid in self.valid.items()
+        }
+
+    def test_python_statuses(self):
+        records = GameSecret.decode_batch([self.valid[GameSecret], self.valid[RingSecret],
+                                           self.valid[GameSecret][:-1]], GameRegion.US_PAL)
+        self.assertEqual([record.status for record in records],
+                         [SecretStatus.VALID, SecretStatus.INVALID_LENGTH, SecretStatus.INVALID_LENGTH])
+        loaded = GameSecret.load(self.valid[GameSecret], GameRegion.US_PAL)
+        self.assertEqual(records[0].game_id, loaded.game_id)
+        self.assertEqual(records[0].animal, loaded.animal)
+        corrupted = bytearray(self.valid[RingSecret])
+        corrupted[3] ^= 1
+        self.assertEqual(RingSecret.decode_batch([corrupted], GameRegion.US_PAL)[0].status,
+                         SecretStatus.CHECKSUM_MISMATCH)
+
+    def test_python_matches_load(self):
+        for secret_type, rows in self.rows.items():
+            for row, record in zip(rows, secret_type.decode_batch(rows, GameRegion.US_PAL)):
+                try:
+                    secret = secret_type.load(row, GameRegion.US_PAL)
+                except (SecretError, ValueError):
+                    self.assertNotEqual(record.status, SecretStatus.VALID)
+                else:
+                    self.assertEqual(record.status, SecretStatus.VALID)
+                    self.assertEqual(record.game_id, secret.game_id)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        for secret_type, rows in self.rows.items():
+            array = numpy.array([list(row) for row in rows], dtype=numpy.uint8)
+            expected = secret_type.decode_batch(rows, GameRegion.US_PAL)
+            result = secret_type.decode_batch(array, GameRegion.US_PAL)
+            self.assertEqual(result.dtype.names, expected[0]._fields)
+            self.assertEqual([tuple(map(int, row)) for row in result], [tuple(record) for record in expected])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_shape(self):
+        with self.assertRaises(SecretError):
+            RingSecret.decode_batch(numpy.zeros((3, 20), dtype=numpy.uint8), GameRegion.US_PAL)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_transcode(self):
+        for secret_type, rows in self.rows.items():
+            rows = [row for row in rows if max(row) <= 63]
+            array = numpy.frombuffer(b"".join(rows), dtype=numpy.uint8).reshape(len(rows), -1)
+            converted = transcode_many(array, GameRegion.US_PAL, GameRegion.JP)
+            self.assertEqual([bytes(row) for row in converted], transcode_many(rows, GameRegion.US_PAL, GameRegion.JP))
+        with self.assertRaises(SecretError):
+            transcode_many(numpy.full((2, 5), 64, dtype=numpy.uint8), GameRegion.US_PAL, GameRegion.JP)
+        with self.assertRaises(SecretError):
+            transcode_many(numpy.full((2, 30), 63, dtype=numpy.uint8), GameRegion.US_PAL, GameRegion.JP)
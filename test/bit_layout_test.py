@@ -0,0 +1,55 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+BitLayout test file. See pyzora.bit_layout for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from pyzora.secret import *
+
+
+class BitLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.layout = BitLayout(2, (
+            BitField.at("kind", 0, 2, reverse=False),
+            BitField.at("flag", 2, 1, bool),
+            BitField("value", ((3, 3), (8, 4))),
+        ))
+
+    def test_matches_bitstrings(self):
+        data = self.layout.pack(kind=1, flag=True, value=0b1001101)
+        bitstring = byte_array_to_string(data)
+        self.assertEqual(bitstring[0:2], "01")
+        self.assertEqual(bitstring[2], "1")
+        self.assertEqual(reverse_string(bitstring[3:6] + bitstring[8:12]), "1001101")
+        self.assertEqual(bitstring[6:8], "00")
+
+    def test_round_trip(self):
+        fields = self.layout.unpack(self.layout.pack(kind=2, value=100))
+        self.assertEqual(fields, (2, False, 100))
+        self.assertIs(fields.flag, False)
+
+    def test_invalid_layouts(self):
+        with self.assertRaises(ValueError):
+            BitLayout(1, (BitField.at("a", 0, 4), BitField.at("b", 3, 2)))
+        with self.assertRaises(ValueError):
+            BitLayout(1, (BitField.at("a", 4, 4),))
+        with self.assertRaises(TypeError):
+            self.layout.pack(unknown=1)
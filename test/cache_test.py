@@ -0,0 +1,116 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Secret cache test file. See pyzora.cache for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+import unittest
+
+from pyzora import *
+
+
+class SecretCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._GAME_SECRET = "H←■!@ ←2♦y& GB5●5 6♥s↑6"
+        self._RING_SECRETS = ("L←■!N @bS9& hmR→↓", "L←■d) B~&JS $j(D8")
+
+    def test_hits_and_copies(self):
+        cache = SecretCache(max_size=4)
+        first = cache.load(GameSecret, self._GAME_SECRET, GameRegion.US_PAL)
+        first.link_name = "Zelda"
+        second = cache.load(GameSecret, self._GAME_SECRET.replace(" ", ""), GameRegion.US_PAL)
+        self.assertEqual(second.link_name, "Link ")
+        self.assertIsNot(first, second)
+        # Secrets are cached by symbols, so a parsed secret shares the entry of its string
+        cache.load(GameSecret, parse_secret(self._GAME_SECRET, GameRegion.US_PAL), GameRegion.US_PAL)
+        self.assertEqual(cache.stats(), CacheStats(hits=2, misses=1, evictions=0, expirations=0, size=1, max_size=4))
+
+    def test_skipped_characters(self):
+        # US/PAL secrets only skip spaces, so a tab must fail with the cache as it does without it
+        cache = SecretCache()
+        cache.load(RingSecret, self._RING_SECRETS[0], GameRegion.US_PAL)
+        self.assertRaises(SecretError, cache.load, RingSecret, self._RING_SECRETS[0].replace(" ", "\t", 1),
+                          GameRegion.US_PAL)
+        self.assertEqual(cache.stats().hits, 0)
+        # Skipped characters separate aliases: "n e" is parsed into two symbols, and "ne" into one
+        secret = "sakeneruki pi ri wa mu ra 71 ke o mo"
+        cache.load(RingSecret, secret, GameRegion.JP)
+        self.assertRaises(SecretError, cache.load, RingSecret, secret.replace("ne", "n e"), GameRegion.JP)
+        self.assertEqual(cache.stats().hits, 0)
+
+    def test_eviction(self):
+        cache = SecretCache(max_size=1)
+        for secret in self._RING_SECRETS + self._RING_SECRETS[:1]:
+            cache.load(RingSecret, secret, GameRegion.US_PAL)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (0, 3, 2, 1))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self):
+        cache = SecretCache(ttl=0.01)
+        cache.load(RingSecret, self._RING_SECRETS[0], GameRegion.US_PAL)
+        time.sleep(0.02)
+        cache.load(RingSecret, self._RING_SECRETS[0], GameRegion.US_PAL)
+        self.assertEqual(cache.stats().expirations, 1)
+
+    def test_errors_not_cached(self):
+        cache = SecretCache()
+        for _ in range(2):
+            self.assertRaises(SecretError, cache.load, RingSecret, self._GAME_SECRET, GameRegion.US_PAL)
+        self.assertEqual((cache.stats().misses, len(cache)), (2, 0))
+
+    def test_use_cache(self):
+        cache = SecretCache()
+        RingSecret.use_cache(cache)
+        try:
+            for _ in range(3):
+                self.assertEqual(RingSecret.load(self._RING_SECRETS[1], GameRegion.US_PAL).game_id, 21437)
+            GameSecret.load(self._GAME_SECRET, GameRegion.US_PAL)
+        finally:
+            RingSecret.use_cache(None)
+        self.assertEqual((cache.stats().hits, cache.stats().misses), (2, 1))
+
+    def test_threads(self):
+        cache = SecretCache(max_size=1)
+        errors = []
+
+        def load():
+            try:
+                for _ in range(200):
+                    for secret in self._RING_SECRETS:
+                        cache.load(RingSecret, secret, GameRegion.US_PAL)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 1600)
+        self.assertEqual(stats.size, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Child behaviour test file. See pyzora.child_behaviour_tools for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import itertools
+import random
+import unittest
+
+from pyzora import *
+from pyzora.batch import numpy
+
+
+def _name_value(region, name):
+    # The original loop, as done by the games
+    data = bytes(name.upper() if region == GameRegion.JP else name, "utf-8")
+    value = sum(byte & 0xF for byte in data) - 3
+    while value > 255:
+        value -= 3
+    return value + 4
+
+
+class ChildBehaviourTest(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(0)
+        self.names = ["", "Pip", "Rosa", "たろう", "ZELDA"] + [
+            "".join(chr(generator.choice((generator.randrange(32, 127), generator.randrange(0x3041, 0x30FF),
+                                          generator.randrange(0x10000, 0x1FFFF))))
+                    for _ in range(generator.randrange(6)))
+            for _ in range(500)
+        ]
+
+    def test_name_value(self):
+        for region, name in itertools.product(GameRegion, self.names):
+            self.assertEqual(get_child_behaviour_value(region, name), _name_value(region, name))
+        with self.assertRaises(ValueError):
+            get_child_behaviour_value(GameRegion.US_PAL, "Bipins")
+
+    def test_answers(self):
+        for answers in itertools.product(RupeesGiven, SleepMethod, ChildQuestion, ChildKind):
+            self.assertEqual(get_child_behaviour_value(GameRegion.US_PAL, "Pip", *answers),
+                             _name_value(GameRegion.US_PAL, "Pip") + sum(answers))
+        self.assertEqual(get_child_behaviour_value(GameRegion.US_PAL, "Pip", RupeesGiven.TEN, SleepMethod.PLAY),
+                         _name_value(GameRegion.US_PAL, "Pip") + 12)
+        for answers in ((0, 0), (SleepMethod.SING, RupeesGiven.ONE), (RupeesGiven.ONE,),
+                        (RupeesGiven.ONE, SleepMethod.SING, ChildKind.NONE, ChildQuestion.NO_OR_EGG)):
+            with self.assertRaises(TypeError):
+                get_child_behaviour_value(GameRegion.US_PAL, "Pip", *answers)
+
+    def test_batch(self):
+        generator = random.Random(1)
+        names = [generator.choice(self.names[:5]) for _ in range(1000)]
+        answers = [[generator.choice(list(answer_type)) for _ in names]
+                   for answer_type in (RupeesGiven, SleepMethod, ChildQuestion, ChildKind)]
+        expected = [get_child_behaviour_value(GameRegion.JP, *row) for row in zip(names, *answers)]
+        batch = get_child_behaviour_batch(GameRegion.JP, names, *answers)
+        self.assertEqual(batch.values, expected)
+        self.assertEqual(batch.behaviours, [get_behaviour(value) for value in expected])
+        # Integer answers are accepted too
+        self.assertEqual(get_child_behaviour_batch(GameRegion.JP, names, *[list(map(int, column))
+                                                                          for column in answers]), batch)
+        self.assertEqual(get_child_behaviour_batch(GameRegion.JP, names).values,
+                         [get_child_behaviour_value(GameRegion.JP, name) for name in names])
+        with self.assertRaises(TypeError):
+            get_child_behaviour_batch(GameRegion.JP, names, answers[0])
+        with self.assertRaises(ValueError):
+            get_child_behaviour_batch(GameRegion.JP, names, answers[1], answers[0])
+        with self.assertRaises(ValueError):
+            get_child_behaviour_batch(GameRegion.JP, names, answers[0][1:], answers[1])
+        # Only members of the expected enum, or integers which are their values
+        for column in ([2.5] * len(names), [SleepMethod.SING] * len(names), [True] * len(names), ["1"] * len(names)):
+            with self.assertRaises(ValueError):
+                get_child_behaviour_batch(GameRegion.JP, names, column, answers[1])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_batch(self):
+        generator = random.Random(2)
+        names = [generator.choice(self.names[:5]) for _ in range(1000)]
+        answers = [[int(generator.choice(list(answer_type))) for _ in names]
+                   for answer_type in (RupeesGiven, SleepMethod, ChildQuestion, ChildKind)]
+        expected = get_child_behaviour_batch(GameRegion.US_PAL, names, *answers)
+        for batch_names in (names, numpy.array(names)):
+            batch = get_child_behaviour_batch(GameRegion.US_PAL, batch_names, *map(numpy.array, answers))
+            self.assertEqual(batch.values.tolist(), expected.values)
+            self.assertEqual(batch.behaviours.tolist(), expected.behaviours)
+        with self.assertRaises(ValueError):
+            get_child_behaviour_batch(GameRegion.US_PAL, names, numpy.full(len(names), 3), numpy.array(answers[1]))
+        for column in (numpy.array(answers[0], dtype=float), numpy.full(len(names), 2.5), [2.5] * len(names),
+                       [SleepMethod.SING] * len(names)):
+            with self.assertRaises(ValueError):
+                get_child_behaviour_batch(GameRegion.US_PAL, names, column, numpy.array(answers[1]))
@@ -0,0 +1,124 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Command-line tool test file. See pyzora.cli for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import contextlib
+import csv
+import io
+import json
+import unittest
+
+from pyzora import *
+from pyzora.cli import main, secret_to_record
+
+
+class CommandLineTest(unittest.TestCase):
+    def setUp(self):
+        self._SECRETS = "H←■!@ ←2♦y& GB5●5 6♥s↑6\nL←■!N @bS9& hmR→↓\n\nくのてを3 4のんれか ぺそちはと\nbad\n"
+
+    def _run(self, *argv, stdin=""):
+        stdout = io.StringIO()
+        status = main(list(argv), io.StringIO(stdin), stdout)
+        return status, stdout.getvalue()
+
+    def _run_jsonl(self, *argv, stdin=""):
+        status, output = self._run(*argv, stdin=stdin)
+        self.assertEqual(status, 0)
+        return [json.loads(line) for line in output.splitlines()]
+
+    def test_decode(self):
+        records = self._run_jsonl("decode", stdin=self._SECRETS)
+        self.assertEqual([record["index"] for record in records], [0, 1, 3, 4])
+        self.assertEqual(records[0]["kind"], "game")
+        self.assertEqual(records[0]["link_name"], "Link")
+        self.assertEqual(records[0]["target_game"], "AGES")
+        self.assertEqual(records[1]["kind"], "ring")
+        self.assertEqual(records[2]["region"], "JP")
+        self.assertIsNone(records[0]["error"])
+        self.assertTrue(records[3]["error"].startswith("SecretError"))
+
+    def test_decode_kind(self):
+        records = self._run_jsonl("decode", "--kind", "ring", "--region", "us", stdin=self._SECRETS)
+        self.assertTrue(records[0]["error"].startswith("SecretError"))
+        self.assertIsNone(records[1]["error"])
+        self.assertIsNotNone(records[2]["error"])
+
+    def test_round_trip(self):
+        _, decoded = self._run("decode", stdin=self._SECRETS)
+        records = self._run_jsonl("encode", stdin=decoded)
+        self.assertEqual([record["secret"] for record in records[:3]],
+                         [secret for secret in self._SECRETS.splitlines() if secret and secret != "bad"])
+        self.assertIsNone(records[3]["secret"])
+        self.assertTrue(records[3]["error"].startswith("ValueError"))
+
+    def test_csv(self):
+        status, output = self._run("decode", "--output-format", "csv", stdin=self._SECRETS)
+        self.assertEqual(status, 0)
+        rows = list(csv.DictReader(io.StringIO(output)))
+        self.assertEqual(rows[1]["rings"], "0")
+        records = self._run_jsonl("encode", "--input-format", "csv", stdin=output)
+        self.assertEqual(records[1]["secret"], "L←■!N @bS9& hmR→↓")
+
+    def test_encode_fields(self):
+        record = {"kind": "game", "link_name": "Bob", "target_game": "seasons", "animal": 11, "is_hero_quest": "yes"}
+        records = self._run_jsonl("encode", "--region", "us", stdin=json.dumps(record))
+        gsecret = GameSecret.load(records[0]["secret"], GameRegion.US_PAL)
+        self.assertEqual(gsecret.link_name.rstrip(), "Bob")
+        self.assertEqual(gsecret.target_game, TargetGame.SEASONS)
+        self.assertEqual(gsecret.animal, ObtainedCompanion.RICKY)
+        self.assertTrue(gsecret.is_hero_quest)
+
+    def test_validate(self):
+        records = self._run_jsonl("validate", stdin=self._SECRETS)
+        self.assertEqual([record["valid"] for record in records], [True, True, True, False])
+
+    def test_convert_region(self):
+        records = self._run_jsonl("convert-region", "--to", "jp", stdin=self._SECRETS)
+        self.assertEqual(records[1]["secret"], "くのてを3 4のんれか ぺそちはと")
+        self.assertEqual(records[1]["region"], "JP")
+        self.assertEqual([record["index"] for record in records], [0, 1, 3, 4])
+        self.assertEqual([record["kind"] for record in records[:3]], ["game", "ring", "ring"])
+        # Converted secrets hold the same fields
+        for record, source in zip(records, self._SECRETS.split("\n")[:2] + ["くのてを3 4のんれか ぺそちはと"]):
+            converted = secret_to_record(load_any(record["secret"], GameRegion.JP))
+            original = secret_to_record(load_any(source))
+            del converted["region"], original["region"]
+            self.assertEqual(converted, original)
+        self.assertTrue(records[3]["error"].startswith("SecretError"))
+        # Invalid secrets give the errors of loading them
+        records = self._run_jsonl("convert-region", "--to", "jp", "--kind", "game", "--region", "us",
+                                  stdin="H←■!@ ←2♦y& GB5●5 6♥s↑7\nL←■!N @bS9& hmR→↓\n")
+        self.assertTrue(records[0]["error"].startswith("ChecksumError"))
+        self.assertTrue(records[1]["error"].startswith("SecretError"))
+
+    def test_jobs(self):
+        self.assertEqual(self._run_jsonl("decode", "--jobs", "2", "--chunk-size", "1", stdin=self._SECRETS),
+                         self._run_jsonl("decode", stdin=self._SECRETS))
+
+    def test_invalid_input(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            status, _ = self._run("encode", stdin="{not json\n")
+        self.assertEqual(status, 2)
+        self.assertIn("line 1", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
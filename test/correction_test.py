@@ -0,0 +1,103 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Typo correction test file. See pyzora.correction for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from pyzora import *
+
+
+class SuggestCorrectionsTest(unittest.TestCase):
+    def setUp(self):
+        self._RING = "L←■!N @bS9& hmR→↓"
+        self._RING_SYMBOLS = bytes(parse_secret(self._RING, GameRegion.US_PAL))
+        secret = GameSecret(game_id=1235, link_name="Link", child_name="Pip", region=GameRegion.JP)
+        self._GAME_SYMBOLS = bytes(secret)
+        self._GAME = render_secret(self._GAME_SYMBOLS, GameRegion.JP, 0)
+
+    def test_valid_secret(self):
+        corrections = suggest_corrections(self._RING, RingSecret, GameRegion.US_PAL)
+        self.assertEqual(corrections[0].symbols, self._RING_SYMBOLS)
+        self.assertEqual(corrections[0].changes, ())
+        self.assertEqual(corrections[0].cost, 0)
+        self.assertEqual(corrections[0].secret, self._RING)
+        self.assertEqual(corrections[0].to_object().rings, 0)
+
+    def test_substitution(self):
+        for pos in range(len(self._RING_SYMBOLS)):
+            typo = bytearray(self._RING_SYMBOLS)
+            typo[pos] = (typo[pos] + 5) % 64
+            corrections = suggest_corrections(render_secret(typo, GameRegion.US_PAL), RingSecret, GameRegion.US_PAL,
+                                              limit=None)
+            for correction in corrections:
+                self.assertTrue(RingSecret.is_valid(correction.symbols, GameRegion.US_PAL))
+                self.assertEqual(len(correction.changes), 1)
+            self.assertIn(self._RING_SYMBOLS, [correction.symbols for correction in corrections])
+
+    def test_ranking(self):
+        # "B" and "8" look alike, and kana only differing by dakuten are even closer
+        typo = self._RING.replace("bS9", "b59")
+        corrections = suggest_corrections(typo, RingSecret, GameRegion.US_PAL, limit=None)
+        costs = {correction.symbols: correction.cost for correction in corrections}
+        self.assertEqual(costs[self._RING_SYMBOLS], 2)
+        self.assertEqual(corrections, sorted(corrections, key=lambda correction: correction.cost))
+        for typed, kana in (("か", "が"), ("が", "か"), ("ほ", "ぼ"), ("こ", "ご")):
+            pos = self._GAME.find(typed)
+            if pos < 0:
+                continue
+            typo = self._GAME[:pos] + kana + self._GAME[pos + 1:]
+            corrections = suggest_corrections(typo, GameSecret, GameRegion.JP)
+            self.assertEqual(corrections[0].symbols, self._GAME_SYMBOLS)
+            self.assertEqual(corrections[0].cost, 1)
+            self.assertEqual(corrections[0].changes, ((pos, kana, typed),))
+
+    def test_wildcards(self):
+        unreadable = self._RING[:3] + "_" + self._RING[4:]
+        corrections = suggest_corrections(unreadable, RingSecret, GameRegion.US_PAL, max_edits=0, wildcards="_")
+        self.assertLessEqual(len(corrections), 4)
+        self.assertIn(self._RING_SYMBOLS, [correction.symbols for correction in corrections])
+        for correction in corrections:
+            self.assertEqual(correction.cost, 0)
+            self.assertEqual(correction.changes[0][:2], (3, "_"))
+        corrections = suggest_corrections(self._RING[:3] + "**" + self._RING[5:], RingSecret, GameRegion.US_PAL,
+                                          max_edits=0, wildcards="*", limit=None)
+        self.assertEqual(len(corrections), 64 * 4)
+        self.assertIn(self._RING_SYMBOLS, [correction.symbols for correction in corrections])
+        # Characters which aren't symbols count as edits
+        self.assertEqual(suggest_corrections(unreadable, RingSecret, GameRegion.US_PAL, max_edits=0), [])
+        corrections = suggest_corrections(unreadable, RingSecret, GameRegion.US_PAL)
+        self.assertIn(self._RING_SYMBOLS, [correction.symbols for correction in corrections])
+
+    def test_length_edits(self):
+        missing = self._RING[:7] + self._RING[8:]
+        corrections = suggest_corrections(missing, None, GameRegion.US_PAL, limit=None)
+        self.assertIn(self._RING_SYMBOLS, [correction.symbols for correction in corrections])
+        self.assertEqual({correction.kind for correction in corrections}, {RingSecret})
+        extra = self._RING[:7] + "B" + self._RING[7:]
+        corrections = suggest_corrections(extra, RingSecret, GameRegion.US_PAL, limit=None)
+        found = [correction for correction in corrections if correction.symbols == self._RING_SYMBOLS]
+        self.assertEqual(found[0].changes, ((6, "B", ""),))
+        self.assertEqual(suggest_corrections(self._RING + "BB", RingSecret, GameRegion.US_PAL), [])
+
+    def test_limits(self):
+        self.assertEqual(len(suggest_corrections(self._RING, RingSecret, GameRegion.US_PAL, limit=3)), 3)
+        self.assertRaises(ValueError, suggest_corrections, self._RING, RingSecret, GameRegion.US_PAL, -1)
+        self.assertRaises(ValueError, suggest_corrections, "??" + self._RING[2:], RingSecret, GameRegion.US_PAL, 2)
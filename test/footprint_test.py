@@ -0,0 +1,66 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Memory footprint test file. Measures how many bytes each loaded secret takes with tracemalloc.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import tracemalloc
+import unittest
+
+from pyzora import *
+
+
+def bytes_per_instance(secret_type, secret: str, region: GameRegion, count: int = 2000) -> float:
+    """Return the average number of bytes allocated for each loaded secret."""
+    data = parse_secret(secret, region)
+    secret_type.load(data, region)
+    secrets = [None] * count
+    tracemalloc.start()
+    try:
+        for pos in range(count):
+            secrets[pos] = secret_type.load(data, region)
+        allocated = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return allocated / count
+
+
+class FootprintTest(unittest.TestCase):
+    def setUp(self):
+        # Secret type, secret and budget in bytes per instance
+        self._SECRETS = (
+            (GameSecret, "H←■!@ ←2♦y& GB5●5 6♥s↑6", 224),
+            (RingSecret, "L←■!N @bS9& hmR→↓", 112),
+            (MemorySecret, "●=q(T", 112),
+        )
+
+    def test_no_instance_dict(self):
+        for secret_type, secret, _ in self._SECRETS:
+            self.assertFalse(hasattr(secret_type.load(secret, GameRegion.US_PAL), "__dict__"))
+
+    def test_bytes_per_instance(self):
+        for secret_type, secret, budget in self._SECRETS:
+            with self.subTest(secret_type.__name__):
+                footprint = bytes_per_instance(secret_type, secret, GameRegion.US_PAL)
+                self.assertLessEqual(footprint, budget,
+                                     f"{secret_type.__name__} takes {footprint:.0f} bytes per instance")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -116,3 +116,24 @@ class GameSecretTest(unittest.TestCase):
         self.assertEqual(gsecret1.was_given_free_ring, gsecret3.was_given_free_ring)
         self.assertEqual(gsecret3.was_given_free_ring, gsecret3.was_given_free_ring)
         self.assertFalse(gsecret1.was_given_free_ring)
+
+    def test_write_to_string(self):
+        for secret, region in (("H←■!@ ←2♦y& GB5●5 6♥s↑6", GameRegion.US_PAL),
+                               ("H←■!@ ←2♦y& GB5●y 6♥?↑4", GameRegion.US_PAL),
+                               ("えのてを7 ががむとか の7ふにご るこがりす", GameRegion.JP)):
+            self.assertEqual(str(GameSecret.load(secret, region)).strip(), secret)
+
+    def test_independent_instances(self):
+        gsecret1 = GameSecret(game_id=1, region=GameRegion.US_PAL, behaviour=5)
+        gsecret2 = GameSecret(game_id=1, region=GameRegion.US_PAL)
+        self.assertEqual(gsecret2.behaviour, 0)
+        self.assertEqual(len({gsecret1, GameSecret(game_id=1, region=GameRegion.US_PAL, behaviour=5)}), 1)
+
+    def test_decode_raw(self):
+        raw = GameSecret.decode_raw("H←■!@ ←2♦y& GB5●y 6♥?↑4", GameRegion.US_PAL)
+        self.assertEqual((raw.game_id, raw.link_name, raw.animal), (21437, "Link ", ObtainedCompanion.RICKY.value))
+        self.assertIs(type(raw.animal), int)
+        gsecret = raw.to_object()
+        self.assertEqual(gsecret.animal, ObtainedCompanion.RICKY)
+        self.assertEqual(str(gsecret).strip(), "H←■!@ ←2♦y& GB5●y 6♥?↑4")
+        self.assertRaises(ChecksumError, GameSecret.decode_raw, "H←■!@ ←2♦y& GB5●y 6♥?↑5", GameRegion.US_PAL)
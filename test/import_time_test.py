@@ -0,0 +1,96 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Import time test file. Checks that importing pyzora stays cheap (see pyzora/__init__.py).
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import pyzora
+
+
+class ImportTimeTest(unittest.TestCase):
+    # Budgets for the time spent in pyzora's own modules, in microseconds. Standard library modules
+    # (enum, typing...) aren't counted, since their cost doesn't depend on pyzora.
+    _BUDGETS = {
+        "import pyzora": 3000,
+        "from pyzora import RingType": 5000,
+        "from pyzora import GameSecret": 15000,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        cls._cache_dir = tempfile.TemporaryDirectory()
+        cls._env = dict(os.environ, PYTHONPYCACHEPREFIX=cls._cache_dir.name)
+        cls._env.pop("PYTHONDONTWRITEBYTECODE", None)
+        # Compiled files are cached by the first run, like in any installed package
+        cls._run("import pyzora, pyzora.cli")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._cache_dir.cleanup()
+
+    @classmethod
+    def _run(cls, code: str) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=cls._env, check=True,
+                              capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(pyzora.__file__)))
+
+    def _pyzora_time(self, code: str) -> int:
+        """Return the time spent importing pyzora's modules, in microseconds."""
+        total = 0
+        for line in self._run(code).stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_time, _, name = line[len("import time:"):].split("|")
+            if name.strip().split(".")[0] == "pyzora":
+                total += int(self_time)
+        return total
+
+    def test_budgets(self):
+        for code, budget in self._BUDGETS.items():
+            with self.subTest(code=code):
+                # The best of a few runs, to ignore noise from other processes
+                self.assertLess(min(self._pyzora_time(code) for _ in range(3)), budget)
+
+    def test_lazy_loading(self):
+        modules = self._run("import sys, pyzora; print(' '.join(sorted(sys.modules)))").stdout.split()
+        self.assertEqual([name for name in modules if name.startswith("pyzora")], ["pyzora"])
+        modules = self._run("import sys; from pyzora import *; print(' '.join(sorted(sys.modules)))").stdout.split()
+        for name in ("numpy", "more_itertools", "unicodedata"):
+            self.assertNotIn(name, modules)
+
+    def test_names(self):
+        self.assertIs(pyzora.RingSecret, pyzora.ring_secret.RingSecret)
+        self.assertIn("GameSecret", dir(pyzora))
+        with self.assertRaises(AttributeError):
+            pyzora.not_a_name
+        for name in pyzora.__all__:
+            self.assertTrue(hasattr(pyzora, name), name)
+
+    def test_names_listed(self):
+        # Classes and functions added to a submodule must also be listed in pyzora/__init__.py
+        for submodule in pyzora._SUBMODULE_NAMES:
+            module = getattr(pyzora, submodule)
+            for name, value in vars(module).items():
+                if not name.startswith("_") and getattr(value, "__module__", None) == module.__name__:
+                    self.assertIn(name, pyzora.__all__)
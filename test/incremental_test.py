@@ -0,0 +1,121 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Incremental parsing test file. See pyzora.incremental for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import unittest
+
+from pyzora import *
+
+
+class IncrementalSecretParserTest(unittest.TestCase):
+    def setUp(self):
+        self._RING = "L←■!N @bS9& hmR→↓"
+        self._GAME = GameSecret(game_id=1235, link_name="Link", child_name="Pip", region=GameRegion.US_PAL)
+
+    def test_typing(self):
+        parser = IncrementalSecretParser(GameRegion.US_PAL)
+        self.assertIsNone(parser.kind)
+        self.assertIsNone(parser.remaining)
+        self.assertEqual(parser.status, SecretStatus.INVALID_LENGTH)
+        for pos, char in enumerate(self._RING):
+            parser.append(char)
+            self.assertIs(parser.kind, RingSecret)
+            self.assertEqual(parser.is_complete, pos == len(self._RING) - 1)
+        self.assertEqual(parser.remaining, 0)
+        self.assertEqual(parser.status, SecretStatus.VALID)
+        self.assertEqual(parser.symbols, bytes(parse_secret(self._RING, GameRegion.US_PAL)))
+        self.assertEqual(parser.to_object().rings, 0)
+        parser.append("B")
+        self.assertEqual(parser.remaining, -1)
+        self.assertEqual(parser.status, SecretStatus.INVALID_LENGTH)
+        parser.delete()
+        self.assertTrue(parser.is_valid)
+        parser.delete(2)
+        parser.append("↓↓")
+        self.assertEqual(parser.status, SecretStatus.CHECKSUM_MISMATCH)
+        parser.clear()
+        self.assertEqual(parser.text, "")
+        self.assertEqual(parser.symbols, b"")
+
+    def test_expected_kind(self):
+        parser = IncrementalSecretParser(GameRegion.US_PAL, GameSecret, self._RING)
+        self.assertIs(parser.kind, RingSecret)
+        self.assertEqual(parser.required_length, 20)
+        self.assertEqual(parser.status, SecretStatus.INVALID_LENGTH)
+        parser = IncrementalSecretParser(GameRegion.US_PAL, GameSecret, render_secret(bytes(self._GAME),
+                                                                                     GameRegion.US_PAL))
+        self.assertTrue(parser.is_valid)
+        self.assertEqual(parser.to_object(), self._GAME)
+
+    def test_invalid_symbols(self):
+        parser = IncrementalSecretParser(GameRegion.US_PAL, text="L←■x!N")
+        self.assertEqual(parser.invalid_positions, (3,))
+        self.assertEqual(parser.status, SecretStatus.INVALID_SYMBOL)
+        self.assertRaises(SecretError, parser.to_object)
+        parser.delete(3)
+        self.assertEqual(parser.invalid_positions, ())
+
+    def test_aliases(self):
+        parser = IncrementalSecretParser(GameRegion.US_PAL)
+        # Until the alias is complete, the characters are read as they would be if the input ended there
+        parser.append("{hear")
+        self.assertEqual(parser.invalid_positions, (0, 2, 3))
+        parser.append("t}")
+        self.assertEqual(parser.invalid_positions, ())
+        self.assertEqual(parser.symbols, bytes(parse_secret("♥", GameRegion.US_PAL)))
+        parser = IncrementalSecretParser(GameRegion.JP, text="kaga")
+        self.assertEqual(parser.symbols, bytes(parse_secret("かが", GameRegion.JP)))
+
+    def test_same_as_parse_secret(self):
+        rng = random.Random(0)
+        for region in GameRegion:
+            pool = ["B", "h", "he", "{", "}", "x", " ", "ka", "a", "{heart}", "♥", "か", "ん", "4"]
+            for _ in range(200):
+                parser = IncrementalSecretParser(region)
+                typed = ""
+                for _ in range(rng.randint(1, 25)):
+                    if typed and rng.random() < 0.3:
+                        count = rng.randint(1, 3)
+                        parser.delete(count)
+                        typed = typed[:-count] if count < len(typed) else ""
+                    else:
+                        piece = rng.choice(pool)
+                        parser.append(piece)
+                        typed += piece
+                    self.assertEqual(parser.text, typed)
+                    try:
+                        data = parse_secret(typed, region)
+                    except SecretError:
+                        self.assertEqual(parser.status, SecretStatus.INVALID_SYMBOL)
+                        continue
+                    self.assertEqual(parser.symbols, bytes(data))
+                    if parser.kind is not None:
+                        self.assertEqual(parser.status, parser.kind.validate(data, region))
+
+    def test_update(self):
+        parser = IncrementalSecretParser(GameRegion.US_PAL)
+        for end in range(1, len(self._RING) + 1):
+            parser.update(self._RING[:end])
+        self.assertTrue(parser.is_valid)
+        parser.update("L←■x")
+        self.assertEqual(parser.text, "L←■x")
+        self.assertEqual(parser.invalid_positions, (3,))
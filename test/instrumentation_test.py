@@ -0,0 +1,101 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Instrumentation test file. See pyzora.instrumentation for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from pyzora import *
+from pyzora import instrumentation
+import pyzora.secret
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_stage_counters(self):
+        RingSecret.load("L←■!N @bS9& hmR→↓", GameRegion.US_PAL)
+        GameSecret.load(parse_secret("H←■!@ ←2♦y& GB5●5 6♥s↑6", GameRegion.US_PAL), GameRegion.US_PAL)
+        stages = instrumentation.snapshot()["stages"]
+        self.assertEqual({stage: counters["calls"] for stage, counters in stages.items()},
+                         {"load": 2, "parse": 1, "decode": 2, "unpack": 2, "construct": 2, "encode": 0})
+        self.assertGreater(stages["load"]["total_ns"], stages["construct"]["total_ns"])
+        bytes(RingSecret(game_id=1, region=GameRegion.JP))
+        self.assertEqual(instrumentation.snapshot()["stages"]["encode"]["calls"], 1)
+
+    def test_failures(self):
+        # Ring secret layout, with the type bits of a game secret
+        data = RING_SECRET_LAYOUT.pack(secret_kind=0, game_id=1)
+        data[-1] |= calculate_checksum(data)
+        self.assertRaises(NotARingCodeError, RingSecret.load, RingSecret._encode_bytes(data, GameRegion.US_PAL),
+                          GameRegion.US_PAL)
+        self.assertRaises(SecretError, RingSecret.load, "bad", GameRegion.JP)
+        self.assertRaises(ChecksumError, GameSecret.load, "H←■!@ ←2♦y& GB5●5 6♥s↑7", GameRegion.US_PAL)
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["stages"]["load"]["failures"], 3)
+        self.assertEqual(snapshot["stages"]["parse"]["failures"], 1)
+        self.assertEqual(snapshot["failures_by_region"], {"US_PAL": 2, "JP": 1})
+        self.assertEqual(snapshot["failures_by_type"], {"NotARingCodeError": 1, "SecretError": 1, "ChecksumError": 1})
+
+    def test_hooks(self):
+        events = []
+        instrumentation.add_hook(events.append)
+        try:
+            MemorySecret.load("●=q(T", GameRegion.US_PAL)
+        finally:
+            instrumentation.remove_hook(events.append)
+        self.assertEqual([event.stage for event in events], ["parse", "decode", "unpack", "construct", "load"])
+        self.assertEqual(events[-1].region, GameRegion.US_PAL)
+        self.assertTrue(all(event.error is None for event in events))
+
+    def test_region_keyword(self):
+        events = []
+        instrumentation.add_hook(events.append)
+        region = GameRegion.US_PAL
+        try:
+            symbols = pyzora.secret.parse_secret("L←■!N @bS9& hmR→↓", region=region)
+            RingSecret.decode_bytes(symbols, region=region)
+            RingSecret._from_fields(RingSecret._unpack(symbols, region), region=region)
+            RingSecret._load(symbols, region=region)
+            self.assertRaises(SecretError, pyzora.secret.parse_secret, "zzzz", region=region)
+        finally:
+            instrumentation.remove_hook(events.append)
+        self.assertEqual({event.stage for event in events}, {"parse", "decode", "unpack", "construct", "load"})
+        self.assertTrue(all(event.region in (region, None) for event in events))
+        self.assertEqual([event.region for event in events if event.stage in ("parse", "load")],
+                         [region, region, region])
+        self.assertEqual(instrumentation.snapshot()["failures_by_region"], {})
+
+    def test_disable(self):
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        self.assertNotIn("__wrapped__", vars(vars(BaseSecret)["_load"].__func__))
+        RingSecret.load("L←■!N @bS9& hmR→↓", GameRegion.US_PAL)
+        self.assertEqual(instrumentation.snapshot()["stages"]["load"]["calls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Bulk loading test file. See pyzora.loading for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import io
+import itertools
+import os
+import random
+import tempfile
+import unittest
+
+from pyzora import *
+
+
+class LoadManyTest(unittest.TestCase):
+    def setUp(self):
+        self._SECRETS = ["L←■!N @bS9& hmR→↓", "not a secret", "", "L←■d) B~&JS $j(D8"]
+
+    def test_load_iterable(self):
+        results = list(load_many(self._SECRETS, RingSecret, GameRegion.US_PAL, chunk_size=1))
+        self.assertEqual([result.index for result in results], [0, 1, 3])
+        self.assertEqual(results[0].secret.rings, 0)
+        self.assertIsInstance(results[1].error, SecretError)
+        self.assertIsNone(results[1].secret)
+        self.assertIn(AllRings, results[2].secret)
+
+    def test_load_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "secrets.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(self._SECRETS) + "\n")
+            results = list(load_many(path, RingSecret, GameRegion.US_PAL))
+        self.assertEqual([result.error is None for result in results], [True, False, True])
+        self.assertEqual(results[2].source, self._SECRETS[3])
+
+    def test_load_file_object(self):
+        file = io.StringIO("\r\n".join(self._SECRETS) + "\r\n")
+        results = list(load_many(file, RingSecret, GameRegion.US_PAL))
+        self.assertEqual([result.error is None for result in results], [True, False, True])
+        self.assertEqual([result.index for result in results], [0, 1, 3])
+        self.assertEqual(results[2].source, self._SECRETS[3])
+
+    def test_lazy_loading(self):
+        # Only the first chunk should be read from an endless input
+        endless = itertools.cycle(self._SECRETS[:1])
+        first = next(load_many(endless, RingSecret, GameRegion.US_PAL, chunk_size=10))
+        self.assertEqual(first.index, 0)
+        with self.assertRaises(ValueError):
+            next(load_many(self._SECRETS, RingSecret, GameRegion.US_PAL, chunk_size=0))
+
+
+class LoadAnyTest(unittest.TestCase):
+    def test_detect_type_and_region(self):
+        for secret, secret_type, region in (("H←■!@ ←2♦y& GB5●y 6♥?↑4", GameSecret, GameRegion.US_PAL),
+                                            ("えのてを7 ががむとか の7ふにご るこがりす", GameSecret, GameRegion.JP),
+                                            ("L←■d) B~&JS $j(D8", RingSecret, GameRegion.US_PAL),
+                                            ("くのてへと 052そが ぞれいわゆ", RingSecret, GameRegion.JP),
+                                            ("→●2y=", MemorySecret, GameRegion.US_PAL),
+                                            ("ho ya a sa me", MemorySecret, GameRegion.JP)):
+            loaded = load_any(secret)
+            self.assertIs(type(loaded), secret_type)
+            self.assertEqual(loaded.region, region)
+            self.assertEqual(loaded.game_id, 21437)
+
+    def test_parsed_secret(self):
+        loaded = load_any(parse_secret("ほやあさめ", GameRegion.JP))
+        self.assertIs(type(loaded), MemorySecret)
+        self.assertEqual(loaded.region, GameRegion.JP)
+
+    def test_invalid_secrets(self):
+        with self.assertRaises(ChecksumError):
+            load_any("H←■!@ ←2♦y& GB5●y 6♥?↑5")
+        with self.assertRaises(SecretError):
+            load_any("L←■d)")
+        with self.assertRaises(SecretError):
+            load_any("{heart} ほ")
+        # The error shows where each region stopped, the one read furthest first
+        with self.assertRaisesRegex(SecretError, "ー at position 15 for US_PAL, L at position 0 for JP"):
+            load_any("L←■!N @bS9& hmRー↓")
+        with self.assertRaisesRegex(SecretError, "Perhaps you used the wrong region"):
+            load_any("L←■!N @bS9& hmRー↓", GameRegion.US_PAL)
+
+
+class ValidateTest(unittest.TestCase):
+    def test_validate(self):
+        self.assertEqual(validate("H←■!@ ←2♦y& GB5●5 6♥s↑6", GameSecret, GameRegion.US_PAL), SecretStatus.VALID)
+        self.assertEqual(validate("H←■!@ ←2♦y& GB5●5 6♥s↑6", None, GameRegion.US_PAL), SecretStatus.VALID)
+        self.assertEqual(validate("L←■!N @bS9& hmR→↓", GameSecret, GameRegion.US_PAL), SecretStatus.INVALID_LENGTH)
+        self.assertEqual(validate("L←■d", None, GameRegion.US_PAL), SecretStatus.INVALID_LENGTH)
+        self.assertEqual(validate("{heart} ほ", None, GameRegion.US_PAL), SecretStatus.INVALID_SYMBOL)
+        self.assertEqual(validate("H←■!@ ←2♦y& GB5●y 6♥?↑5", GameSecret, GameRegion.US_PAL),
+                         SecretStatus.CHECKSUM_MISMATCH)
+        self.assertEqual(validate(bytes(20), GameSecret, GameRegion.US_PAL), SecretStatus.CHECKSUM_MISMATCH)
+        self.assertEqual(validate(bytes((64,) * 15), RingSecret, GameRegion.US_PAL), SecretStatus.INVALID_SYMBOL)
+        self.assertTrue(is_valid("くのてを3 4のんれか ぺそちはと", RingSecret, GameRegion.JP))
+        self.assertFalse(is_valid("くのてを3 4のんれか ぺそちはと", RingSecret, GameRegion.US_PAL))
+
+    def test_matches_decode_batch(self):
+        generator = random.Random(0)
+        for secret_type, valid in ((GameSecret, "H←■!@ ←2♦y& GB5●5 6♥s↑6"), (RingSecret, "L←■!N @bS9& hmR→↓"),
+                                   (MemorySecret, "→●2y=")):
+            valid = bytes(parse_secret(valid, GameRegion.US_PAL))
+            rows = [valid] + [bytes(generator.randrange(65) for _ in range(len(valid))) for _ in range(300)]
+            for row, record in zip(rows, secret_type.decode_batch(rows, GameRegion.US_PAL)):
+                # Field values aren't checked when validating
+                expected = SecretStatus.VALID if record.status == SecretStatus.INVALID_FIELD else record.status
+                self.assertEqual(secret_type.validate(row, GameRegion.US_PAL), expected)
@@ -20,6 +20,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public
 License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
 """
+import itertools
 import unittest
 from pyzora.memory_secret import *
 
@@ -50,3 +51,42 @@ class MemorySecretTest(unittest.TestCase):
                     self.assertEqual(msecret.game_id, 21437)
                     self.assertEqual(msecret.is_return_secret, is_return)
                     self.assertEqual(msecret.memory, expected_secret)
+
+    def test_write_bulk(self):
+        for region in map(GameRegion, range(2)):
+            for item in self._SECRET_STRINGS:
+                for secret in item[region]:
+                    self.assertEqual(str(MemorySecret.load(secret, region)).strip(), secret)
+
+    def test_table(self):
+        table = MemorySecretTable(max_game_ids=2)
+        MemorySecret.use_table(table)
+        try:
+            for region in map(GameRegion, range(2)):
+                for item in self._SECRET_STRINGS:
+                    for is_return, secret in enumerate(item[region]):
+                        msecret = MemorySecret.load(secret, region)
+                        self.assertEqual(msecret.game_id, 21437)
+                        self.assertEqual(msecret.is_return_secret, bool(is_return))
+                        self.assertEqual(str(msecret).strip(), secret)
+            self.assertEqual(len(table), 2)
+            self.assertIsNotNone(table.lookup(parse_secret("●=q(T", GameRegion.US_PAL), GameRegion.US_PAL))
+            table.precompute(range(2))
+            self.assertEqual(len(table), 2)
+            self.assertIsNone(table.lookup(parse_secret("●=q(T", GameRegion.US_PAL), GameRegion.US_PAL))
+        finally:
+            MemorySecret.use_table(None)
+        for game_id in (0, 1):
+            for memory, target_game, is_return in itertools.product(MemoryEnum, TargetGame, (False, True)):
+                msecret = MemorySecret(game_id, GameRegion.JP, target_game, memory, is_return)
+                self.assertEqual(table.encode(game_id, memory, target_game, is_return, GameRegion.JP), bytes(msecret))
+
+    def test_decode_raw(self):
+        for region in map(GameRegion, range(2)):
+            for item in self._SECRET_STRINGS:
+                for secret in item[region]:
+                    raw = MemorySecret.decode_raw(secret, region)
+                    msecret = MemorySecret.load(secret, region)
+                    self.assertEqual((raw.memory, raw.target_game, raw.is_return_secret),
+                                     (msecret.memory, msecret.target_game, msecret.is_return_secret))
+                    self.assertEqual(str(raw.to_object()).strip(), secret)
@@ -0,0 +1,56 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Parallel decoding test file. See pyzora.parallel for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from pyzora import *
+from pyzora.parallel import *
+
+
+class ParallelTest(unittest.TestCase):
+    def setUp(self):
+        self._SECRETS = ["L←■!N @bS9& hmR→↓", "L←■!N @bS9& hmR→↑", "L←■d) B~&JS $j(D8"] * 50
+
+    def test_decode_in_order(self):
+        for jobs in (1, 2):
+            results = list(decode_parallel(self._SECRETS, RingSecret, GameRegion.US_PAL, jobs=jobs, chunk_size=7))
+            self.assertEqual([result.index for result in results], list(range(len(self._SECRETS))))
+            self.assertEqual([result.error is None for result in results[:3]], [True, False, True])
+            self.assertIsInstance(results[1].error, ChecksumError)
+            self.assertIn(AllRings, results[-1].secret)
+
+    def test_encode_in_order(self):
+        secrets = [RingSecret(game_id=21437, region=GameRegion.US_PAL, rings=rings)
+                   for rings in (0, int(AllRings))] * 20
+        results = list(encode_parallel(secrets, jobs=2))
+        self.assertEqual([result.string for result in results], [str(secret) for secret in secrets])
+
+    def test_invalid_arguments(self):
+        # Raised by the call itself, not when iterating over the results
+        with self.assertRaises(ValueError):
+            decode_parallel(self._SECRETS, RingSecret, GameRegion.US_PAL, jobs=0)
+        with self.assertRaises(ValueError):
+            decode_parallel(self._SECRETS, RingSecret, GameRegion.US_PAL, chunk_size=0)
+        with self.assertRaises(ValueError):
+            encode_parallel([], jobs=-1)
+        with self.assertRaises(ValueError):
+            encode_parallel([], chunk_size=0)
@@ -0,0 +1,48 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Kind and region names test file. See pyzora.records for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+
+from pyzora import *
+from pyzora.records import parse_kind, parse_region, kind_name, error_string
+
+
+class RecordsTest(unittest.TestCase):
+    def test_parse(self):
+        self.assertIs(parse_kind(" Ring "), RingSecret)
+        self.assertIsNone(parse_kind("auto"))
+        self.assertIs(parse_region("PAL"), GameRegion.US_PAL)
+        self.assertIsNone(parse_region("Auto"))
+        for parse in (parse_kind, parse_region):
+            for value in ("nowhere", 5, None):
+                with self.assertRaises(ValueError):
+                    parse(value)
+
+    def test_names(self):
+        for secret_type in (GameSecret, RingSecret, MemorySecret):
+            self.assertIs(parse_kind(kind_name(secret_type)), secret_type)
+        self.assertEqual(error_string(ValueError("bad")), "ValueError: bad")
+        self.assertIsNone(error_string(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Ring analytics test file. See pyzora.ring_analytics for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import unittest
+
+from pyzora import *
+from pyzora.ring_analytics import *
+from pyzora.ring_analytics import numpy
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class RingAnalyticsTest(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(0)
+        self.masks = [generator.getrandbits(64) & generator.getrandbits(64) for _ in range(300)]
+        self.masks += [0, int(AllRings)]
+
+    def test_inputs(self):
+        secrets = [RingSecret(game_id=1, rings=mask, region=GameRegion.US_PAL) for mask in self.masks]
+        expected = ring_masks(numpy.array(self.masks, dtype=numpy.uint64))
+        self.assertTrue((ring_masks(secrets) == expected).all())
+        self.assertTrue((ring_masks(RingSet(mask) for mask in self.masks) == expected).all())
+        self.assertRaises(ValueError, ring_masks, [1 << 64])
+
+    def test_frequencies(self):
+        frequencies = ring_frequencies(self.masks)
+        self.assertEqual(tuple(frequencies), RING_TYPES)
+        for ring, count in frequencies.items():
+            self.assertEqual(count, sum(1 for mask in self.masks if ring in RingSet(mask)))
+
+    def test_size_histogram(self):
+        histogram = size_histogram(self.masks)
+        self.assertEqual(len(histogram), 65)
+        for size in (0, 16, 64):
+            self.assertEqual(histogram[size], sum(1 for mask in self.masks if mask.bit_count() == size))
+
+    def test_co_occurrence(self):
+        matrix, rings = co_occurrence(self.masks, among=[RED_HOLY, BLUE])
+        self.assertEqual(rings, (BLUE, RED_HOLY))
+        both = int(BLUE | RED_HOLY)
+        self.assertEqual(matrix[0, 1], sum(1 for mask in self.masks if mask & both == both))
+        self.assertEqual(matrix[1, 1], ring_frequencies(self.masks)[RED_HOLY])
+
+    def test_report(self):
+        report = ring_report(self.masks)
+        self.assertEqual(report.count, len(self.masks))
+        self.assertEqual(report.complete, 1)
+        self.assertEqual(report.frequencies, ring_frequencies(self.masks))
+        self.assertTrue((report.size_histogram == size_histogram(self.masks)).all())
+        self.assertAlmostEqual(report.mean_completion,
+                               sum(mask.bit_count() for mask in self.masks) / len(self.masks) / 64)
+        self.assertEqual(ring_report([]).count, 0)
@@ -51,3 +51,48 @@ class RingSecretTest(unittest.TestCase):
         self.assertIn(FRIENDSHIP, RingSecret.load(str(rsecret_jp), GameRegion.JP))
         self.assertIn(POWER_1, RingSecret.load(str(rsecret_jp), GameRegion.JP))
         self.assertIn(GREEN, RingSecret.load(str(rsecret_jp), GameRegion.JP))
+
+    def test_round_trip(self):
+        for secret, region in (("L←■!N @bS9& hmR→↓", GameRegion.US_PAL),
+                               ("L←■d) B~&JS $j(D8", GameRegion.US_PAL),
+                               ("くのてへと 052そが ぞれいわゆ", GameRegion.JP)):
+            self.assertEqual(str(RingSecret.load(secret, region)).strip(), secret)
+        rsecret = RingSecret(game_id=21437, region=GameRegion.US_PAL, rings=RED_HOLY | PROTECTION | BLUE)
+        self.assertEqual(RingSecret.load(str(rsecret), GameRegion.US_PAL).rings, rsecret.rings)
+
+    def test_ring_str(self):
+        rsecret = RingSecret(game_id=21437, region=GameRegion.US_PAL, rings=RED_HOLY | BLUE)
+        self.assertEqual(rsecret.ring_count, 2)
+        self.assertEqual(int(rsecret.ring_str, 2), rsecret.rings)
+        self.assertEqual(len({rsecret, RingSecret(game_id=21437, region=GameRegion.US_PAL, rings=rsecret.rings)}), 1)
+
+    def test_decode_raw(self):
+        raw = RingSecret.decode_raw("L←■d) B~&JS $j(D8", GameRegion.US_PAL)
+        self.assertEqual(raw.rings, RingSecret.load("L←■d) B~&JS $j(D8", GameRegion.US_PAL).rings)
+        self.assertEqual(str(raw.to_object()).strip(), "L←■d) B~&JS $j(D8")
+        self.assertRaises(SecretError, RingSecret.decode_raw, "H←■!@ ←2♦y& GB5●y 6♥?↑4", GameRegion.US_PAL)
+
+    def test_ring_set(self):
+        rsecret = RingSecret(game_id=21437, region=GameRegion.US_PAL, rings=RED_HOLY | BLUE)
+        rings = rsecret.ring_set
+        self.assertEqual(list(rings), [BLUE, RED_HOLY])
+        self.assertEqual(rsecret.to_list(), [BLUE, RED_HOLY])
+        self.assertEqual(len(rings), 2)
+        self.assertIn(BLUE, rings)
+        self.assertNotIn(FRIENDSHIP, rings)
+        self.assertEqual(rings | FRIENDSHIP, RingSet([FRIENDSHIP, BLUE, RED_HOLY]))
+        self.assertEqual(FRIENDSHIP | rings, rings | FRIENDSHIP)
+        self.assertEqual(rings & BLUE, RingSet(BLUE))
+        self.assertEqual(rings - RingSet(BLUE), RingSet(RED_HOLY))
+        self.assertEqual(AllRings - rings, RingSet(AllRings) - rings)
+        self.assertEqual(len(RingSet(AllRings) ^ rings), 62)
+        self.assertTrue(RingSet(BLUE) <= rings <= AllRings)
+        self.assertTrue(rings.isdisjoint(FRIENDSHIP))
+        self.assertFalse(RingSet(NoRings))
+        self.assertEqual(len({rings, RingSet(int(rings))}), 1)
+        rsecret.ring_set = rings | PROTECTION
+        self.assertEqual(rsecret.rings, int(RED_HOLY | BLUE | PROTECTION))
+        rsecret.ring_set = [FRIENDSHIP]
+        self.assertEqual(rsecret.rings, 1)
+        self.assertRaises(ValueError, RingSet, 1 << 64)
+        self.assertRaises(ValueError, RingSet, -1)
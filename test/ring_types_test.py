@@ -0,0 +1,60 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Ring types test file. See pyzora.ring_types for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import unittest
+from pyzora.ring_types import *
+
+
+class RingTypeTest(unittest.TestCase):
+    def test_hashable(self):
+        self.assertEqual(len({FRIENDSHIP, BLUE, FRIENDSHIP}), 2)
+        self.assertEqual({BLUE: "blue"}[BLUE], "blue")
+        self.assertEqual(BLUE, 0x100)
+        self.assertNotEqual(BLUE, "Blue Ring")
+        with self.assertRaises(AttributeError):
+            BLUE.integer = 1
+
+    def test_lookups(self):
+        self.assertIs(RingType.from_integer(0x100), BLUE)
+        self.assertIs(RingType.from_integer(0x300), NoRings)
+        self.assertRaises(ValueError, RingType.from_integer, -1)
+        for position, ring in enumerate(RING_TYPES):
+            self.assertEqual(ring.position, position)
+            self.assertIs(RingType.from_position(position), ring)
+            self.assertIs(RingType.from_name(ring.name), ring)
+        self.assertRaises(ValueError, RingType.from_position, 64)
+
+    def test_from_name(self):
+        for name in ("power ring l1", "Power L-1", "POWER_1", "  power-ring-L1 "):
+            self.assertIs(RingType.from_name(name), POWER_1)
+        self.assertIs(RingType.from_name("experts ring"), EXPERTS_RING)
+        self.assertIs(RingType.from_name("Armor Ring L-3"), ARMOUR_3)
+        self.assertIs(RingType.from_name("friendship"), FRIENDSHIP)
+        self.assertRaises(ValueError, RingType.from_name, "One Ring")
+
+    def test_parse_ring_names(self):
+        self.assertEqual(parse_ring_names("Friendship Ring; blue ring,\nRed Holy Ring,"),
+                         RingSet([FRIENDSHIP, BLUE, RED_HOLY]))
+        self.assertEqual(int(parse_ring_names(["Zora Ring", "fist"])), int(ZORA | FIST))
+        self.assertFalse(parse_ring_names(""))
+        with self.assertRaises(ValueError):
+            parse_ring_names("Blue Ring, One Ring")
@@ -0,0 +1,168 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Base secret test file. See pyzora.secret for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import array
+import mmap
+import sys
+import unittest
+
+from pyzora import *
+
+
+class ParseSecretTest(unittest.TestCase):
+    def test_parse_symbol_names(self):
+        expected = parse_secret("♥♠↑()B", GameRegion.US_PAL)
+        self.assertEqual(parse_secret("{heart}{spade}{up}<>B", GameRegion.US_PAL), expected)
+        self.assertEqual(parse_secret("HEART spade} {Up <> B", GameRegion.US_PAL), expected)
+        # Symbol names don't change the case-sensitive symbols around them
+        self.assertEqual(parse_secret("bdown", GameRegion.US_PAL), parse_secret("b↓", GameRegion.US_PAL))
+
+    def test_parse_romaji(self):
+        expected = parse_secret("かしつんなあ", GameRegion.JP)
+        self.assertEqual(parse_secret("ka shi tsu n na a", GameRegion.JP), expected)
+        self.assertEqual(parse_secret("KA SI TU N NA A", GameRegion.JP), expected)
+        self.assertEqual(parse_secret("か　し\tつ んなあ", GameRegion.JP), expected)
+
+    def test_parse_invalid(self):
+        with self.assertRaises(SecretError):
+            parse_secret("{heart", GameRegion.JP)
+        with self.assertRaises(SecretError):
+            parse_secret("{x}", GameRegion.US_PAL)
+        with self.assertRaises(SecretError):
+            parse_secret("\t", GameRegion.US_PAL)
+
+    def test_parse_long_input(self):
+        # Long runs of whitespace and symbol names are consumed in a single pass
+        data = parse_secret(" " * 100000 + "{heart}" * 100000, GameRegion.US_PAL)
+        self.assertEqual(data, bytearray((9,)) * 100000)
+
+
+class DecodeIntoTest(unittest.TestCase):
+    def setUp(self):
+        self._DATA = bytes(parse_secret("H←■!@ ←2♦y& GB5●5 6♥s↑6", GameRegion.US_PAL))
+
+    def test_buffers(self):
+        expected = GameSecret.decode_bytes(self._DATA, GameRegion.US_PAL)
+        for buffer in (memoryview(b"\0" * 20 + self._DATA)[20:], array.array("B", self._DATA), bytearray(self._DATA)):
+            self.assertEqual(GameSecret.decode_bytes(buffer, GameRegion.US_PAL), expected)
+            self.assertEqual(GameSecret.load(buffer, GameRegion.US_PAL).link_name, "Link ")
+
+    def test_decode_into(self):
+        out = array.array("B", bytes(30))
+        self.assertEqual(GameSecret.decode_into(self._DATA, memoryview(out)[5:], GameRegion.US_PAL), 20)
+        self.assertEqual(out[5:25].tobytes(), GameSecret.decode_bytes(self._DATA, GameRegion.US_PAL))
+        self.assertEqual(out[:5].tobytes() + out[25:].tobytes(), bytes(10))
+        with self.assertRaises(ValueError):
+            GameSecret.decode_into(self._DATA, bytearray(10), GameRegion.US_PAL)
+
+    def test_mmap(self):
+        with mmap.mmap(-1, len(self._DATA) * 3) as records:
+            records[20:40] = self._DATA
+            view = memoryview(records)
+            try:
+                self.assertEqual(GameSecret.decode_raw(view[20:40], GameRegion.US_PAL).game_id, 21437)
+            finally:
+                view.release()
+
+    @unittest.skipIf(sys.version_info < (3, 12), "the buffer protocol can only be implemented in Python 3.12 or later")
+    def test_buffer_protocol(self):
+        gsecret = GameSecret.load(self._DATA, GameRegion.US_PAL)
+        self.assertEqual(bytes(memoryview(gsecret)), bytes(gsecret))
+
+
+class RenderSecretTest(unittest.TestCase):
+    _STRING = "H←■!@ ←2♦y& GB5●5 6♥s↑6"
+
+    def test_round_trip(self):
+        for region in GameRegion:
+            data = bytes(range(64))
+            for style in SymbolStyle:
+                rendered = render_secret(data, region, style=style)
+                self.assertEqual(parse_secret(rendered, region), data)
+                if style == SymbolStyle.ASCII:
+                    self.assertTrue(rendered.isascii())
+
+    def test_format_options(self):
+        data = parse_secret(self._STRING, GameRegion.US_PAL)
+        self.assertEqual(render_secret(data, GameRegion.US_PAL), self._STRING)
+        self.assertEqual(render_secret(data, GameRegion.US_PAL, group_size=0), self._STRING.replace(" ", ""))
+        self.assertEqual(render_secret(data, GameRegion.US_PAL, separator="-"), self._STRING.replace(" ", "-"))
+        self.assertEqual(render_secret(data[:5], GameRegion.US_PAL, style=SymbolStyle.ASCII), "H{left}{square}!@")
+        self.assertEqual(render_secret(parse_secret("かしつ", GameRegion.JP), GameRegion.JP, style=SymbolStyle.ASCII),
+                         "{ka}{shi}{tsu}")
+        for value in (64, 200, 255):
+            for style in SymbolStyle:
+                with self.assertRaises(SecretError):
+                    render_secret(bytes((1, 2, value, 3)), GameRegion.US_PAL, group_size=2, style=style)
+            with self.assertRaises(SecretError):
+                create_string(bytearray((1, 2, value, 3)), GameRegion.US_PAL)
+
+    def test_create_string(self):
+        # create_string keeps its trailing space
+        data = parse_secret(self._STRING, GameRegion.US_PAL)
+        self.assertEqual(create_string(data, GameRegion.US_PAL), self._STRING + " ")
+
+    def test_render_many(self):
+        gsecret = GameSecret.load(self._STRING, GameRegion.US_PAL)
+        data = parse_secret(self._STRING, GameRegion.US_PAL)
+        self.assertEqual(render_many([gsecret, data], GameRegion.US_PAL, separator="|"),
+                         [gsecret.render(separator="|")] * 2)
+        self.assertEqual(render_many([gsecret]), [self._STRING])
+        with self.assertRaises(SecretError):
+            render_many([data])
+
+    def test_repr(self):
+        rsecret = RingSecret(game_id=12, rings=5, region=GameRegion.JP)
+        self.assertEqual(repr(rsecret), "RingSecret(game_id=12, region=GameRegion.JP, rings=5)")
+
+
+class TranscodeTest(unittest.TestCase):
+    _STRING = "H←■!@ ←2♦y& GB5●5 6♥s↑6"
+
+    def test_matches_objects(self):
+        for secret in (GameSecret.load(self._STRING, GameRegion.US_PAL),
+                       RingSecret(game_id=1234, rings=0xDEADBEEF, region=GameRegion.US_PAL),
+                       MemorySecret.load("→●2y=", GameRegion.US_PAL)):
+            source = bytes(secret)
+            secret.region = GameRegion.JP
+            self.assertEqual(transcode(source, GameRegion.US_PAL, GameRegion.JP), bytes(secret))
+            self.assertEqual(transcode(bytes(secret), GameRegion.JP, GameRegion.US_PAL), source)
+            self.assertEqual(transcode(render_secret(source, GameRegion.US_PAL), GameRegion.US_PAL, GameRegion.JP),
+                             str(secret).strip())
+
+    def test_invalid_secrets(self):
+        # Checks fail the same way in both regions
+        corrupted = bytearray(parse_secret(self._STRING, GameRegion.US_PAL))
+        corrupted[7] ^= 1
+        converted = transcode(corrupted, GameRegion.US_PAL, GameRegion.JP)
+        self.assertEqual(GameSecret.validate(converted, GameRegion.JP), SecretStatus.CHECKSUM_MISMATCH)
+        self.assertEqual(transcode(b"", GameRegion.US_PAL, GameRegion.JP), b"")
+        with self.assertRaises(SecretError):
+            transcode(bytes((64,)), GameRegion.US_PAL, GameRegion.JP)
+        with self.assertRaises(SecretError):
+            transcode(bytes(63 for _ in range(30)), GameRegion.US_PAL, GameRegion.JP)
+
+    def test_transcode_many(self):
+        data = bytes(parse_secret(self._STRING, GameRegion.US_PAL))
+        self.assertEqual(transcode_many([self._STRING, data], GameRegion.US_PAL, GameRegion.JP, group_size=0),
+                         [transcode(self._STRING, GameRegion.US_PAL, GameRegion.JP, group_size=0),
+                          transcode(data, GameRegion.US_PAL, GameRegion.JP)])
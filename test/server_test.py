@@ -0,0 +1,177 @@
+"""pyzora - Python library to help parsing secrets from Zelda OoS/OoA
+
+Secret server test file. See pyzora.server for more details.
+
+(c) 2023 fortwoone.
+All rights reserved.
+
+This file is part of pyzora.
+
+pyzora is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+pyzora is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public
+License along with pyzora. If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+import json
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pyzora.server import *
+
+
+async def _request(port: int, method: str, path: str, body: str = "") -> tuple[int, list[dict]]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        content = body.encode("utf-8")
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n"
+                     .encode("latin-1") + content)
+        response = await reader.read()
+    finally:
+        writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, [json.loads(line) for line in payload.decode("utf-8").splitlines()]
+
+
+class SecretServerTest(unittest.TestCase):
+    _GAME = "H←■!@ ←2♦y& GB5●5 6♥s↑6"
+    _RING = "L←■!N @bS9& hmR→↓"
+
+    def _serve(self, test, **options):
+        async def run():
+            async with SecretServer(port=0, **options) as server:
+                return await test(server)
+        return asyncio.run(run())
+
+    def test_decode(self):
+        async def test(server):
+            body = (f'{self._GAME}\n\n{{"secret": "{self._RING}", "kind": "ring", "region": "us"}}\nbad\n'
+                    f'{{"secret": "{self._RING}", "kind": 5}}\n{{"secret": "{self._RING}", "region": ["us"]}}\n')
+            return await _request(server.port, "POST", "/decode", body)
+        status, records = self._serve(test)
+        self.assertEqual(status, 200)
+        self.assertEqual([record["kind"] for record in records[:2]], ["game", "ring"])
+        self.assertEqual(records[0]["link_name"], "Link")
+        self.assertTrue(records[2]["error"].startswith("SecretError"))
+        # Only the lines of the wrong type fail, not the whole batch
+        self.assertEqual(len(records), 5)
+        for record in records[3:]:
+            self.assertTrue(record["error"].startswith("ValueError"))
+
+    def test_encode(self):
+        async def test(server):
+            body = json.dumps({"kind": "ring", "region": "US_PAL", "game_id": 21437, "rings": 0}) + "\n"
+            body += '{"kind": "ring"}\n{"kind": 5, "region": "us"}\n{"kind": "ring", "region": "us", "rings": [1]}\n'
+            return await _request(server.port, "POST", "/encode", body)
+        status, records = self._serve(test)
+        self.assertEqual(status, 200)
+        self.assertEqual(records[0]["secret"], self._RING)
+        self.assertIsNone(records[0]["error"])
+        self.assertIsNone(records[1]["secret"])
+        self.assertEqual([record["error"].split(":")[0] for record in records[2:]], ["ValueError", "TypeError"])
+
+    def test_errors(self):
+        async def test(server):
+            return [(await _request(server.port, *request))[0]
+                    for request in (("GET", "/decode"), ("POST", "/unknown"), ("POST", "/decode", "{bad json\n"))]
+        self.assertEqual(self._serve(test), [405, 404, 400])
+
+    def test_batching(self):
+        async def test(server):
+            results = await asyncio.gather(*(_request(server.port, "POST", "/decode", self._RING)
+                                             for _ in range(20)))
+            return results, server.stats()
+        results, stats = self._serve(test, max_batch_size=8, max_delay=0.05)
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertEqual(stats["lines"], 20)
+        self.assertLess(stats["batches"], 20)
+
+    def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            async def test(server):
+                return await run_load("127.0.0.1", server.port, sample_payloads(20), requests=50, concurrency=4)
+            report = self._serve(test, executor=executor, concurrency=2)
+        self.assertEqual(report.requests, 50)
+        self.assertEqual(report.errors, 0)
+        self.assertGreater(report.throughput, 0)
+        self.assertLessEqual(report.p50, report.p99)
+
+    def test_batch_failure(self):
+        executor = ThreadPoolExecutor(1)
+        executor.shutdown()
+
+        async def test(server):
+            status, records = await _request(server.port, "POST", "/decode", self._RING)
+            return status, records, server.stats()["errors"]
+        # Batches can't be sent to an executor which was shut down
+        status, records, errors = self._serve(test, executor=executor)
+        self.assertEqual(status, 500)
+        self.assertIn("RuntimeError", records[0]["error"])
+        self.assertEqual(errors, 1)
+
+    def test_timeout(self):
+        async def test(server):
+            return await _request(server.port, "POST", "/decode", self._RING)
+        # The batch waits longer than requests are allowed to
+        status, _ = self._serve(test, max_batch_size=2, max_delay=0.5, timeout=0.05)
+        self.assertEqual(status, 504)
+
+
+class MicroBatcherTest(unittest.TestCase):
+    def test_backpressure(self):
+        async def test():
+            batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=4,
+                                   max_delay=0.01, max_pending=3)
+            batcher.start()
+            try:
+                futures = [batcher.submit(value) for value in range(3)]
+                with self.assertRaises(ServerOverloaded):
+                    batcher.submit(3)
+                results = await asyncio.gather(*futures)
+                # Handled items no longer count as pending
+                await asyncio.sleep(0)
+                self.assertEqual(batcher.pending, 0)
+                return results
+            finally:
+                await batcher.close()
+        self.assertEqual(asyncio.run(test()), [0, 2, 4])
+
+    def test_full_batch(self):
+        async def test():
+            batcher = MicroBatcher(lambda items: items, max_batch_size=2, max_delay=10)
+            batcher.start()
+            try:
+                start = time.perf_counter()
+                await asyncio.gather(batcher.submit(1), batcher.submit(2))
+                return time.perf_counter() - start
+            finally:
+                await batcher.close()
+        # Full batches don't wait for the delay
+        self.assertLess(asyncio.run(test()), 5)
+
+    def test_close_in_flight(self):
+        def process(items):
+            time.sleep(0.1)
+            return items
+
+        async def test():
+            with ThreadPoolExecutor(1) as executor:
+                batcher = MicroBatcher(process, max_delay=0, executor=executor)
+                batcher.start()
+                future = batcher.submit(1)
+                # Let the batch reach the executor
+                await asyncio.sleep(0.02)
+                await batcher.close()
+                return future.cancelled()
+        # Closing cancels the batches being handled, instead of leaving their items pending
+        self.assertTrue(asyncio.run(test()))